@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Mede o tempo e o pico de memória de cada etapa do fluxo em vários tamanhos de dados.
+
+Para cada número de linhas pedido, um arquivo sintético com as colunas de
+`dados_exemplo_2.csv` é gerado (e reaproveitado nas próximas execuções, em
+benchmarks/dados/) e as etapas abaixo rodam em um processo novo, uma após a
+outra, como no fluxo completo:
+
+    carregar_dados -> tratar_valores_ausentes -> codificar_variaveis_categoricas
+    -> remover_colunas_nao_numericas_para_modelo -> dividir_dados_treino_teste
+    -> treinar_modelo_regressao -> avaliar_modelo
+
+Os resultados vão para um arquivo JSON, que pode ser comparado com o de outra
+versão do projeto usando --comparar.
+
+Uso, a partir da raiz do projeto:
+
+    python benchmarks/bench_etapas.py --linhas 10000 100000 1000000
+    python benchmarks/bench_etapas.py --linhas 100000000 --tamanho-chunk 1000000
+    python benchmarks/bench_etapas.py --comparar benchmarks/resultados/antes.json benchmarks/resultados/etapas.json
+
+Com --tamanho-chunk as etapas trabalham em blocos e são preguiçosas: tratar,
+codificar e dividir só preparam a leitura, e o custo delas aparece no treino e
+na avaliação, que percorrem o arquivo.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_PROJETO)
+
+from gerar_dados import gerar_dados  # noqa: E402
+
+PASTA_DADOS = os.path.join(RAIZ_PROJETO, 'benchmarks', 'dados')
+SAIDA_PADRAO = os.path.join(RAIZ_PROJETO, 'benchmarks', 'resultados', 'etapas.json')
+VERSAO_FORMATO = 1
+
+
+def medir_etapas(caminho_csv, linhas, tamanho_chunk=None):
+    """Roda as etapas do fluxo sobre `caminho_csv` e devolve uma medição por etapa."""
+    from src import (
+        avaliar_modelo,
+        carregar_dados,
+        codificar_variaveis_categoricas,
+        dividir_dados_treino_teste,
+        eh_fluxo,
+        remover_colunas_nao_numericas_para_modelo,
+        tratar_valores_ausentes,
+        treinar_modelo_regressao,
+    )
+    from src.memoria import MedidorMemoria
+
+    medidor = MedidorMemoria()
+    medicoes = []
+
+    def etapa(nome, funcao, *args, **kwargs):
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        # As mensagens das funções atrapalhariam a leitura do resultado
+        with medidor.etapa(nome), contextlib.redirect_stdout(io.StringIO()):
+            resultado = funcao(*args, **kwargs)
+        segundos = time.perf_counter() - inicio
+        registro = medidor.registros[-1]
+        medicoes.append({
+            'etapa': nome,
+            'linhas': linhas,
+            'segundos': segundos,
+            'cpu_segundos': time.process_time() - inicio_cpu,
+            'linhas_por_segundo': linhas / segundos if segundos > 0 else None,
+            'rss_inicio_mb': registro['rss_inicio'] / 1024 ** 2 if registro['rss_inicio'] else None,
+            'pico_rss_mb': registro['pico_rss'] / 1024 ** 2 if registro['pico_rss'] else None,
+        })
+        return resultado
+
+    df = etapa('carregar_dados', carregar_dados, caminho_csv, tamanho_chunk=tamanho_chunk)
+    df = df.mapear(lambda bloco: bloco.drop(columns='id')) if eh_fluxo(df) else df.drop(columns='id')
+    tratado = etapa('tratar_valores_ausentes', tratar_valores_ausentes, df)
+    codificado = etapa('codificar_variaveis_categoricas', codificar_variaveis_categoricas, tratado, ['sexo', 'categoria'])
+    final = etapa('remover_colunas_nao_numericas', remover_colunas_nao_numericas_para_modelo, codificado, 'target')
+    X_treino, X_teste, y_treino, y_teste = etapa('dividir_dados_treino_teste', dividir_dados_treino_teste, final, 'target')
+    modelo = etapa('treinar_modelo_regressao', treinar_modelo_regressao, X_treino, y_treino)
+    mae, r2 = etapa('avaliar_modelo', avaliar_modelo, modelo, X_teste, y_teste, mostrar_grafico=False)
+    for medicao in medicoes:
+        medicao['r2_modelo'] = r2
+    return medicoes
+
+
+def _medir_em_processo_novo(caminho_csv, linhas, tamanho_chunk):
+    # 'spawn' garante um processo limpo: a memória de um tamanho não afeta o seguinte
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        return executor.submit(medir_etapas, caminho_csv, linhas, tamanho_chunk).result()
+
+
+def _versao_do_projeto():
+    versao = None
+    try:
+        import tomllib
+        with open(os.path.join(RAIZ_PROJETO, 'pyproject.toml'), 'rb') as f:
+            versao = tomllib.load(f)['project']['version']
+    except (ImportError, OSError, KeyError):
+        pass
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ_PROJETO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'versao': versao, 'commit': commit}
+
+
+def executar(linhas_por_tamanho, taxa_nulos, n_categorias, tamanho_chunk, repeticoes, semente):
+    import numpy as np
+    import pandas as pd
+
+    resultados = []
+    for linhas in linhas_por_tamanho:
+        caminho_csv = os.path.join(PASTA_DADOS, f"sintetico_{linhas}_{taxa_nulos}_{n_categorias}_{semente}.csv")
+        if not os.path.exists(caminho_csv):
+            print(f"Gerando {linhas} linhas sintéticas em {caminho_csv}...")
+            gerar_dados(caminho_csv, linhas, taxa_nulos, n_categorias, semente)
+        rodadas = [_medir_em_processo_novo(caminho_csv, linhas, tamanho_chunk) for _ in range(repeticoes)]
+        # Mediana do tempo e maior pico de memória entre as repetições
+        for medicoes in zip(*rodadas):
+            medicao = dict(medicoes[0])
+            for campo in ('segundos', 'cpu_segundos'):
+                medicao[campo] = statistics.median(m[campo] for m in medicoes)
+            medicao['linhas_por_segundo'] = linhas / medicao['segundos'] if medicao['segundos'] > 0 else None
+            picos = [m['pico_rss_mb'] for m in medicoes if m['pico_rss_mb'] is not None]
+            medicao['pico_rss_mb'] = max(picos) if picos else None
+            medicao['tamanho_arquivo_mb'] = os.path.getsize(caminho_csv) / 1024 ** 2
+            resultados.append(medicao)
+        tabela = pd.DataFrame([r for r in resultados if r['linhas'] == linhas]).set_index('etapa')
+        print(f"\n{linhas} linhas:")
+        print(tabela[['segundos', 'cpu_segundos', 'linhas_por_segundo', 'pico_rss_mb']].round(3).to_string())
+    return {
+        'versao_formato': VERSAO_FORMATO,
+        'data_hora': datetime.datetime.now().isoformat(timespec='seconds'),
+        'projeto': _versao_do_projeto(),
+        'ambiente': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+                     'plataforma': platform.platform(), 'nucleos': os.cpu_count()},
+        'configuracao': {'linhas': list(linhas_por_tamanho), 'taxa_nulos': taxa_nulos, 'categorias': n_categorias,
+                         'tamanho_chunk': tamanho_chunk, 'repeticoes': repeticoes, 'semente': semente},
+        'resultados': resultados,
+    }
+
+
+def comparar(caminho_antes, caminho_depois, limite_regressao, tempo_minimo=0.05):
+    """Mostra a razão depois/antes de cada etapa. Retorna 1 se alguma ficou mais lenta que o limite.
+
+    Etapas que levam menos de `tempo_minimo` segundos nas duas medições não contam:
+    nelas a variação é só ruído.
+    """
+    with open(caminho_antes, encoding='utf-8') as f:
+        antes = {(r['etapa'], r['linhas']): r for r in json.load(f)['resultados']}
+    with open(caminho_depois, encoding='utf-8') as f:
+        depois = {(r['etapa'], r['linhas']): r for r in json.load(f)['resultados']}
+    piorou = False
+    print(f"{'etapa':<34}{'linhas':>12}{'antes (s)':>12}{'depois (s)':>12}{'razão':>8}{'pico antes':>12}{'pico depois':>13}")
+    for chave in [c for c in depois if c in antes]:
+        a, d = antes[chave], depois[chave]
+        razao = d['segundos'] / a['segundos'] if a['segundos'] > 0 else float('inf')
+        relevante = max(a['segundos'], d['segundos']) >= tempo_minimo
+        aviso = '  <- mais lento' if relevante and razao > limite_regressao else ''
+        piorou = piorou or bool(aviso)
+        print(f"{chave[0]:<34}{chave[1]:>12}{a['segundos']:>12.3f}{d['segundos']:>12.3f}{razao:>8.2f}"
+              f"{a['pico_rss_mb'] or 0:>12.1f}{d['pico_rss_mb'] or 0:>13.1f}{aviso}")
+    if piorou:
+        print(f"Falhou: pelo menos uma etapa ficou mais de {100 * (limite_regressao - 1):.0f}% mais lenta.")
+        return 1
+    print("OK: nenhuma etapa ficou mais lenta que o limite.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Tamanhos a medir (ex: 10000 100000 1000000).')
+    parser.add_argument('--taxa-nulos', type=float, default=0.05)
+    parser.add_argument('--categorias', type=int, default=4)
+    parser.add_argument('--tamanho-chunk', type=int, default=None,
+                        help='Roda as etapas em blocos (necessário para arquivos maiores que a memória).')
+    parser.add_argument('--repeticoes', type=int, default=1,
+                        help='Rodadas por tamanho; vale a mediana do tempo e o maior pico de memória.')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default=SAIDA_PADRAO, help='Arquivo JSON com os resultados.')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES_JSON', 'DEPOIS_JSON'),
+                        help='Só compara dois arquivos de resultados, sem medir nada.')
+    parser.add_argument('--limite-regressao', type=float, default=1.2,
+                        help='Razão depois/antes a partir da qual uma etapa é considerada mais lenta.')
+    parser.add_argument('--tempo-minimo', type=float, default=0.05,
+                        help='Etapas mais rápidas que isso (em segundos) são ignoradas na comparação.')
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        return comparar(*args.comparar, args.limite_regressao, args.tempo_minimo)
+
+    resultado = executar(args.linhas, args.taxa_nulos, args.categorias, args.tamanho_chunk,
+                         args.repeticoes, args.semente)
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em: {args.saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Mede quanto custa importar o pacote `src` em um processo novo.
+
+Cada medição roda em um interpretador limpo, como um processo de trabalho
+recém-criado, e compara o tempo de `import src` com o de `import pandas`
+(que `carregar_dados` sempre precisa). Também confere que Matplotlib,
+Seaborn e Scikit-learn não foram carregados pela importação.
+
+Uso, a partir da raiz do projeto:
+
+    python benchmarks/bench_importacao.py --repeticoes 10 --limite-extra-ms 150
+
+Termina com código 1 se o custo extra de `import src` passar do limite ou se
+alguma biblioteca pesada for importada.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BIBLIOTECAS_PESADAS = ('matplotlib', 'seaborn', 'sklearn', 'scipy')
+
+CODIGO_MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+duracao = time.perf_counter() - inicio
+pesadas = [m for m in {pesadas!r} if m in sys.modules]
+print(json.dumps({{'segundos': duracao, 'pesadas': pesadas}}))
+"""
+
+
+def medir_importacao(modulo, repeticoes):
+    """Importa `modulo` em `repeticoes` interpretadores novos e devolve os tempos."""
+    tempos, pesadas = [], set()
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', CODIGO_MEDICAO.format(modulo=modulo, pesadas=BIBLIOTECAS_PESADAS)],
+            cwd=RAIZ_PROJETO, capture_output=True, text=True, check=True,
+        )
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        tempos.append(resultado['segundos'])
+        pesadas.update(resultado['pesadas'])
+    return tempos, sorted(pesadas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--limite-extra-ms', type=float, default=150.0,
+                        help='Custo máximo de `import src` além do `import pandas`, em milissegundos.')
+    args = parser.parse_args(argv)
+
+    tempos_pandas, _ = medir_importacao('pandas', args.repeticoes)
+    tempos_pacote, pesadas = medir_importacao('src', args.repeticoes)
+    mediana_pandas = statistics.median(tempos_pandas) * 1000
+    mediana_pacote = statistics.median(tempos_pacote) * 1000
+    extra = mediana_pacote - mediana_pandas
+
+    print(f"import pandas: {mediana_pandas:.1f} ms (mediana de {args.repeticoes})")
+    print(f"import src:    {mediana_pacote:.1f} ms (mediana de {args.repeticoes})")
+    print(f"Custo extra do pacote: {extra:.1f} ms (limite: {args.limite_extra_ms:.0f} ms)")
+
+    if pesadas:
+        print(f"Falhou: a importação carregou bibliotecas pesadas: {', '.join(pesadas)}")
+        return 1
+    if extra > args.limite_extra_ms:
+        print("Falhou: a importação do pacote ficou mais lenta que o limite.")
+        return 1
+    print("OK: importação leve, sem bibliotecas de gráficos ou de Machine Learning.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
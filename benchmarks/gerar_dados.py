@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Gera dados sintéticos com as mesmas colunas de `data/raw/dados_exemplo_2.csv`.
+
+O número de linhas, a fração de valores ausentes e o número de categorias são
+configuráveis. O arquivo é escrito em blocos, então mesmo 100 milhões de linhas
+não precisam caber na memória. As relações entre as colunas imitam as do
+arquivo de exemplo (o alvo depende de valor_compra, feature_numerica, idade e
+categoria, com ruído), para que o modelo tenha o que aprender.
+
+Uso, a partir da raiz do projeto:
+
+    python benchmarks/gerar_dados.py data/raw/sintetico_1m.csv --linhas 1000000 --taxa-nulos 0.05 --categorias 4
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+COLUNAS = ['id', 'idade', 'sexo', 'categoria', 'valor_compra', 'feature_numerica', 'target']
+# Colunas que recebem valores ausentes, como no arquivo de exemplo
+COLUNAS_COM_NULOS = ('idade', 'categoria', 'valor_compra')
+SEXOS = np.array(['F', 'M', 'Outro'])
+PROPORCOES_SEXO = [0.49, 0.47, 0.04]
+
+
+def nomes_das_categorias(n_categorias):
+    """'A', 'B', ... até 26 categorias; acima disso, 'C00001', 'C00002', ..."""
+    if n_categorias <= 26:
+        return np.array([chr(ord('A') + i) for i in range(n_categorias)])
+    return np.array([f"C{i:05d}" for i in range(1, n_categorias + 1)])
+
+
+def gerar_bloco(inicio, linhas, taxa_nulos, categorias, efeitos_categoria, gerador):
+    """Gera as linhas com ids de `inicio + 1` a `inicio + linhas`."""
+    idade = gerador.integers(18, 75, linhas).astype('float64')
+    valor_compra = np.round(gerador.uniform(5, 1000, linhas), 2)
+    feature_numerica = np.round(gerador.normal(150, 30, linhas), 2)
+    # Categorias menos frequentes no fim da lista, como no exemplo
+    pesos = 1 / np.arange(1, len(categorias) + 1) ** 0.5
+    codigos = gerador.choice(len(categorias), linhas, p=pesos / pesos.sum())
+    target = (0.7 * idade + 1.1 * valor_compra + 0.9 * feature_numerica + efeitos_categoria[codigos]
+              + gerador.normal(0, 70, linhas))
+    bloco = pd.DataFrame({
+        'id': np.arange(inicio + 1, inicio + linhas + 1),
+        'idade': idade,
+        'sexo': SEXOS[gerador.choice(3, linhas, p=PROPORCOES_SEXO)],
+        'categoria': categorias[codigos].astype(object),
+        'valor_compra': valor_compra,
+        'feature_numerica': feature_numerica,
+        'target': np.round(target, 2),
+    })
+    for coluna in COLUNAS_COM_NULOS:
+        bloco.loc[gerador.random(linhas) < taxa_nulos, coluna] = np.nan
+    return bloco
+
+
+def gerar_dados(caminho_arquivo, linhas, taxa_nulos=0.05, n_categorias=4, semente=0, linhas_por_bloco=1_000_000):
+    """Escreve `linhas` registros sintéticos em `caminho_arquivo` e devolve o caminho."""
+    gerador = np.random.default_rng(semente)
+    categorias = nomes_das_categorias(n_categorias)
+    efeitos_categoria = gerador.normal(0, 10, n_categorias)
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_arquivo)), exist_ok=True)
+    with open(caminho_arquivo, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(COLUNAS) + '\n')
+        for inicio in range(0, linhas, linhas_por_bloco):
+            bloco = gerar_bloco(inicio, min(linhas_por_bloco, linhas - inicio), taxa_nulos,
+                                categorias, efeitos_categoria, gerador)
+            bloco.to_csv(f, header=False, index=False)
+    return caminho_arquivo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('caminho_arquivo', help='CSV a criar.')
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--taxa-nulos', type=float, default=0.05,
+                        help='Fração de valores ausentes em idade, categoria e valor_compra.')
+    parser.add_argument('--categorias', type=int, default=4, help='Número de categorias distintas.')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    gerar_dados(args.caminho_arquivo, args.linhas, args.taxa_nulos, args.categorias, args.semente)
+    tamanho = os.path.getsize(args.caminho_arquivo) / 1024 ** 2
+    print(f"{args.linhas} linhas gravadas em {args.caminho_arquivo} ({tamanho:.1f} MB).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Análise de Dados e Machine Learning Básico.
 
+Importar o pacote não executa nenhuma análise e não carrega Matplotlib,
+Seaborn nem Scikit-learn; essas bibliotecas só são importadas pelas funções
+que desenham gráficos ou treinam modelos. O fluxo completo fica em
+`src.cli` (`python -m src`).
+"""
+from .carregamento import (
+    FluxoDeBlocos,
+    carregar_dados,
+    compactar_tipos,
+    dividir_arquivo_em_faixas,
+    dividir_particoes_em_faixas,
+    eh_comprimido,
+    eh_fluxo,
+    eh_particionado,
+    exibir_tempos_de_leitura,
+    inferir_esquema,
+    iterar_em_pares,
+    ler_faixa,
+    listar_particoes,
+)
+from .comparacao import modelos_padrao, treinar_varios_modelos
+from .correlacao import AcumuladorCorrelacao, analisar_correlacoes
+from .eda import (
+    exibir_estatisticas_descritivas,
+    exibir_info_gerais,
+    exibir_inicio_fim,
+    exibir_previa_arquivo,
+    perfilar_dados,
+    verificar_valores_ausentes,
+    verificar_valores_unicos,
+)
+from .etapas import GrafoDeEtapas, Resultado
+from .incremental import atualizar_incremental
+from .instrumentacao import (
+    ColetorEventos,
+    SaidaJsonLinhas,
+    SaidaTexto,
+    adicionar_saida,
+    instrumentar,
+    registrando,
+    remover_saida,
+)
+from .modelagem import (
+    AcumuladorMetricas,
+    EstatisticasSuficientes,
+    avaliar_modelo,
+    carregar_modelo,
+    modelo_com_coeficientes,
+    plotar_reais_vs_previstos,
+    salvar_modelo,
+    treinar_modelo_regressao,
+    treinar_regressao_fora_da_memoria,
+)
+from .particoes import perfilar_particoes, processar_particoes
+from .pontuacao import pontuar_arquivo
+from .relatorio import gerar_relatorio
+from .perfil import PerfilColuna, PerfilDados, ResumoDistintos, ResumoFrequentes, ResumoQuantis
+from .previa import ler_fim, ler_inicio, resumir_por_amostragem
+from .preprocessamento import (
+    PreProcessador,
+    codificar_variaveis_categoricas,
+    MatrizModelo,
+    dividir_dados_treino_teste,
+    montar_matriz_modelo,
+    remover_colunas_nao_numericas_para_modelo,
+    tratar_valores_ausentes,
+)
+from .validacao import validar_modelo
+from .visualizacao import plotar_grafico_barras, plotar_grafico_dispersao, plotar_histograma
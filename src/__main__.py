@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Permite executar o fluxo completo com `python -m src`."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,735 @@
+# -*- coding: utf-8 -*-
+"""Carregamento de dados: leitura completa, em blocos e via cache colunar."""
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import instrumentar
+
+
+class FluxoDeBlocos:
+    """Sequência re-iterável de blocos (chunks) de um DataFrame.
+
+    Cada iteração relê a fonte desde o início e aplica, em ordem, as
+    transformações registradas com `mapear`. Assim, cada etapa do fluxo
+    trabalha um bloco por vez e a tabela inteira nunca fica em memória.
+    """
+
+    def __init__(self, abrir_fonte=None, pai=None, transformacao=None, tempos_leitura=None):
+        self._abrir_fonte = abrir_fonte
+        self._pai = pai
+        self._transformacao = transformacao
+        self._tempos_leitura = tempos_leitura
+        self._primeiro = None
+
+    def __iter__(self):
+        if self._pai is None:
+            yield from self._abrir_fonte()
+        else:
+            for bloco in self._pai:
+                yield self._transformacao(bloco)
+
+    def mapear(self, transformacao):
+        """Retorna um novo fluxo que aplica `transformacao` a cada bloco."""
+        return FluxoDeBlocos(pai=self, transformacao=transformacao)
+
+    def primeiro_bloco(self):
+        """Retorna (e guarda) o primeiro bloco, útil para descobrir colunas e tipos."""
+        if self._primeiro is None:
+            for bloco in self:
+                self._primeiro = bloco
+                break
+        return self._primeiro
+
+    @property
+    def colunas(self):
+        bloco = self.primeiro_bloco()
+        return bloco.columns if bloco is not None else pd.Index([])
+
+    @property
+    def tempos_leitura(self):
+        """Tempos somados de todas as leituras da fonte (veja `exibir_tempos_de_leitura`), ou None."""
+        fluxo = self
+        while fluxo._pai is not None:
+            fluxo = fluxo._pai
+        return fluxo._tempos_leitura
+
+
+def eh_fluxo(dados):
+    """Indica se `dados` é um FluxoDeBlocos em vez de um DataFrame completo."""
+    return isinstance(dados, FluxoDeBlocos)
+
+
+def iterar_em_pares(fluxo_x, fluxo_y):
+    """Percorre dois fluxos derivados do mesmo pai lendo a fonte uma única vez."""
+    if eh_fluxo(fluxo_x) and eh_fluxo(fluxo_y) and fluxo_x._pai is not None and fluxo_x._pai is fluxo_y._pai:
+        for bloco in fluxo_x._pai:
+            yield fluxo_x._transformacao(bloco), fluxo_y._transformacao(bloco)
+    else:
+        yield from zip(fluxo_x, fluxo_y)
+
+
+# Extensões que o Pandas descompacta sozinho ('.zst' precisa do pacote zstandard)
+EXTENSOES_COMPRIMIDAS = ('.gz', '.bz2', '.xz', '.zst', '.zip')
+
+
+def eh_comprimido(caminho_arquivo):
+    """True se o arquivo é compactado (ex.: 'dados.csv.gz'), e por isso não pode ser lido em faixas de bytes."""
+    return str(caminho_arquivo).lower().endswith(EXTENSOES_COMPRIMIDAS)
+
+
+def _ler_blocos(abrir_fonte, blocos_antecipados, tempos):
+    """Gera os blocos de `abrir_fonte()`, medindo o tempo de leitura e o tempo de espera por eles.
+
+    Com `blocos_antecipados` > 0, uma thread lê (e descompacta) os próximos
+    blocos enquanto o bloco atual passa pelas etapas seguintes; a fila guarda
+    no máximo esse número de blocos, então a leitura espera quando as etapas
+    ficam para trás. A leitura do Pandas e a descompactação liberam o GIL
+    durante a maior parte do trabalho, o que permite a sobreposição.
+
+    `tempos` acumula, entre as passadas: 'leitura' (segundos lendo os blocos),
+    'espera' (segundos em que as etapas ficaram paradas aguardando um bloco),
+    'total' (duração das passadas), 'blocos' e 'passadas'.
+    """
+    inicio_passada = time.perf_counter()
+    tempos['passadas'] += 1
+    try:
+        if not blocos_antecipados:
+            fonte = abrir_fonte()
+            try:
+                while True:
+                    inicio = time.perf_counter()
+                    bloco = next(fonte, None)
+                    duracao = time.perf_counter() - inicio
+                    # Sem leitura antecipada, toda a leitura é espera
+                    tempos['leitura'] += duracao
+                    tempos['espera'] += duracao
+                    if bloco is None:
+                        return
+                    tempos['blocos'] += 1
+                    yield bloco
+            finally:
+                fonte.close()
+
+        fila = queue.Queue(maxsize=blocos_antecipados)
+        parar = threading.Event()
+        fim = object()
+
+        def entregar(item):
+            while not parar.is_set():
+                try:
+                    fila.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def ler():
+            fonte = abrir_fonte()
+            try:
+                while not parar.is_set():
+                    inicio = time.perf_counter()
+                    bloco = next(fonte, None)
+                    tempos['leitura'] += time.perf_counter() - inicio
+                    if bloco is None or not entregar(bloco):
+                        break
+                entregar(fim)
+            except BaseException as e:
+                entregar(e)
+            finally:
+                fonte.close()
+
+        leitora = threading.Thread(target=ler, name='leitura-antecipada', daemon=True)
+        leitora.start()
+        try:
+            while True:
+                inicio = time.perf_counter()
+                item = fila.get()
+                tempos['espera'] += time.perf_counter() - inicio
+                if item is fim:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                tempos['blocos'] += 1
+                yield item
+        finally:
+            # Também quando a passada é interrompida (ex.: `primeiro_bloco`): a thread para e libera o arquivo
+            parar.set()
+            leitora.join()
+    finally:
+        tempos['total'] += time.perf_counter() - inicio_passada
+
+
+def _fluxo_medido(abrir_fonte, blocos_antecipados=0):
+    """FluxoDeBlocos de um arquivo, com leitura antecipada opcional e tempos de leitura medidos."""
+    tempos = {'leitura': 0.0, 'espera': 0.0, 'total': 0.0, 'blocos': 0, 'passadas': 0}
+    return FluxoDeBlocos(lambda: _ler_blocos(abrir_fonte, blocos_antecipados, tempos), tempos_leitura=tempos)
+
+
+def exibir_tempos_de_leitura(fluxo):
+    """Mostra quanto do tempo das passadas por um fluxo foi gasto esperando a leitura (E/S e descompactação)
+    e quanto processando os blocos, para saber o que limita a execução.
+
+    Returns:
+        dict: Os tempos somados, ou None se o fluxo não tiver tempos medidos.
+    """
+    tempos = fluxo.tempos_leitura if eh_fluxo(fluxo) else None
+    if not tempos or not tempos['passadas'] or tempos['total'] <= 0:
+        return None
+    processamento = max(0.0, tempos['total'] - tempos['espera'])
+    fracao_espera = tempos['espera'] / tempos['total']
+    print("\n--- Tempo de leitura dos dados ---")
+    print(f"{tempos['passadas']} passada(s) pelos dados, {tempos['blocos']} blocos, em {tempos['total']:.1f}s.")
+    print(f"Lendo e descompactando: {tempos['leitura']:.1f}s. Etapas esperando pelos dados: {tempos['espera']:.1f}s "
+          f"({fracao_espera * 100:.0f}%). Etapas processando: {processamento:.1f}s ({(1 - fracao_espera) * 100:.0f}%).")
+    if fracao_espera > 0.5:
+        print("A execução está limitada pela leitura: um disco mais rápido, o cache colunar ou arquivos sem "
+              "compactação ajudam mais que mais processamento.")
+    else:
+        print("A execução está limitada pelo processamento: a leitura já acompanha as etapas.")
+    return dict(tempos)
+
+
+def inferir_esquema(caminho_arquivo, linhas_amostra=10000):
+    """Infere os tipos das colunas a partir das primeiras linhas do arquivo.
+
+    Colunas inteiras viram float64, pois um bloco posterior pode trazer valores
+    ausentes, e colunas vazias na amostra são lidas como texto.
+    """
+    amostra = pd.read_csv(caminho_arquivo, nrows=linhas_amostra)
+    esquema = {}
+    for coluna, tipo in amostra.dtypes.items():
+        if amostra[coluna].isnull().all():
+            esquema[coluna] = 'object'
+        elif pd.api.types.is_bool_dtype(tipo):
+            esquema[coluna] = 'boolean'
+        elif pd.api.types.is_numeric_dtype(tipo):
+            esquema[coluna] = 'float64'
+        else:
+            esquema[coluna] = tipo
+    return esquema
+
+
+def dividir_arquivo_em_faixas(caminho_arquivo, tamanho_faixa=64 * 1024 ** 2, inicio=None, fim=None):
+    """Divide o CSV em faixas de bytes que começam e terminam em quebras de linha.
+
+    Cada faixa pode ser lida por um processo diferente com `ler_faixa`, sem que
+    nenhum deles precise percorrer o arquivo desde o início. Campos entre aspas
+    com quebras de linha dentro não são suportados.
+
+    Arquivos compactados não podem ser lidos a partir do meio: viram uma única
+    faixa (0, None), lida do começo ao fim por `ler_faixa`.
+
+    Args:
+        inicio, fim (int, opcional): Divide só os bytes entre estas posições (ambas
+            em início de linha), ex.: as linhas acrescentadas desde a última leitura.
+            Por padrão, do fim do cabeçalho até o fim do arquivo.
+
+    Returns:
+        tuple: (nomes das colunas do cabeçalho, lista de (inicio, fim) em bytes)
+    """
+    colunas = list(pd.read_csv(caminho_arquivo, nrows=0).columns)
+    if eh_comprimido(caminho_arquivo):
+        if inicio is not None or fim is not None:
+            raise ValueError(f"O arquivo compactado {caminho_arquivo} só pode ser lido do começo ao fim.")
+        return colunas, [(0, None)]
+    tamanho = os.path.getsize(caminho_arquivo) if fim is None else fim
+    faixas = []
+    with open(caminho_arquivo, 'rb') as f:
+        f.readline()
+        inicio = f.tell() if inicio is None else inicio
+        while inicio < tamanho:
+            fim = inicio + tamanho_faixa
+            if fim < tamanho:
+                # Avança até o fim da linha em que a faixa caiu
+                f.seek(fim)
+                f.readline()
+                fim = f.tell()
+            fim = min(fim, tamanho)
+            faixas.append((inicio, fim))
+            inicio = fim
+    return colunas, faixas
+
+
+def ler_faixa(caminho_arquivo, inicio, fim, colunas, esquema=None, tamanho_chunk=None):
+    """Lê as linhas entre os bytes `inicio` e `fim` do CSV, em blocos de `tamanho_chunk` linhas.
+
+    Com `fim=None` (a faixa de um arquivo compactado), lê o arquivo inteiro.
+    """
+    if fim is None:
+        opcoes = dict(header=0, names=colunas, dtype=esquema)
+        if tamanho_chunk:
+            with pd.read_csv(caminho_arquivo, chunksize=tamanho_chunk, **opcoes) as leitor:
+                yield from leitor
+        else:
+            yield pd.read_csv(caminho_arquivo, **opcoes)
+        return
+    with open(caminho_arquivo, 'rb') as f:
+        f.seek(inicio)
+        conteudo = f.read(fim - inicio)
+    if not conteudo.strip():
+        return
+    opcoes = dict(header=None, names=colunas, dtype=esquema)
+    if tamanho_chunk:
+        with pd.read_csv(io.BytesIO(conteudo), chunksize=tamanho_chunk, **opcoes) as leitor:
+            yield from leitor
+    else:
+        yield pd.read_csv(io.BytesIO(conteudo), **opcoes)
+
+
+def _reduzir_numerica(serie):
+    """Menor tipo numérico que guarda exatamente os mesmos valores (a série original, se nenhum servir)."""
+    if pd.api.types.is_bool_dtype(serie) or not pd.api.types.is_numeric_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return pd.to_numeric(serie, downcast='integer')
+    valores = serie.to_numpy(dtype='float64')
+    reduzidos = valores.astype('float32')
+    # Só troca se todos os valores (e os ausentes) voltarem iguais de float32
+    if np.array_equal(reduzidos.astype('float64'), valores, equal_nan=True):
+        return pd.Series(reduzidos, index=serie.index, name=serie.name)
+    return serie
+
+
+def compactar_tipos(df):
+    """Reduz a memória de um DataFrame, alterando-o no lugar.
+
+    Colunas de texto viram 'category' (cada texto diferente é guardado uma só
+    vez) e as numéricas passam para o menor tipo que guarda exatamente os
+    mesmos valores (ex.: idades inteiras em int8, preços com 2 casas que cabem
+    em float32). Retorna o próprio `df`.
+    """
+    for coluna in df.columns:
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+            df[coluna] = _reduzir_numerica(serie)
+        else:
+            df[coluna] = serie.astype('category')
+    return df
+
+
+def _memoria_por_linha(amostra):
+    """Bytes por linha de cada coluna em uma leitura comum, medidos em uma amostra."""
+    if amostra.empty:
+        return pd.Series(0.0, index=amostra.columns)
+    return amostra.memory_usage(deep=True, index=False) / len(amostra)
+
+
+def _informar_economia(df, memoria_por_linha):
+    """Compara a memória do DataFrame carregado com a estimada para a leitura comum de todas as colunas."""
+    usada = df.memory_usage(deep=True, index=False).sum()
+    comum = memoria_por_linha.sum() * len(df)
+    ignoradas = [c for c in memoria_por_linha.index if c not in df.columns]
+    if ignoradas:
+        print(f"Colunas não lidas, pois o fluxo não as usa: {', '.join(ignoradas)}.")
+    if comum > 0:
+        print(f"Memória usada pelos dados: {usada / 1024 ** 2:.2f} MB. Uma leitura comum de todas as colunas usaria "
+              f"cerca de {comum / 1024 ** 2:.2f} MB (economia de {max(0.0, 1 - usada / comum) * 100:.0f}%).")
+
+
+def eh_particionado(caminho):
+    """True se `caminho` é uma pasta ou um padrão de arquivos (ex.: 'dados/2024-*.csv'), e não um único arquivo."""
+    return os.path.isdir(caminho) or any(caractere in caminho for caractere in '*?[')
+
+
+def listar_particoes(caminho):
+    """Arquivos CSV de uma pasta ou de um padrão, em ordem alfabética (um único arquivo vira uma lista de um).
+
+    Em uma pasta, valem também os CSVs compactados (ex.: 'dia-01.csv.gz').
+    """
+    if os.path.isdir(caminho):
+        arquivos = [arquivo for extensao in ('',) + EXTENSOES_COMPRIMIDAS
+                    for arquivo in glob.glob(os.path.join(caminho, f'*.csv{extensao}'))]
+    elif eh_particionado(caminho):
+        arquivos = glob.glob(caminho)
+    else:
+        arquivos = [caminho]
+    return sorted(arquivo for arquivo in arquivos if os.path.isfile(arquivo))
+
+
+def dividir_particoes_em_faixas(arquivos, tamanho_faixa=64 * 1024 ** 2):
+    """Faixas de bytes de todos os arquivos, para distribuí-las entre processos.
+
+    Returns:
+        tuple: (nomes das colunas, lista de (arquivo, inicio, fim) em bytes)
+
+    Raises:
+        ValueError: Se os arquivos não tiverem as mesmas colunas.
+    """
+    colunas, faixas = None, []
+    for arquivo in arquivos:
+        colunas_arquivo, faixas_arquivo = dividir_arquivo_em_faixas(arquivo, tamanho_faixa)
+        if colunas is None:
+            colunas = colunas_arquivo
+        elif colunas_arquivo != colunas:
+            raise ValueError(f"O arquivo {arquivo} não tem as mesmas colunas que {arquivos[0]}.")
+        faixas += [(arquivo, inicio, fim) for inicio, fim in faixas_arquivo]
+    return colunas, faixas
+
+
+def _carregar_particoes(caminho, tamanho_chunk, linhas_amostra, colunas=None, compactar=False, blocos_antecipados=0):
+    """Lê todos os arquivos de uma pasta ou padrão, um após o outro, como se fossem um só."""
+    arquivos = listar_particoes(caminho)
+    if not arquivos:
+        print(f"\nOops! Não encontrei nenhum arquivo CSV em: {caminho}")
+        return None
+    colunas_arquivo = list(pd.read_csv(arquivos[0], nrows=0).columns)
+    for arquivo in arquivos[1:]:
+        if list(pd.read_csv(arquivo, nrows=0).columns) != colunas_arquivo:
+            print(f"\nOs arquivos precisam ter as mesmas colunas, mas {arquivo} é diferente de {arquivos[0]}.")
+            return None
+    if not _colunas_existem(colunas, colunas_arquivo):
+        return None
+    if tamanho_chunk:
+        # O mesmo esquema para todas as partes, para os blocos terem sempre os mesmos tipos
+        esquema = inferir_esquema(arquivos[0], linhas_amostra)
+        if colunas is not None:
+            esquema = {c: t for c, t in esquema.items() if c in colunas}
+
+        def abrir_fonte():
+            # O índice continua de um arquivo para o outro, como em um arquivo só: a divisão
+            # treino/teste em blocos sorteia a partir dele e não pode repetir o sorteio em cada parte
+            linhas_lidas = 0
+            for arquivo in arquivos:
+                with pd.read_csv(arquivo, chunksize=tamanho_chunk, dtype=esquema, usecols=colunas) as leitor:
+                    for bloco in leitor:
+                        bloco.index = pd.RangeIndex(linhas_lidas, linhas_lidas + len(bloco))
+                        linhas_lidas += len(bloco)
+                        yield bloco
+
+        print(f"\nDados prontos para leitura em blocos de {tamanho_chunk} registros, de {len(arquivos)} arquivos "
+              f"com {len(esquema)} tipos de informação.")
+        return _fluxo_medido(abrir_fonte, blocos_antecipados)
+    df = pd.concat([pd.read_csv(arquivo, usecols=colunas) for arquivo in arquivos], ignore_index=True)
+    print(f"\nDados carregados com sucesso! foi encontrado {df.shape[0]} registros e {df.shape[1]} tipos de informação "
+          f"em {len(arquivos)} arquivos.")
+    if compactar:
+        # As categorias só são unificadas depois de juntar as partes
+        _informar_economia(compactar_tipos(df), _memoria_por_linha(pd.read_csv(arquivos[0], nrows=linhas_amostra)))
+    return df
+
+
+def _colunas_existem(colunas, colunas_arquivo):
+    faltando = [c for c in colunas or () if c not in colunas_arquivo]
+    if faltando:
+        print(f"\nAs colunas pedidas não existem no arquivo: {', '.join(faltando)}")
+        return False
+    return True
+
+
+# Cache colunar: cada CSV já lido é convertido uma única vez para arquivos
+# binários por coluna (memória mapeada), identificados pelo hash do conteúdo.
+PASTA_CACHE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache')
+LIMITE_CACHE_BYTES = 10 * 1024 ** 3
+VERSAO_CACHE = 2
+
+
+def _hash_arquivo(caminho_arquivo, pasta_cache, tamanho_bloco=1024 * 1024):
+    """Calcula o SHA-256 do conteúdo do arquivo.
+
+    O resultado fica anotado junto com o tamanho e a data de modificação, para
+    que um arquivo inalterado não precise ser relido. Cada arquivo de entrada
+    tem o seu próprio registro em `pasta_cache/hashes`, gravado de uma vez
+    (arquivo temporário + `os.replace`): processos que leem arquivos diferentes
+    ao mesmo tempo não apagam o registro um do outro, e um registro ilegível só
+    faz o hash ser recalculado.
+    """
+    caminho_absoluto = os.path.abspath(caminho_arquivo)
+    estado = os.stat(caminho_absoluto)
+    pasta_registros = os.path.join(pasta_cache, 'hashes')
+    caminho_registro = os.path.join(pasta_registros,
+                                    hashlib.sha256(caminho_absoluto.encode()).hexdigest()[:32] + '.json')
+    try:
+        with open(caminho_registro, encoding='utf-8') as f:
+            registro = json.load(f)
+        if (registro['caminho'] == caminho_absoluto and registro['tamanho'] == estado.st_size
+                and registro['mtime_ns'] == estado.st_mtime_ns):
+            return registro['hash']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    sha = hashlib.sha256()
+    with open(caminho_absoluto, 'rb') as f:
+        for pedaco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(pedaco)
+    registro = {'caminho': caminho_absoluto, 'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns,
+                'hash': sha.hexdigest()}
+    os.makedirs(pasta_registros, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta_registros, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+            json.dump(registro, f)
+        os.replace(temporario, caminho_registro)
+    except OSError:
+        # Sem o registro, o hash só é recalculado na próxima vez
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+    return registro['hash']
+
+
+def _converter_para_cache(caminho_arquivo, pasta_destino, tamanho_chunk, linhas_amostra):
+    """Converte o CSV, bloco a bloco, em um arquivo binário por coluna.
+
+    Colunas numéricas são gravadas como float64; colunas de texto viram códigos
+    int32 com um vocabulário único. Colunas que eram inteiras (ou booleanas) na
+    amostra e não tiveram nenhum ausente são regravadas no tipo original no final,
+    reproduzindo o que `pd.read_csv` faria com o arquivo inteiro.
+    """
+    amostra = pd.read_csv(caminho_arquivo, nrows=linhas_amostra)
+    colunas = []
+    for indice, (nome, tipo) in enumerate(amostra.dtypes.items()):
+        if amostra[nome].isnull().all() or not (pd.api.types.is_numeric_dtype(tipo) or pd.api.types.is_bool_dtype(tipo)):
+            especie = 'texto'
+        elif pd.api.types.is_bool_dtype(tipo):
+            especie = 'booleano'
+        elif pd.api.types.is_integer_dtype(tipo):
+            especie = 'inteiro'
+        else:
+            especie = 'real'
+        colunas.append({'nome': nome, 'especie': especie, 'arquivo': f'c{indice}.bin',
+                        'dtype': 'int32' if especie == 'texto' else 'float64',
+                        'dtype_pandas': str(tipo), 'tem_ausentes': False})
+
+    esquema = {c['nome']: ('boolean' if c['especie'] == 'booleano' else 'float64') for c in colunas if c['especie'] != 'texto'}
+    vocabularios = {c['nome']: {} for c in colunas if c['especie'] == 'texto'}
+    arquivos = {c['nome']: open(os.path.join(pasta_destino, c['arquivo']), 'wb') for c in colunas}
+    linhas = 0
+    try:
+        with pd.read_csv(caminho_arquivo, chunksize=tamanho_chunk, dtype=esquema) as leitor:
+            for bloco in leitor:
+                linhas += len(bloco)
+                for coluna in colunas:
+                    serie = bloco[coluna['nome']]
+                    if serie.isnull().any():
+                        coluna['tem_ausentes'] = True
+                    if coluna['especie'] == 'texto':
+                        codigos, unicos = pd.factorize(serie)
+                        vocabulario = vocabularios[coluna['nome']]
+                        globais = np.array([vocabulario.setdefault(valor, len(vocabulario)) for valor in unicos], dtype='int32')
+                        valores = np.where(codigos >= 0, globais[codigos] if len(globais) else -1, -1).astype('int32')
+                    else:
+                        valores = serie.to_numpy(dtype='float64', na_value=np.nan)
+                    arquivos[coluna['nome']].write(valores.tobytes())
+    finally:
+        for f in arquivos.values():
+            f.close()
+
+    for coluna in colunas:
+        if coluna['especie'] == 'texto':
+            coluna['categorias'] = list(vocabularios[coluna['nome']])
+            # Vazia na amostra (lida como float64), mas com textos depois: passa a ser coluna de texto
+            if any(isinstance(valor, str) for valor in coluna['categorias']) and \
+                    pd.api.types.is_numeric_dtype(coluna['dtype_pandas']):
+                coluna['dtype_pandas'] = str(pd.Series(coluna['categorias'][:1]).dtype)
+        elif coluna['especie'] in ('inteiro', 'booleano') and not coluna['tem_ausentes']:
+            novo_dtype = 'int64' if coluna['especie'] == 'inteiro' else 'bool'
+            origem = os.path.join(pasta_destino, coluna['arquivo'])
+            valores = np.memmap(origem, dtype='float64', mode='r', shape=(linhas,)) if linhas else np.empty(0)
+            with open(origem + '.tmp', 'wb') as f:
+                for inicio in range(0, linhas, tamanho_chunk):
+                    f.write(valores[inicio:inicio + tamanho_chunk].astype(novo_dtype).tobytes())
+            del valores
+            os.replace(origem + '.tmp', origem)
+            coluna['dtype'] = novo_dtype
+
+    with open(os.path.join(pasta_destino, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO_CACHE, 'linhas': linhas, 'colunas': colunas}, f, ensure_ascii=False)
+
+
+def _coluna_do_cache(pasta_entrada, coluna, linhas, inicio=0, fim=None, como_categoria=False):
+    """Lê (por mapeamento de memória) uma fatia de uma coluna do cache."""
+    if linhas == 0:
+        valores = np.empty(0, dtype=coluna['dtype'])
+    else:
+        valores = np.memmap(os.path.join(pasta_entrada, coluna['arquivo']), dtype=coluna['dtype'], mode='r', shape=(linhas,))
+    valores = valores[inicio:fim]
+    if coluna['especie'] == 'texto' and como_categoria:
+        # Os códigos do cache já são os de uma coluna 'category' (-1 é ausente)
+        return pd.Categorical.from_codes(np.asarray(valores), categories=coluna['categorias'])
+    if coluna['especie'] == 'texto':
+        # O código -1 (ausente) aponta para o NaN acrescentado no final
+        categorias = np.array(coluna['categorias'] + [np.nan], dtype=object)
+        return pd.Series(categorias[valores], dtype=coluna['dtype_pandas'])
+    if coluna['especie'] == 'booleano' and coluna['tem_ausentes']:
+        return pd.Series(valores, dtype='float64').astype('boolean')
+    return np.asarray(valores)
+
+
+def _dataframe_do_cache(pasta_entrada, meta, inicio=0, fim=None, colunas=None, como_categoria=False):
+    fim = meta['linhas'] if fim is None else min(fim, meta['linhas'])
+    dados = {c['nome']: _coluna_do_cache(pasta_entrada, c, meta['linhas'], inicio, fim, como_categoria)
+             for c in meta['colunas'] if colunas is None or c['nome'] in colunas}
+    df = pd.DataFrame(dados, copy=False)
+    df.index = pd.RangeIndex(inicio, fim)
+    return df
+
+
+def _aplicar_limite_lru(pasta_cache, limite_bytes, preservar=None):
+    """Apaga as entradas menos usadas recentemente até o cache caber no limite.
+
+    O último uso de cada entrada é a data de modificação do seu `meta.json`,
+    atualizada a cada leitura.
+    """
+    entradas = []
+    for nome in os.listdir(pasta_cache):
+        pasta = os.path.join(pasta_cache, nome)
+        meta = os.path.join(pasta, 'meta.json')
+        if not os.path.isfile(meta):
+            continue
+        tamanho = sum(os.path.getsize(os.path.join(pasta, arquivo)) for arquivo in os.listdir(pasta))
+        entradas.append((os.path.getmtime(meta), tamanho, pasta))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, pasta in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        if preservar is not None and os.path.samefile(pasta, preservar):
+            continue
+        shutil.rmtree(pasta, ignore_errors=True)
+        total -= tamanho
+
+
+def _abrir_cache(caminho_arquivo, pasta_cache, limite_cache_bytes, linhas_amostra, tamanho_chunk):
+    """Retorna (pasta_da_entrada, meta) do cache, convertendo o CSV se preciso."""
+    os.makedirs(pasta_cache, exist_ok=True)
+    opcoes = json.dumps({'versao': VERSAO_CACHE, 'linhas_amostra': linhas_amostra}, sort_keys=True)
+    chave = hashlib.sha256((_hash_arquivo(caminho_arquivo, pasta_cache) + opcoes).encode()).hexdigest()[:32]
+    pasta_entrada = os.path.join(pasta_cache, chave)
+    caminho_meta = os.path.join(pasta_entrada, 'meta.json')
+
+    if os.path.exists(caminho_meta):
+        os.utime(caminho_meta)
+        print("Usando a versão já convertida deste arquivo (cache), sem reler o CSV.")
+    else:
+        print("Primeira leitura deste arquivo: convertendo para o cache colunar...")
+        temporaria = f"{pasta_entrada}.{os.getpid()}.tmp"
+        shutil.rmtree(temporaria, ignore_errors=True)
+        os.makedirs(temporaria)
+        try:
+            _converter_para_cache(caminho_arquivo, temporaria, tamanho_chunk or 1_000_000, linhas_amostra)
+            os.replace(temporaria, pasta_entrada)
+        except OSError:
+            # Outro processo gravou a mesma entrada ao mesmo tempo
+            shutil.rmtree(temporaria, ignore_errors=True)
+            if not os.path.exists(caminho_meta):
+                raise
+        except Exception:
+            shutil.rmtree(temporaria, ignore_errors=True)
+            raise
+        _aplicar_limite_lru(pasta_cache, limite_cache_bytes, preservar=pasta_entrada)
+
+    with open(caminho_meta, encoding='utf-8') as f:
+        return pasta_entrada, json.load(f)
+
+
+@instrumentar
+def carregar_dados(caminho_arquivo, tamanho_chunk=None, linhas_amostra=10000,
+                   usar_cache=False, pasta_cache=PASTA_CACHE_PADRAO, limite_cache_bytes=LIMITE_CACHE_BYTES,
+                   colunas=None, compactar=False, blocos_antecipados=0):
+    """Carrega dados de um arquivo CSV para um DataFrame Pandas.
+
+    Args:
+        caminho_arquivo (str): O caminho para o arquivo CSV, ou uma pasta ou padrão
+            (ex.: 'dados/2024-*.csv') com vários arquivos de mesmas colunas, lidos
+            como um só.
+        tamanho_chunk (int, opcional): Se informado, o arquivo não é lido de uma vez.
+            Retorna um FluxoDeBlocos com blocos de até `tamanho_chunk` linhas,
+            aceito por todas as etapas seguintes do fluxo.
+        linhas_amostra (int): Linhas usadas para inferir os tipos no modo em blocos.
+        usar_cache (bool): Se True, o CSV é convertido uma vez para um cache colunar
+            binário em `pasta_cache` e as próximas leituras usam mapeamento de memória.
+        pasta_cache (str): Pasta do cache colunar.
+        limite_cache_bytes (int): Tamanho máximo do cache; as entradas usadas há
+            mais tempo são apagadas quando o limite é ultrapassado.
+        colunas (list, opcional): Só estas colunas são lidas; as demais nem passam
+            pela conversão do CSV.
+        compactar (bool): Se True, colunas de texto são carregadas como 'category'
+            e as numéricas no menor tipo que guarda os mesmos valores
+            (`compactar_tipos`), informando a memória economizada. Vale para a
+            leitura de uma vez; no modo em blocos só `colunas` é aplicado.
+        blocos_antecipados (int): No modo em blocos, quantos blocos uma thread lê
+            (e descompacta) à frente das etapas que os processam. 0 lê cada bloco
+            só quando ele é pedido. Os tempos de leitura e de espera ficam em
+            `fluxo.tempos_leitura` (veja `exibir_tempos_de_leitura`).
+
+    Arquivos compactados ('.gz', '.bz2', '.xz', '.zip' e, com o pacote
+    zstandard, '.zst') são lidos diretamente, em todos os modos.
+
+    Returns:
+        pd.DataFrame | FluxoDeBlocos: Dados carregados ou None se ocorrer erro.
+    """
+    try:
+        if eh_particionado(caminho_arquivo):
+            if usar_cache:
+                print("O cache colunar vale só para um arquivo; os arquivos da pasta serão lidos diretamente.")
+            return _carregar_particoes(caminho_arquivo, tamanho_chunk, linhas_amostra, colunas, compactar,
+                                       blocos_antecipados)
+        if colunas is not None:
+            colunas = list(colunas)
+            if not _colunas_existem(colunas, list(pd.read_csv(caminho_arquivo, nrows=0).columns)):
+                return None
+        if compactar and tamanho_chunk:
+            print("A compactação dos tipos vale só para a leitura de uma vez; no modo em blocos só as colunas são filtradas.")
+            compactar = False
+        if usar_cache:
+            pasta_entrada, meta = _abrir_cache(caminho_arquivo, pasta_cache, limite_cache_bytes, linhas_amostra, tamanho_chunk)
+            n_colunas = len(colunas) if colunas is not None else len(meta['colunas'])
+            if tamanho_chunk:
+                def abrir_fonte():
+                    for inicio in range(0, meta['linhas'], tamanho_chunk):
+                        yield _dataframe_do_cache(pasta_entrada, meta, inicio, inicio + tamanho_chunk, colunas)
+
+                print(f"\nDados prontos para leitura em blocos de {tamanho_chunk} registros, com {n_colunas} tipos de informação.")
+                return _fluxo_medido(abrir_fonte, blocos_antecipados)
+            df = _dataframe_do_cache(pasta_entrada, meta, colunas=colunas, como_categoria=compactar)
+            print(f"\nDados carregados com sucesso! foi encontrado {df.shape[0]} registros e {df.shape[1]} tipos de informação.")
+            if compactar:
+                _informar_economia(compactar_tipos(df), _memoria_por_linha(pd.read_csv(caminho_arquivo, nrows=linhas_amostra)))
+            return df
+
+        if tamanho_chunk:
+            esquema = inferir_esquema(caminho_arquivo, linhas_amostra)
+            if colunas is not None:
+                esquema = {c: t for c, t in esquema.items() if c in colunas}
+
+            def abrir_fonte():
+                with pd.read_csv(caminho_arquivo, chunksize=tamanho_chunk, dtype=esquema, usecols=colunas) as leitor:
+                    yield from leitor
+
+            fluxo = _fluxo_medido(abrir_fonte, blocos_antecipados)
+            print(f"\nDados prontos para leitura em blocos de {tamanho_chunk} registros, com {len(esquema)} tipos de informação.")
+            return fluxo
+
+        if not compactar:
+            df = pd.read_csv(caminho_arquivo, usecols=colunas)
+            print(f"\nDados carregados com sucesso! foi encontrado {df.shape[0]} registros e {df.shape[1]} tipos de informação.")
+            return df
+
+        # Os textos já são lidos como 'category', sem criar antes um objeto Python por valor
+        amostra = pd.read_csv(caminho_arquivo, nrows=linhas_amostra)
+        textos = {c: 'category' for c in amostra.columns
+                  if (colunas is None or c in colunas) and not pd.api.types.is_numeric_dtype(amostra[c])}
+        df = pd.read_csv(caminho_arquivo, usecols=colunas, dtype=textos)
+        print(f"\nDados carregados com sucesso! foi encontrado {df.shape[0]} registros e {df.shape[1]} tipos de informação.")
+        _informar_economia(compactar_tipos(df), _memoria_por_linha(amostra))
+        return df
+    except FileNotFoundError:
+        print(f"\nOops! Não consegui encontrar o arquivo em: {caminho_arquivo}")
+        print("Por favor, verifique se o arquivo está no local correto.")
+        return None
+    except Exception as e:
+        print(f"\nOcorreu um problema ao carregar o arquivo: {e}")
+        print("Pode ser um erro no formato do arquivo ou no conteúdo.")
+        return None
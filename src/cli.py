@@ -0,0 +1,695 @@
+# -*- coding: utf-8 -*-
+"""Execução do fluxo completo (Seção 6) pela linha de comando.
+
+Uso, a partir da raiz do projeto:
+
+    python -m src data/raw/dados_exemplo_2.csv --salvar-modelo modelo.json
+    python -m src pontuar novos_clientes.csv --modelo modelo.json --saida previsoes.csv
+    python -m src relatorio data/raw/dados_exemplo_2.csv --pasta-saida reports/analise
+    python -m src particoes data/raw/diarios/ --processos 8 --salvar-modelo modelo.json
+    python -m src incremental data/raw/clientes.csv --salvar-modelo modelo.json
+
+ou, com o pacote instalado (`pip install -e .`), pelo comando `analise-dados`.
+Sem subcomando, `analisar` é usado, como antes.
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from .carregamento import (
+    carregar_dados,
+    eh_fluxo,
+    eh_particionado,
+    exibir_tempos_de_leitura,
+    listar_particoes,
+)
+from .etapas import PASTA_ETAPAS_PADRAO, GrafoDeEtapas, Resultado
+from .comparacao import treinar_varios_modelos
+from .correlacao import analisar_correlacoes
+from .eda import (
+    exibir_estatisticas_descritivas,
+    exibir_info_gerais,
+    exibir_inicio_fim,
+    exibir_previa_arquivo,
+    perfilar_dados,
+    verificar_valores_ausentes,
+    verificar_valores_unicos,
+)
+from .incremental import atualizar_incremental
+from .modelagem import avaliar_modelo, salvar_modelo, treinar_modelo_regressao
+from .preprocessamento import (
+    MatrizModelo,
+    PreProcessador,
+    codificar_variaveis_categoricas,
+    dividir_dados_treino_teste,
+    montar_matriz_modelo,
+    remover_colunas_nao_numericas_para_modelo,
+    tratar_valores_ausentes,
+)
+from .instrumentacao import SaidaJsonLinhas, SaidaTexto, registrando
+from .memoria import MedidorMemoria, tamanho_em_memoria
+from .particoes import perfilar_particoes, processar_particoes
+from .pontuacao import pontuar_arquivo
+from .relatorio import PASTA_RELATORIO_PADRAO, gerar_relatorio
+from .validacao import validar_modelo
+from .visualizacao import plotar_grafico_barras, plotar_grafico_dispersao, plotar_histograma
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CSV_PADRAO = os.path.join(RAIZ_PROJETO, 'data', 'raw', 'dados_exemplo_2.csv')
+
+# Identifique aqui todas as colunas que são de TEXTO/CATEGORIA no seu arquivo original
+# Elas serão usadas para a Análise Exploratória e para a Codificação
+COLUNAS_CATEGORICAS_PARA_EDA = ['sexo', 'categoria', 'observacao']
+COLUNAS_CATEGORICAS_PARA_CODIFICAR = ['sexo', 'categoria']
+
+ERRO_HASHING_SALVO = ("Erro: O método de codificação 'hashing' não pode ser salvo (as colunas de hashing não têm "
+                      "equivalente no pré-processamento reaproveitável). Use 'onehot' ou 'esparso' para salvar o "
+                      "modelo ou o pré-processamento.")
+
+
+def _remover_id(df, sem_copias=False):
+    """Remove a coluna 'id', que não é útil para o modelo. Sem cópias, altera o próprio `df`."""
+    if df is None:
+        return None
+    if eh_fluxo(df):
+        if 'id' not in df.colunas:
+            return df
+        print("\nA coluna 'id' (identificação) foi removida, pois não é útil para o modelo.")
+        return df.mapear(lambda bloco: bloco.drop('id', axis=1))
+    if 'id' not in df.columns:
+        return df if sem_copias else df.copy()
+    print("\nA coluna 'id' (identificação) foi removida, pois não é útil para o modelo.")
+    if sem_copias:
+        df.drop(columns='id', inplace=True)
+        return df
+    return df.drop('id', axis=1).copy()
+
+
+def _colunas_usadas_no_fluxo(caminho_csv, colunas_configuradas, linhas_amostra=1000):
+    """Colunas que o fluxo realmente usa: as configuradas (categóricas, alvo, gráficos)
+    e as numéricas, que entram no modelo. Textos não configurados e o 'id' ficam de fora.
+
+    Returns:
+        list | None: As colunas, na ordem do arquivo, ou None se o arquivo não puder ser lido
+        (o erro é informado por `carregar_dados`).
+    """
+    arquivos = listar_particoes(caminho_csv)
+    if not arquivos:
+        return None
+    try:
+        amostra = pd.read_csv(arquivos[0], nrows=linhas_amostra)
+    except Exception:
+        return None
+    configuradas = set(colunas_configuradas)
+    return [c for c in amostra.columns
+            if c in configuradas or (c != 'id' and pd.api.types.is_numeric_dtype(amostra[c]))]
+
+
+def _montar_grafo_do_fluxo(caminho_csv, opcoes, sem_copias, colunas=None):
+    """Etapas 6.1 a 6.7 como um grafo: cada uma recebe os resultados das anteriores.
+
+    Com `opcoes.pasta_etapas`, os resultados ficam guardados em disco e, na
+    execução seguinte, só são refeitas as etapas cujos parâmetros (ou os de
+    alguma etapa anterior, ou o próprio arquivo) mudaram.
+    """
+    grafo = GrafoDeEtapas(opcoes.pasta_etapas)
+    grafo.adicionar('carregar_dados', carregar_dados, arquivos=('caminho_arquivo',), caminho_arquivo=caminho_csv,
+                    tamanho_chunk=opcoes.tamanho_chunk, usar_cache=opcoes.usar_cache, colunas=colunas,
+                    compactar=opcoes.compactar, blocos_antecipados=opcoes.blocos_antecipados)
+    if opcoes.tamanho_chunk and eh_particionado(caminho_csv):
+        # Vários arquivos lidos em blocos: o perfil (que exige ler tudo) é calculado em paralelo
+        grafo.adicionar('perfilar_dados', perfilar_particoes, arquivos=('caminho',), caminho=caminho_csv,
+                        tamanho_chunk=opcoes.tamanho_chunk)
+    else:
+        grafo.adicionar('perfilar_dados', perfilar_dados, Resultado('carregar_dados'))
+    # Uma cópia sem a coluna 'id' não vale o espaço em disco: é refeita quando preciso
+    grafo.adicionar('remover_id', _remover_id, Resultado('carregar_dados'), sem_copias=sem_copias, memorizar=False)
+    grafo.adicionar('tratar_valores_ausentes', tratar_valores_ausentes, Resultado('remover_id'),
+                    estrategia_num='median', estrategia_cat='most_frequent', perfil=Resultado('perfilar_dados'),
+                    inplace=sem_copias)
+    grafo.adicionar('codificar_variaveis_categoricas', codificar_variaveis_categoricas,
+                    Resultado('tratar_valores_ausentes'), list(opcoes.colunas_categoricas_para_codificar),
+                    metodo=opcoes.metodo_codificacao, inplace=sem_copias)
+    grafo.adicionar('remover_colunas_nao_numericas', remover_colunas_nao_numericas_para_modelo,
+                    Resultado('codificar_variaveis_categoricas'), opcoes.coluna_target, inplace=sem_copias)
+    dados_do_modelo = 'remover_colunas_nao_numericas'
+    if sem_copias:
+        grafo.adicionar('montar_matriz_modelo', montar_matriz_modelo, Resultado('remover_colunas_nao_numericas'),
+                        opcoes.coluna_target, random_state=42, test_size=opcoes.tamanho_teste, liberar_colunas=True)
+        dados_do_modelo = 'montar_matriz_modelo'
+    grafo.adicionar('dividir_dados_treino_teste', dividir_dados_treino_teste, Resultado(dados_do_modelo),
+                    opcoes.coluna_target, test_size=opcoes.tamanho_teste)
+    grafo.adicionar('treinar_modelo_regressao', treinar_modelo_regressao,
+                    Resultado('dividir_dados_treino_teste', 0), Resultado('dividir_dados_treino_teste', 2))
+    # A avaliação é rápida e mostra o gráfico, então roda sempre
+    grafo.adicionar('avaliar_modelo', avaliar_modelo, Resultado('treinar_modelo_regressao'),
+                    Resultado('dividir_dados_treino_teste', 1), Resultado('dividir_dados_treino_teste', 3),
+                    mostrar_grafico=opcoes.mostrar_graficos, memorizar=False)
+    return grafo
+
+
+class OpcoesFluxo:
+    """Opções de `executar_fluxo`; cada uma tem o valor padrão do fluxo da Seção 6.
+
+    Args:
+        colunas_categoricas_para_eda (list): Colunas de texto cujas opções são contadas na EDA.
+        colunas_categoricas_para_codificar (list): Colunas de texto transformadas em números.
+        coluna_target (str): Coluna que o modelo aprende a prever.
+        coluna_numerica_hist, coluna_categorica_bar, coluna_dispersao_x, coluna_dispersao_y (str):
+            Colunas dos gráficos da Seção 6.3.
+        tamanho_chunk (int): Lê os dados em blocos com esse número de linhas (None lê tudo).
+        usar_cache (bool): Guarda o arquivo já lido em um cache por colunas.
+        compactar (bool): Só as colunas usadas pelo fluxo são lidas (as configuradas e as
+            numéricas), com textos como 'category' e números no menor tipo que guarda os
+            mesmos valores.
+        blocos_antecipados (int): Com `tamanho_chunk`, blocos lidos (e descompactados) em
+            segundo plano enquanto as etapas processam o bloco atual; no final é mostrado
+            quanto tempo as etapas esperaram pela leitura.
+        metodo_codificacao (str): 'onehot', 'label', 'esparso' ou 'hashing'.
+        sem_copias (bool): Só para dados em memória: o pré-processamento altera o próprio
+            DataFrame carregado em vez de copiá-lo a cada etapa e termina em uma única
+            matriz float64 (MatrizModelo), dividida em treino e teste sem cópia.
+        tamanho_teste (float): Fração dos dados separada para testar o modelo.
+        mostrar_graficos (bool): Se os gráficos são exibidos.
+        medir_memoria (bool): Exibe no final o pico de memória de cada etapa.
+        caminho_preprocessador (str): O pré-processamento também é ajustado como um
+            PreProcessador e salvo nesse arquivo, para ser reaplicado a novos dados.
+        caminho_modelo (str): O modelo treinado e o pré-processamento são salvos juntos
+            nesse arquivo, para pontuar novos arquivos com `pontuar_arquivo`.
+        n_folds (int): O modelo também é avaliado por validação cruzada k-fold (repetida
+            `repeticoes_validacao` vezes), com as divisões em paralelo.
+        repeticoes_validacao (int): Repetições da validação cruzada.
+        comparar_modelos (bool): Outras variantes (ridge, gradient boosting) são treinadas em
+            paralelo sobre a mesma matriz e comparadas em um placar.
+        top_correlacoes (int): Depois da codificação, mostra as colunas mais correlacionadas
+            com o alvo (e os pares de colunas mais parecidos entre si).
+        pasta_etapas (str): O resultado de cada etapa é guardado nessa pasta, e uma nova
+            execução só refaz as etapas afetadas pelo que mudou (ex.: só a divisão, o treino
+            e a avaliação ao mudar `tamanho_teste`).
+    """
+
+    def __init__(self,
+                 colunas_categoricas_para_eda=COLUNAS_CATEGORICAS_PARA_EDA,
+                 colunas_categoricas_para_codificar=COLUNAS_CATEGORICAS_PARA_CODIFICAR,
+                 coluna_target='target',
+                 coluna_numerica_hist='idade',
+                 coluna_categorica_bar='categoria',
+                 coluna_dispersao_x='valor_compra',
+                 coluna_dispersao_y='target',
+                 tamanho_chunk=None,
+                 usar_cache=False,
+                 compactar=False,
+                 blocos_antecipados=0,
+                 metodo_codificacao='onehot',
+                 sem_copias=False,
+                 tamanho_teste=0.3,
+                 mostrar_graficos=True,
+                 medir_memoria=False,
+                 caminho_preprocessador=None,
+                 caminho_modelo=None,
+                 n_folds=None,
+                 repeticoes_validacao=1,
+                 comparar_modelos=False,
+                 top_correlacoes=None,
+                 pasta_etapas=None):
+        self.colunas_categoricas_para_eda = list(colunas_categoricas_para_eda)
+        self.colunas_categoricas_para_codificar = list(colunas_categoricas_para_codificar)
+        self.coluna_target = coluna_target
+        self.coluna_numerica_hist = coluna_numerica_hist
+        self.coluna_categorica_bar = coluna_categorica_bar
+        self.coluna_dispersao_x = coluna_dispersao_x
+        self.coluna_dispersao_y = coluna_dispersao_y
+        self.tamanho_chunk = tamanho_chunk
+        self.usar_cache = usar_cache
+        self.compactar = compactar
+        self.blocos_antecipados = blocos_antecipados
+        self.metodo_codificacao = metodo_codificacao
+        self.sem_copias = sem_copias
+        self.tamanho_teste = tamanho_teste
+        self.mostrar_graficos = mostrar_graficos
+        self.medir_memoria = medir_memoria
+        self.caminho_preprocessador = caminho_preprocessador
+        self.caminho_modelo = caminho_modelo
+        self.n_folds = n_folds
+        self.repeticoes_validacao = repeticoes_validacao
+        self.comparar_modelos = comparar_modelos
+        self.top_correlacoes = top_correlacoes
+        self.pasta_etapas = pasta_etapas
+
+    def alterar(self, **alteracoes):
+        """Uma cópia destas opções com os valores informados trocados."""
+        return OpcoesFluxo(**{**vars(self), **alteracoes})
+
+    def colunas_configuradas(self):
+        """Todas as colunas citadas nas opções (categóricas, alvo e as dos gráficos)."""
+        return [*self.colunas_categoricas_para_eda, *self.colunas_categoricas_para_codificar, self.coluna_target,
+                self.coluna_numerica_hist, self.coluna_categorica_bar, self.coluna_dispersao_x,
+                self.coluna_dispersao_y]
+
+
+def executar_fluxo(caminho_csv=CAMINHO_CSV_PADRAO, opcoes=None, **alteracoes):
+    """Executa o fluxo completo: carregamento, EDA, gráficos, pré-processamento,
+    divisão treino/teste, treino e avaliação do modelo.
+
+    As opções vêm de `opcoes` (um OpcoesFluxo; padrão: os valores da Seção 6),
+    e qualquer uma delas também pode ser passada pelo nome, ex.:
+    `executar_fluxo('dados.csv', mostrar_graficos=False, n_folds=5)`.
+
+    Returns:
+        dict: Os resultados de cada etapa (None nas que não puderam ser feitas).
+    """
+    opcoes = OpcoesFluxo(**alteracoes) if opcoes is None else opcoes.alterar(**alteracoes)
+    print("Preparando as ferramentas necessárias para a análise de dados...")
+    resultados = {'df': None, 'perfil': None, 'df_final_para_modelo': None, 'X_teste': None, 'y_teste': None,
+                  'estatisticas': None, 'preprocessador': None, 'modelo': None, 'modelo_salvo': None, 'mae': None, 'r2': None,
+                  'validacao': None, 'memoria': None, 'tempos_leitura': None, 'comparacao': None, 'correlacoes': None}
+    if opcoes.metodo_codificacao == 'hashing' and (opcoes.caminho_preprocessador or opcoes.caminho_modelo):
+        print(ERRO_HASHING_SALVO)
+        return resultados
+    medidor = MedidorMemoria(ativo=opcoes.medir_memoria)
+
+    # ==========================================================================
+    # 6.1 Carregamento de Dados
+    # ==========================================================================
+    colunas = None
+    if opcoes.compactar:
+        colunas = _colunas_usadas_no_fluxo(caminho_csv, opcoes.colunas_configuradas())
+    # O modo sem cópias só vale para dados em memória (sem tamanho_chunk)
+    sem_copias = opcoes.sem_copias and not opcoes.tamanho_chunk
+    grafo = _montar_grafo_do_fluxo(caminho_csv, opcoes, sem_copias, colunas=colunas)
+    with medidor.etapa('carregar_dados'):
+        df = grafo.resultado('carregar_dados')
+    resultados['df'] = df
+    sem_copias = sem_copias and df is not None and not eh_fluxo(df)
+    tamanho_entrada = tamanho_em_memoria(df) if opcoes.medir_memoria and not eh_fluxo(df) else None
+
+    # ==========================================================================
+    # 6.2 Análise Exploratória de Dados (EDA)
+    # ==========================================================================
+    perfil = None
+    if df is not None:
+        # Uma única leitura dos dados alimenta todas as funções abaixo
+        with medidor.etapa('perfilar_dados'):
+            perfil = grafo.resultado('perfilar_dados')
+        exibir_inicio_fim(df, perfil=perfil)
+        exibir_info_gerais(df, perfil=perfil)
+        # Exatas com os dados em memória; guardadas para o relatório, pois o modo sem cópias altera o `df`
+        resultados['estatisticas'] = exibir_estatisticas_descritivas(df, perfil=perfil)
+        verificar_valores_ausentes(df, perfil=perfil)
+        verificar_valores_unicos(df, opcoes.colunas_categoricas_para_eda, perfil=perfil)
+    else:
+        print("Não foi possível realizar a Análise Exploratória de Dados, pois os dados não foram carregados.")
+    resultados['perfil'] = perfil
+
+    # ==========================================================================
+    # 6.3 Visualização Inicial
+    # ==========================================================================
+    if df is not None and not opcoes.mostrar_graficos:
+        print("Gráficos desativados para esta execução.")
+    elif df is not None:
+        # Com muitas linhas ou em blocos, os gráficos são desenhados a partir de contagens agregadas
+        plotar_histograma(df, opcoes.coluna_numerica_hist, perfil=perfil)
+        plotar_grafico_barras(df, opcoes.coluna_categorica_bar)
+        plotar_grafico_dispersao(df, opcoes.coluna_dispersao_x, opcoes.coluna_dispersao_y, perfil=perfil)
+    else:
+        print("Não foi possível criar os gráficos, pois os dados não foram carregados.")
+
+    # O pré-processamento reaproveitável é ajustado antes das etapas abaixo,
+    # que no modo sem cópias alteram o próprio `df`
+    if (opcoes.caminho_preprocessador or opcoes.caminho_modelo) and df is not None:
+        # 'esparso' produz as mesmas colunas que 'onehot'; 'hashing' foi recusado no início
+        metodo_preprocessador = 'label' if opcoes.metodo_codificacao == 'label' else 'onehot'
+        preprocessador = PreProcessador(opcoes.colunas_categoricas_para_codificar, opcoes.coluna_target,
+                                        metodo=metodo_preprocessador)
+        resultados['preprocessador'] = preprocessador.ajustar(df, perfil=perfil)
+        if opcoes.caminho_preprocessador:
+            preprocessador.salvar(opcoes.caminho_preprocessador)
+
+    # ==========================================================================
+    # 6.4 Pré-processamento: Remoção de ID e Tratamento de Ausentes
+    # ==========================================================================
+    df_tratado = None
+    if df is not None:
+        # A remoção da coluna 'id' é feita dentro do grafo, só se o tratamento precisar ser refeito
+        with medidor.etapa('tratar_valores_ausentes'):
+            df_tratado = grafo.resultado('tratar_valores_ausentes')
+    else:
+        print("Não foi possível preparar os dados, pois houve um problema no carregamento inicial.")
+
+    # ==========================================================================
+    # 6.5 Pré-processamento: Codificação de Variáveis Categóricas e Limpeza Final
+    # ==========================================================================
+    df_final_para_modelo = None
+    if df_tratado is not None:
+        # Só as colunas a codificar que ainda existem após o tratamento são usadas
+        with medidor.etapa('codificar_variaveis_categoricas'):
+            df_codificado = grafo.resultado('codificar_variaveis_categoricas')
+
+        # Remover colunas que ainda são de texto e não foram codificadas
+        if df_codificado is not None:
+            with medidor.etapa('remover_colunas_nao_numericas'):
+                df_final_para_modelo = grafo.resultado('remover_colunas_nao_numericas')
+        # No modo sem cópias tudo termina em uma única matriz contígua; as colunas
+        # do DataFrame são liberadas à medida que são copiadas para ela
+        if sem_copias and isinstance(df_final_para_modelo, pd.DataFrame):
+            with medidor.etapa('montar_matriz_modelo'):
+                df_final_para_modelo = grafo.resultado('montar_matriz_modelo')
+    else:
+        print("Não foi possível transformar as categorias, pois houve um problema no tratamento de informações faltando.")
+    resultados['df_final_para_modelo'] = df_final_para_modelo
+
+    # Correlações com o alvo já sobre as colunas codificadas, que são as que o modelo recebe
+    if opcoes.top_correlacoes and df_final_para_modelo is not None:
+        with medidor.etapa('analisar_correlacoes'):
+            resultados['correlacoes'] = analisar_correlacoes(df_final_para_modelo, opcoes.coluna_target,
+                                                             top_k=opcoes.top_correlacoes)
+
+    # ==========================================================================
+    # 6.6 Divisão Treino/Teste
+    # ==========================================================================
+    X_treino, X_teste, y_treino, y_teste = None, None, None, None
+    if df_final_para_modelo is not None:
+        with medidor.etapa('dividir_dados_treino_teste'):
+            X_treino, X_teste, y_treino, y_teste = grafo.resultado('dividir_dados_treino_teste') or (None,) * 4
+        resultados['X_teste'], resultados['y_teste'] = X_teste, y_teste
+    else:
+        print("\nNão foi possível separar os dados para o modelo devido a problemas nas etapas anteriores de preparação.")
+
+    # ==========================================================================
+    # 6.7 Modelagem e Avaliação
+    # ==========================================================================
+    if X_treino is not None and y_treino is not None:
+        with medidor.etapa('treinar_modelo_regressao'):
+            modelo_final = grafo.resultado('treinar_modelo_regressao')
+        resultados['modelo'] = modelo_final
+        if modelo_final and opcoes.caminho_modelo:
+            if eh_fluxo(X_treino):
+                colunas_modelo = X_treino.colunas
+            elif hasattr(X_treino, 'columns'):
+                colunas_modelo = X_treino.columns
+            elif isinstance(df_final_para_modelo, MatrizModelo):
+                colunas_modelo = df_final_para_modelo.colunas
+            else:
+                # Matriz esparsa ('esparso', 'hashing'): os nomes ficam nos dados antes da divisão
+                colunas_modelo = ([c for c in df_final_para_modelo.columns if c != opcoes.coluna_target]
+                                  + df_final_para_modelo.colunas_codificadas)
+            resultados['modelo_salvo'] = salvar_modelo(modelo_final, resultados['preprocessador'],
+                                                       opcoes.caminho_modelo, colunas=colunas_modelo)
+        if modelo_final and X_teste is not None and y_teste is not None:
+            with medidor.etapa('avaliar_modelo'):
+                resultados['mae'], resultados['r2'] = grafo.resultado('avaliar_modelo') or (None, None)
+        elif not modelo_final:
+            print("\nO modelo não foi treinado. Verifique as mensagens de erro acima.")
+        else:
+            print("\nOs dados para testar o modelo não estão disponíveis.")
+    else:
+        print("\nNão foi possível continuar com o treinamento e avaliação do modelo devido a problemas na separação dos dados.")
+
+    # ==========================================================================
+    # 6.8 Validação Cruzada (opcional)
+    # ==========================================================================
+    if opcoes.n_folds and isinstance(df_final_para_modelo, (pd.DataFrame, MatrizModelo)):
+        with medidor.etapa('validar_modelo'):
+            resultados['validacao'] = validar_modelo(df_final_para_modelo, opcoes.coluna_target,
+                                                     n_folds=opcoes.n_folds, repeticoes=opcoes.repeticoes_validacao)
+    elif opcoes.n_folds and df_final_para_modelo is not None:
+        print("\nA validação cruzada precisa dos dados completos e densos em memória e foi pulada neste modo.")
+
+    # ==========================================================================
+    # 6.9 Comparação de Modelos (opcional)
+    # ==========================================================================
+    if opcoes.comparar_modelos and isinstance(df_final_para_modelo, (pd.DataFrame, MatrizModelo)):
+        with medidor.etapa('treinar_varios_modelos'):
+            resultados['comparacao'] = treinar_varios_modelos(df_final_para_modelo, opcoes.coluna_target,
+                                                              test_size=opcoes.tamanho_teste)
+    elif opcoes.comparar_modelos and df_final_para_modelo is not None:
+        print("\nA comparação de modelos precisa dos dados completos e densos em memória e foi pulada neste modo.")
+
+    if eh_fluxo(df):
+        # Diz se as passadas pelos blocos foram limitadas pela leitura ou pelas etapas
+        resultados['tempos_leitura'] = exibir_tempos_de_leitura(df)
+
+    if opcoes.medir_memoria:
+        medidor.exibir_relatorio(tamanho_entrada)
+        resultados['memoria'] = medidor.relatorio(tamanho_entrada)
+
+    print("\n--- Fim da Análise de Dados e Construção do Modelo ---")
+    print("O processo de aprendizado do modelo foi concluído. Os gráficos e as mensagens acima mostram os resultados.")
+    return resultados
+
+
+SUBCOMANDOS = ('analisar', 'pontuar', 'relatorio', 'particoes', 'incremental', 'previa')
+
+
+def _adicionar_opcoes_de_eventos(subcomando):
+    subcomando.add_argument('--registrar-etapas', metavar='ARQUIVO_JSONL', default=None,
+                            help='Acrescenta tempo, CPU, linhas e memória de cada etapa a este arquivo (uma linha JSON por etapa).')
+    subcomando.add_argument('--mostrar-etapas', action='store_true',
+                            help='Mostra na tela o tempo, as linhas e a memória de cada etapa.')
+
+
+def _saidas_de_eventos(args):
+    saidas = []
+    if args.registrar_etapas:
+        saidas.append(SaidaJsonLinhas(args.registrar_etapas))
+    if args.mostrar_etapas:
+        saidas.append(SaidaTexto())
+    return saidas
+
+
+def _adicionar_opcoes_do_fluxo(subcomando):
+    """Opções comuns a `analisar` e `relatorio`, que rodam o mesmo fluxo."""
+    subcomando.add_argument('caminho_csv', nargs='?', default=CAMINHO_CSV_PADRAO,
+                            help='Arquivo CSV a analisar (padrão: data/raw/dados_exemplo_2.csv).')
+    subcomando.add_argument('--coluna-target', default='target', help='Coluna que o modelo deve prever.')
+    subcomando.add_argument('--colunas-categoricas', nargs='+', default=COLUNAS_CATEGORICAS_PARA_CODIFICAR,
+                            help='Colunas de texto a transformar em números.')
+    subcomando.add_argument('--colunas-eda', nargs='+', default=COLUNAS_CATEGORICAS_PARA_EDA,
+                            help='Colunas de texto cujas opções são contadas na EDA.')
+    subcomando.add_argument('--metodo-codificacao', default='onehot', choices=['label', 'onehot', 'esparso', 'hashing'],
+                            help="Como transformar as categorias em números ('esparso' e 'hashing' para muitas categorias).")
+    subcomando.add_argument('--tamanho-chunk', type=int, default=None,
+                            help='Lê o arquivo em blocos com este número de linhas (para arquivos grandes).')
+    subcomando.add_argument('--antecipar-blocos', type=int, default=0, metavar='N',
+                            help='Com --tamanho-chunk, lê N blocos à frente em segundo plano enquanto as etapas '
+                                 'processam o atual (ex: 2).')
+    subcomando.add_argument('--usar-cache', action='store_true',
+                            help='Converte o CSV uma única vez para o cache colunar em data/cache/.')
+    subcomando.add_argument('--sem-graficos', action='store_true', help='Não abre as janelas de gráficos.')
+    subcomando.add_argument('--sem-copias', action='store_true',
+                            help='Pré-processa alterando os próprios dados, sem cópias, e termina em uma única matriz.')
+    subcomando.add_argument('--compactar', action='store_true',
+                            help='Lê só as colunas usadas, com textos como categorias e números no menor tipo possível.')
+    subcomando.add_argument('--medir-memoria', action='store_true', help='Mostra o pico de memória de cada etapa.')
+    subcomando.add_argument('--salvar-preprocessador', metavar='ARQUIVO_JSON', default=None,
+                            help='Salva o pré-processamento ajustado para reaplicá-lo a novos dados.')
+    subcomando.add_argument('--salvar-modelo', metavar='ARQUIVO_JSON', default=None,
+                            help='Salva o modelo treinado (com o pré-processamento) para o subcomando `pontuar`.')
+    subcomando.add_argument('--folds', type=int, default=None,
+                            help='Também avalia o modelo por validação cruzada com este número de partes (ex: 5).')
+    subcomando.add_argument('--repeticoes', type=int, default=1,
+                            help='Quantas vezes repetir a validação cruzada, com embaralhamentos diferentes.')
+    subcomando.add_argument('--comparar-modelos', action='store_true',
+                            help='Também treina outras variantes (ridge, gradient boosting) em paralelo sobre a mesma '
+                                 'matriz e mostra um placar de MAE, R² e tempo.')
+    subcomando.add_argument('--correlacoes', type=int, default=None, metavar='K',
+                            help='Mostra as K colunas (já codificadas) mais correlacionadas com o alvo e os K pares '
+                                 'de colunas mais parecidos entre si.')
+    subcomando.add_argument('--tamanho-teste', type=float, default=0.3,
+                            help='Fração dos registros separada para testar o modelo (padrão: 0.3).')
+    subcomando.add_argument('--reaproveitar-etapas', action='store_true',
+                            help='Guarda o resultado de cada etapa e, na próxima execução, só refaz as etapas afetadas '
+                                 'pelo que mudou.')
+    subcomando.add_argument('--pasta-etapas', default=PASTA_ETAPAS_PADRAO,
+                            help='Onde guardar os resultados das etapas (padrão: data/cache/etapas).')
+    _adicionar_opcoes_de_eventos(subcomando)
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='analise-dados',
+        description='Análise exploratória, pré-processamento e Regressão Linear de arquivos CSV.')
+    subcomandos = parser.add_subparsers(dest='comando', metavar='{analisar,pontuar,relatorio,particoes,incremental,previa}')
+
+    analisar = subcomandos.add_parser(
+        'analisar', help='Fluxo completo: EDA, gráficos, pré-processamento, treino e avaliação (padrão).',
+        description='Análise exploratória, pré-processamento e Regressão Linear de um arquivo CSV.')
+    _adicionar_opcoes_do_fluxo(analisar)
+
+    relatorio = subcomandos.add_parser(
+        'relatorio', help='Roda o fluxo sem abrir janelas e gera o relatório em Markdown e PDF.',
+        description='Roda o fluxo completo sem tela e salva gráficos, relatorio.md e relatorio.pdf em uma pasta.')
+    _adicionar_opcoes_do_fluxo(relatorio)
+    relatorio.add_argument('--pasta-saida', default=PASTA_RELATORIO_PADRAO,
+                           help='Pasta do relatório (padrão: reports/analise).')
+    relatorio.add_argument('--processos', type=int, default=None,
+                           help='Número de processos para desenhar os gráficos (padrão: todos os núcleos).')
+    relatorio.add_argument('--sem-pdf', action='store_true', help='Gera só o relatório em Markdown.')
+
+    pontuar = subcomandos.add_parser(
+        'pontuar', help='Aplica um modelo salvo a um CSV de novos registros e grava as previsões.',
+        description='Calcula as previsões de um modelo salvo para todas as linhas de um CSV, em paralelo.')
+    pontuar.add_argument('caminho_csv', help='Arquivo CSV com os registros a pontuar.')
+    pontuar.add_argument('--modelo', required=True, metavar='ARQUIVO_JSON',
+                         help='Modelo salvo com `analisar --salvar-modelo`.')
+    pontuar.add_argument('--saida', required=True, metavar='ARQUIVO_CSV', help='Onde gravar as previsões.')
+    pontuar.add_argument('--colunas-copiadas', nargs='+', default=['id'],
+                         help='Colunas da entrada repetidas na saída ao lado da previsão (padrão: id).')
+    pontuar.add_argument('--coluna-previsao', default='previsao', help='Nome da coluna com as previsões.')
+    pontuar.add_argument('--processos', type=int, default=None,
+                         help='Número de processos de trabalho (padrão: todos os núcleos).')
+    pontuar.add_argument('--tamanho-chunk', type=int, default=100_000,
+                         help='Linhas lidas de cada vez por processo.')
+    _adicionar_opcoes_de_eventos(pontuar)
+
+    particoes = subcomandos.add_parser(
+        'particoes', help='Perfil, pré-processamento e treino de uma pasta (ou padrão) de CSVs, em paralelo.',
+        description='Processa vários arquivos CSV de mesmas colunas (ex.: um por dia) dividindo-os entre '
+                    'processos e combina os resultados: perfil, categorias e modelo.')
+    particoes.add_argument('caminho', help="Pasta com os arquivos .csv ou padrão como 'dados/2024-*.csv'.")
+    particoes.add_argument('--coluna-target', default='target', help='Coluna que o modelo deve prever.')
+    particoes.add_argument('--colunas-categoricas', nargs='+', default=COLUNAS_CATEGORICAS_PARA_CODIFICAR,
+                           help='Colunas de texto a transformar em números.')
+    particoes.add_argument('--colunas-eda', nargs='+', default=COLUNAS_CATEGORICAS_PARA_EDA,
+                           help='Colunas de texto cujas opções são contadas na EDA.')
+    particoes.add_argument('--metodo-codificacao', default='onehot', choices=['label', 'onehot'],
+                           help='Como transformar as categorias em números.')
+    particoes.add_argument('--processos', type=int, default=None,
+                           help='Número de processos de trabalho (padrão: todos os núcleos).')
+    particoes.add_argument('--tamanho-chunk', type=int, default=100_000,
+                           help='Linhas lidas de cada vez por processo.')
+    particoes.add_argument('--salvar-modelo', metavar='ARQUIVO_JSON', default=None,
+                           help='Salva o modelo treinado (com o pré-processamento) para o subcomando `pontuar`.')
+    _adicionar_opcoes_de_eventos(particoes)
+
+    incremental = subcomandos.add_parser(
+        'incremental', help='Atualiza o perfil e o modelo só com as linhas novas de um CSV que cresce no final.',
+        description='Lê só as linhas acrescentadas ao arquivo desde a última execução e atualiza o perfil e os '
+                    'coeficientes do modelo, sem reler o arquivo inteiro.')
+    incremental.add_argument('caminho_csv', help='Arquivo CSV que só recebe linhas novas no final.')
+    incremental.add_argument('--coluna-target', default='target', help='Coluna que o modelo deve prever.')
+    incremental.add_argument('--colunas-categoricas', nargs='+', default=COLUNAS_CATEGORICAS_PARA_CODIFICAR,
+                             help='Colunas de texto a transformar em números.')
+    incremental.add_argument('--metodo-codificacao', default='onehot', choices=['label', 'onehot'],
+                             help='Como transformar as categorias em números.')
+    incremental.add_argument('--estado', metavar='ARQUIVO', default=None,
+                             help='Onde guardar o que já foi lido (padrão: um arquivo por CSV em data/cache/incremental/).')
+    incremental.add_argument('--processos', type=int, default=None,
+                             help='Número de processos de trabalho (padrão: todos os núcleos).')
+    incremental.add_argument('--tamanho-chunk', type=int, default=100_000, help='Linhas lidas de cada vez.')
+    incremental.add_argument('--salvar-modelo', metavar='ARQUIVO_JSON', default=None,
+                             help='Salva o modelo atualizado (com o pré-processamento) para o subcomando `pontuar`.')
+    _adicionar_opcoes_de_eventos(incremental)
+
+    previa = subcomandos.add_parser(
+        'previa', help='Olhada rápida em um CSV grande: início, fim e resumo numérico por amostragem.',
+        description='Mostra os primeiros e últimos registros e um resumo das colunas numéricas estimado a partir '
+                    'de trechos espalhados pelo arquivo, sem carregá-lo inteiro.')
+    previa.add_argument('caminho_csv', help='Arquivo CSV a examinar.')
+    previa.add_argument('--linhas', type=int, default=5, help='Quantos registros mostrar do início e do fim.')
+    previa.add_argument('--blocos', type=int, default=100, help='Quantos trechos do arquivo ler para o resumo.')
+    previa.add_argument('--linhas-por-bloco', type=int, default=1000, help='Linhas seguidas lidas em cada trecho.')
+    _adicionar_opcoes_de_eventos(previa)
+    return parser
+
+
+def main(argv=None):
+    """Ponto de entrada de `python -m src` e do comando `analise-dados`."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Compatibilidade: sem subcomando, os argumentos são do fluxo completo
+    if not argv or (argv[0] not in SUBCOMANDOS and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'analisar')
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if (args.comando in ('analisar', 'relatorio') and args.metodo_codificacao == 'hashing'
+            and (args.salvar_modelo or args.salvar_preprocessador)):
+        parser.error("--metodo-codificacao hashing não pode ser usado com --salvar-modelo ou "
+                     "--salvar-preprocessador; use 'onehot' ou 'esparso'.")
+    with registrando(*_saidas_de_eventos(args)):
+        return _executar_comando(args)
+
+
+def _opcoes_do_fluxo(args):
+    """OpcoesFluxo a partir dos argumentos de `analisar` e `relatorio` (veja `_adicionar_opcoes_do_fluxo`)."""
+    return OpcoesFluxo(
+        colunas_categoricas_para_eda=args.colunas_eda,
+        colunas_categoricas_para_codificar=args.colunas_categoricas,
+        coluna_target=args.coluna_target,
+        coluna_dispersao_y=args.coluna_target,
+        tamanho_chunk=args.tamanho_chunk,
+        usar_cache=args.usar_cache,
+        mostrar_graficos=not args.sem_graficos,
+        caminho_preprocessador=args.salvar_preprocessador,
+        metodo_codificacao=args.metodo_codificacao,
+        sem_copias=args.sem_copias,
+        medir_memoria=args.medir_memoria,
+        caminho_modelo=args.salvar_modelo,
+        n_folds=args.folds,
+        repeticoes_validacao=args.repeticoes,
+        tamanho_teste=args.tamanho_teste,
+        pasta_etapas=args.pasta_etapas if args.reaproveitar_etapas else None,
+        compactar=args.compactar,
+        blocos_antecipados=args.antecipar_blocos,
+        comparar_modelos=args.comparar_modelos,
+        top_correlacoes=args.correlacoes,
+    )
+
+
+def _executar_comando(args):
+    if args.comando == 'pontuar':
+        resultado = pontuar_arquivo(args.caminho_csv, args.modelo, args.saida,
+                                    colunas_copiadas=args.colunas_copiadas, coluna_previsao=args.coluna_previsao,
+                                    n_processos=args.processos, tamanho_chunk=args.tamanho_chunk)
+        return 0 if resultado is not None else 1
+
+    if args.comando == 'particoes':
+        resultado = processar_particoes(args.caminho, args.colunas_categoricas, args.coluna_target,
+                                        metodo=args.metodo_codificacao, n_processos=args.processos,
+                                        tamanho_chunk=args.tamanho_chunk)
+        if resultado is None:
+            return 1
+        # A EDA sai do perfil combinado, sem ler os arquivos de novo
+        perfil = resultado['perfil']
+        exibir_inicio_fim(None, perfil=perfil)
+        exibir_info_gerais(None, perfil=perfil)
+        exibir_estatisticas_descritivas(None, perfil=perfil)
+        verificar_valores_ausentes(None, perfil=perfil)
+        verificar_valores_unicos(None, args.colunas_eda, perfil=perfil)
+        if args.salvar_modelo and salvar_modelo(resultado['modelo'], resultado['preprocessador'],
+                                                args.salvar_modelo) is None:
+            return 1
+        return 0
+
+    if args.comando == 'incremental':
+        resultado = atualizar_incremental(args.caminho_csv, args.colunas_categoricas, args.coluna_target,
+                                          metodo=args.metodo_codificacao, caminho_estado=args.estado,
+                                          n_processos=args.processos, tamanho_chunk=args.tamanho_chunk)
+        if resultado is None:
+            return 1
+        if args.salvar_modelo and salvar_modelo(resultado['modelo'], resultado['preprocessador'],
+                                                args.salvar_modelo) is None:
+            return 1
+        return 0
+
+    if args.comando == 'previa':
+        resumo = exibir_previa_arquivo(args.caminho_csv, n=args.linhas, n_blocos=args.blocos,
+                                       linhas_por_bloco=args.linhas_por_bloco)
+        return 0 if resumo is not None else 1
+
+    if args.comando == 'relatorio':
+        # Sem tela: nenhum gráfico do fluxo é aberto, e os do relatório vão direto para arquivos
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+        args.sem_graficos = True
+
+    resultados = executar_fluxo(args.caminho_csv, _opcoes_do_fluxo(args))
+    if args.comando == 'relatorio':
+        relatorio = gerar_relatorio(resultados, args.pasta_saida, caminho_csv=args.caminho_csv,
+                                    coluna_dispersao_y=args.coluna_target, n_processos=args.processos,
+                                    gerar_pdf=not args.sem_pdf)
+        if relatorio is None:
+            return 1
+    if args.salvar_modelo and resultados['modelo_salvo'] is None:
+        return 1
+    return 0 if resultados['modelo'] is not None else 1
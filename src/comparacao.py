@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Vários modelos (ou vários alvos) treinados em paralelo sobre a mesma matriz.
+
+Para comparar variantes de modelo ou alvos diferentes, o pré-processamento e
+a matriz do modelo são feitos uma única vez. A matriz é gravada em arquivos
+.npy que cada processo abre mapeados na memória (`MatrizModelo.abrir`): todos
+leem as mesmas páginas do arquivo, sem uma cópia dos dados por processo. As
+linhas já ficam na ordem da divisão treino/teste, então treino e teste são
+só fatias da matriz mapeada.
+
+O resultado é um placar com MAE, R² e tempo de cada combinação de modelo e
+alvo, o mesmo que `avaliar_modelo` mostra para um único modelo.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .instrumentacao import instrumentar
+from .modelagem import AcumuladorMetricas, EstatisticasSuficientes, modelo_com_coeficientes
+from .preprocessamento import MatrizModelo, montar_matriz_modelo
+
+
+def modelos_padrao():
+    """Variantes comparadas quando nenhuma é informada: a regressão linear do fluxo,
+    duas forças de ridge e um modelo não linear (gradient boosting) como referência."""
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    return {
+        'Regressão Linear': LinearRegression(),
+        'Ridge (alfa=1)': Ridge(alpha=1.0),
+        'Ridge (alfa=10)': Ridge(alpha=10.0),
+        'Gradient Boosting': HistGradientBoostingRegressor(random_state=42),
+    }
+
+
+def _eh_linear(estimador):
+    """Regressão linear ou ridge com intercepto: treinada pelas estatísticas suficientes, lote a lote."""
+    nome = type(estimador).__name__
+    return nome in ('LinearRegression', 'Ridge') and getattr(estimador, 'fit_intercept', True)
+
+
+def _treinar_e_avaliar(tarefa):
+    """Executada em cada processo: treina um modelo para um alvo e o avalia, lendo a matriz compartilhada."""
+    pasta, nome, estimador, alvo, indice_alvo, test_size, random_state = tarefa
+    matriz = MatrizModelo.abrir(pasta)
+    y = matriz.y if matriz.y.ndim == 1 else matriz.y[:, indice_alvo]
+    treino, teste = matriz.linhas_treino_teste(test_size, random_state)
+
+    inicio_tempo = time.perf_counter()
+    if _eh_linear(estimador):
+        estatisticas = EstatisticasSuficientes(matriz.X.shape[1])
+        for X_lote, y_lote in matriz.em_lotes(treino, y):
+            estatisticas.atualizar(X_lote, y_lote)
+        alfa = float(getattr(estimador, 'alpha', 0.0)) if type(estimador).__name__ == 'Ridge' else 0.0
+        coeficientes, intercepto = estatisticas.resolver(alfa)
+        modelo = modelo_com_coeficientes(coeficientes, intercepto, matriz.colunas, alfa)
+
+        def prever(X):
+            return X @ coeficientes + intercepto
+    else:
+        # Os outros modelos recebem o treino inteiro; com fatias, é uma visão da matriz mapeada
+        modelo = estimador.fit(matriz.X[treino], y[treino])
+        prever = modelo.predict
+    segundos_treino = time.perf_counter() - inicio_tempo
+
+    inicio_tempo = time.perf_counter()
+    metricas = AcumuladorMetricas()
+    for X_lote, y_lote in matriz.em_lotes(teste, y):
+        metricas.atualizar(y_lote, prever(X_lote))
+    return {
+        'modelo': nome,
+        'alvo': alvo,
+        'mae': metricas.mae(),
+        'r2': metricas.r2(),
+        'segundos_treino': segundos_treino,
+        'segundos_avaliacao': time.perf_counter() - inicio_tempo,
+        'n_treino': len(y) - metricas.n,
+        'n_teste': metricas.n,
+        'estimador': modelo,
+    }
+
+
+@instrumentar
+def treinar_varios_modelos(dados, coluna_target='target', modelos=None, test_size=0.3, random_state=42,
+                           n_processos=None, pasta_temporaria=None):
+    """Treina e avalia vários modelos e/ou alvos em paralelo, sobre uma única matriz compartilhada.
+
+    Cada combinação (modelo, alvo) roda em um processo. Regressões lineares e
+    ridge são treinadas lote a lote pelas estatísticas suficientes, lendo a
+    matriz mapeada sem copiá-la; os demais modelos recebem a fatia de treino
+    da matriz mapeada. A divisão treino/teste é a mesma de
+    `dividir_dados_treino_teste` com os mesmos `test_size` e `random_state`.
+
+    Args:
+        dados (pd.DataFrame ou MatrizModelo): Dados já pré-processados (só números).
+        coluna_target (str ou list): Alvo, ou lista de alvos para comparar (nenhum
+            deles entra como coluna de entrada dos modelos).
+        modelos (dict ou list): Modelos do scikit-learn ainda não treinados, por nome
+            (uma lista usa o nome da classe). Padrão: `modelos_padrao()`.
+        n_processos (int): Processos de trabalho; None usa todos os núcleos.
+        pasta_temporaria (str): Onde gravar a matriz compartilhada (padrão: pasta
+            temporária do sistema). Ela é apagada no final.
+
+    Returns:
+        dict: 'placar' (DataFrame com MAE, R² e tempos, do melhor para o pior em cada
+        alvo) e 'modelos' ({(nome, alvo): modelo treinado}), ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if dados is None or eh_fluxo(dados) or not isinstance(dados, (pd.DataFrame, MatrizModelo)):
+        print("Erro: A comparação de modelos precisa dos dados pré-processados completos em memória (DataFrame ou MatrizModelo).")
+        return None
+    alvos = list(coluna_target) if isinstance(coluna_target, (list, tuple)) else [coluna_target]
+    if isinstance(dados, MatrizModelo) and len(alvos) > 1:
+        print("Erro: Uma MatrizModelo já tem um único alvo; para comparar alvos, passe o DataFrame pré-processado.")
+        return None
+    modelos = modelos_padrao() if modelos is None else modelos
+    if not isinstance(modelos, dict):
+        modelos = {type(modelo).__name__: modelo for modelo in modelos}
+    if not modelos:
+        print("Erro: Nenhum modelo foi informado para a comparação.")
+        return None
+
+    print(f"\n--- Comparando {len(modelos)} modelo(s) para {len(alvos)} alvo(s), em paralelo ---")
+    # Montada uma única vez, já na ordem da divisão treino/teste; os processos só leem os arquivos
+    matriz = dados if isinstance(dados, MatrizModelo) else montar_matriz_modelo(
+        dados, alvos if len(alvos) > 1 else alvos[0], random_state=random_state, test_size=test_size)
+    if matriz is None:
+        return None
+    pasta = tempfile.mkdtemp(prefix='comparacao_', dir=pasta_temporaria)
+    try:
+        inicio_tempo = time.perf_counter()
+        matriz.salvar(pasta)
+        tarefas = [(pasta, nome, modelo, alvo, i, test_size, random_state)
+                   for nome, modelo in modelos.items() for i, alvo in enumerate(alvos)]
+        n_processos = min(n_processos or os.cpu_count() or 1, len(tarefas))
+        if n_processos == 1:
+            resultados = list(map(_treinar_e_avaliar, tarefas))
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                resultados = list(executor.map(_treinar_e_avaliar, tarefas))
+        duracao = time.perf_counter() - inicio_tempo
+    except Exception as e:
+        print(f"Ocorreu um problema durante a comparação dos modelos. Detalhes: {e}")
+        return None
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    treinados = {(r['modelo'], r['alvo']): r.pop('estimador') for r in resultados}
+    placar = (pd.DataFrame(resultados).sort_values(['alvo', 'mae'], kind='stable')
+              .reset_index(drop=True))
+    placar.index += 1
+    print(placar.drop(columns=['n_treino', 'n_teste']).round(4).to_string())
+    for alvo, linhas in placar.groupby('alvo', sort=False):
+        melhor = linhas.iloc[0]
+        print(f"Melhor modelo para '{alvo}': {melhor['modelo']} (diferença média de {melhor['mae']:.2f}, "
+              f"explica {melhor['r2'] * 100:.2f}% da variação).")
+    print(f"{len(tarefas)} modelo(s) treinados e avaliados em {duracao:.1f}s com {n_processos} processo(s).")
+    return {'placar': placar, 'modelos': treinados}
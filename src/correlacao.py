@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Correlação entre colunas e associação de cada coluna com o alvo, em blocos.
+
+Depois do one-hot, os dados podem ter milhares de colunas, e `df.corr()`
+precisa de uma cópia densa de tudo e calcula cada par de colunas duas vezes.
+Aqui as estatísticas são acumuladas lote a lote de linhas, como nas
+`EstatisticasSuficientes` (e combinadas pela mesma fórmula de Chan), e dentro
+de cada lote os produtos cruzados são feitos por blocos de colunas: só um
+bloco de colunas centradas existe de cada vez, e só a parte da matriz acima da
+diagonal é calculada. Para a associação com o alvo basta uma soma por coluna;
+a matriz inteira (que cresce com o quadrado do número de colunas) é opcional.
+"""
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .instrumentacao import instrumentar
+from .preprocessamento import LINHAS_POR_LOTE, DadosEsparsos, MatrizModelo
+
+TAMANHO_BLOCO_COLUNAS = 256
+# Acima disso, a matriz entre colunas só é calculada se pedida (ocuparia mais de ~32 MB)
+LIMITE_COLUNAS_MATRIZ = 2000
+
+
+class AcumuladorCorrelacao:
+    """Médias e produtos cruzados centrados de X (e de X com o alvo), somados bloco a bloco.
+
+    Guarda Σ(x - x̄)² de cada coluna, Σ(x - x̄)(y - ȳ) e, com `com_matriz`,
+    Σ(x - x̄)(x - x̄)ᵀ. Linhas com valores ausentes são ignoradas. Aceita
+    matrizes densas e esparsas do SciPy (sem criar a versão densa delas).
+    """
+
+    def __init__(self, n_colunas, com_matriz=True, tamanho_bloco=TAMANHO_BLOCO_COLUNAS):
+        self.tamanho_bloco = tamanho_bloco
+        self.n = 0
+        self.linhas_ignoradas = 0
+        self.media_x = np.zeros(n_colunas)
+        self.media_y = 0.0
+        self.vxx = np.zeros(n_colunas)
+        self.cxx = np.zeros((n_colunas, n_colunas)) if com_matriz else None
+        self.cxy = np.zeros(n_colunas)
+        self.cyy = 0.0
+
+    def atualizar(self, X, y):
+        """Acrescenta um bloco (matriz n×p, densa ou esparsa, e vetor de n alvos)."""
+        y = np.asarray(y, dtype='float64')
+        esparsa = hasattr(X, 'tocsc')
+        if not esparsa:
+            X = np.asarray(X, dtype='float64')
+            validas = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+            if not validas.all():
+                self.linhas_ignoradas += int((~validas).sum())
+                X, y = X[validas], y[validas]
+        if len(y) == 0:
+            return self
+        bloco = AcumuladorCorrelacao(X.shape[1], self.cxx is not None, self.tamanho_bloco)
+        bloco.n = len(y)
+        bloco.media_y = float(y.mean())
+        y_c = y - bloco.media_y
+        bloco.cyy = float(y_c @ y_c)
+        if esparsa:
+            bloco._produtos_esparsos(X.tocsc(), y_c)
+        else:
+            bloco._produtos_densos(X, y_c)
+        return self.combinar(bloco)
+
+    def _produtos_densos(self, X, y_c):
+        self.media_x = X.mean(axis=0)
+        p, b = X.shape[1], self.tamanho_bloco
+        for i in range(0, p, b):
+            # Σ(x - x̄)(z - z̄) = Σ(x - x̄)z - z̄·Σ(x - x̄): o outro lado não precisa ser centrado.
+            # Σ(x - x̄) só é zero sem arredondamento; com médias grandes, o resto não é desprezível
+            X_c = X[:, i:i + b] - self.media_x[i:i + b]
+            self.vxx[i:i + b] = np.einsum('ij,ij->j', X_c, X_c)
+            self.cxy[i:i + b] = X_c.T @ y_c
+            if self.cxx is not None:
+                faixa = X_c.T @ X[:, i:] - np.outer(X_c.sum(axis=0), self.media_x[i:])
+                self.cxx[i:i + b, i:] = faixa
+                self.cxx[i:, i:i + b] = faixa.T
+
+    def _produtos_esparsos(self, X, y_c):
+        # Σ(x - x̄)(z - z̄) = Σxz - n·x̄·z̄: os produtos ficam esparsos e só o resultado é denso
+        n = X.shape[0]
+        self.media_x = np.asarray(X.mean(axis=0)).ravel()
+        self.vxx = np.asarray(X.multiply(X).sum(axis=0)).ravel() - n * self.media_x ** 2
+        self.cxy = np.asarray(X.T @ y_c).ravel()
+        if self.cxx is not None:
+            p, b = X.shape[1], self.tamanho_bloco
+            for i in range(0, p, b):
+                faixa = (X[:, i:i + b].T @ X[:, i:]).toarray()
+                faixa -= n * np.outer(self.media_x[i:i + b], self.media_x[i:])
+                self.cxx[i:i + b, i:] = faixa
+                self.cxx[i:, i:i + b] = faixa.T
+
+    def combinar(self, outro):
+        """Soma os acumuladores de outra parte dos dados (ex.: de outro processo)."""
+        self.linhas_ignoradas += outro.linhas_ignoradas
+        if outro.n == 0:
+            return self
+        if self.n == 0:
+            for nome in ('n', 'media_x', 'media_y', 'vxx', 'cxx', 'cxy', 'cyy'):
+                valor = getattr(outro, nome)
+                setattr(self, nome, valor.copy() if isinstance(valor, np.ndarray) else valor)
+            return self
+        n = self.n + outro.n
+        peso = self.n * outro.n / n
+        delta_x = outro.media_x - self.media_x
+        delta_y = outro.media_y - self.media_y
+        self.vxx += outro.vxx + peso * delta_x ** 2
+        if self.cxx is not None:
+            self.cxx += outro.cxx
+            self.cxx += peso * np.outer(delta_x, delta_x)
+        self.cxy += outro.cxy + peso * delta_x * delta_y
+        self.cyy += outro.cyy + peso * delta_y ** 2
+        self.media_x += delta_x * outro.n / n
+        self.media_y += delta_y * outro.n / n
+        self.n = n
+        return self
+
+    def correlacoes_com_alvo(self):
+        """Correlação de Pearson de cada coluna com o alvo (NaN para colunas constantes)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.vxx > 0, self.cxy / np.sqrt(self.vxx * self.cyy), np.nan)
+
+    def matriz_correlacao(self):
+        """Matriz de correlação de Pearson entre as colunas (NaN nas colunas constantes)."""
+        if self.cxx is None:
+            raise ValueError("A matriz entre colunas não foi acumulada (com_matriz=False).")
+        desvios = np.sqrt(np.where(self.vxx > 0, self.vxx, np.nan))
+        matriz = self.cxx / desvios[:, None] / desvios[None, :]
+        np.fill_diagonal(matriz, np.where(self.vxx > 0, 1.0, np.nan))
+        return np.clip(matriz, -1.0, 1.0, out=matriz)
+
+
+def _lotes_de_dados(dados, coluna_target):
+    """Nomes das colunas de entrada e um gerador de lotes (X, y) para cada formato de dados do fluxo."""
+    if isinstance(dados, MatrizModelo):
+        return list(dados.colunas), dados.em_lotes()
+
+    if isinstance(dados, DadosEsparsos):
+        from scipy import sparse
+        numericas = [c for c in dados.df.columns if c != coluna_target]
+
+        def lotes():
+            for inicio in range(0, len(dados.df), LINHAS_POR_LOTE):
+                parte = dados.df.iloc[inicio:inicio + LINHAS_POR_LOTE]
+                X = sparse.hstack([sparse.csr_matrix(parte[numericas].to_numpy(dtype='float64')),
+                                   dados.matriz[inicio:inicio + LINHAS_POR_LOTE]], format='csr')
+                yield X, parte[coluna_target]
+        return numericas + dados.colunas_codificadas, lotes()
+
+    colunas = [c for c in (dados.colunas if eh_fluxo(dados) else dados.columns) if c != coluna_target]
+
+    def lotes():
+        for bloco in (dados if eh_fluxo(dados) else [dados]):
+            for inicio in range(0, len(bloco), LINHAS_POR_LOTE):
+                parte = bloco.iloc[inicio:inicio + LINHAS_POR_LOTE]
+                # Em blocos, uma categoria ausente de um bloco vira uma coluna de zeros
+                yield parte.reindex(columns=colunas, fill_value=0).to_numpy(dtype='float64'), parte[coluna_target]
+    return colunas, lotes()
+
+
+def _pares_mais_fortes(matriz, colunas, top_k):
+    """Os `top_k` pares de colunas diferentes com maior correlação em valor absoluto."""
+    linhas, cols = np.triu_indices(len(colunas), k=1)
+    valores = matriz[linhas, cols]
+    absolutos = np.nan_to_num(np.abs(valores), nan=-1.0)
+    k = min(top_k, len(valores))
+    if k == 0:
+        return pd.DataFrame(columns=['coluna_a', 'coluna_b', 'correlacao'])
+    escolhidos = np.argpartition(-absolutos, k - 1)[:k]
+    escolhidos = escolhidos[np.argsort(-absolutos[escolhidos], kind='stable')]
+    return pd.DataFrame({'coluna_a': [colunas[i] for i in linhas[escolhidos]],
+                         'coluna_b': [colunas[i] for i in cols[escolhidos]],
+                         'correlacao': valores[escolhidos]})
+
+
+@instrumentar
+def analisar_correlacoes(dados, coluna_target='target', top_k=20, com_matriz=None,
+                         tamanho_bloco=TAMANHO_BLOCO_COLUNAS):
+    """Mostra as colunas mais ligadas ao alvo e os pares de colunas mais parecidos entre si.
+
+    Funciona com os dados já codificados em qualquer formato do fluxo
+    (DataFrame, dados em blocos, MatrizModelo ou o resultado de 'esparso' e
+    'hashing'), em uma única passada e sem cópia densa de todas as colunas.
+
+    Args:
+        top_k (int): Quantas colunas (e pares de colunas) mostrar e devolver.
+        com_matriz (bool): Se calcula também a matriz de correlação entre as
+            colunas. None calcula só se houver até 2000 colunas.
+        tamanho_bloco (int): Colunas por bloco nos produtos cruzados.
+
+    Returns:
+        dict: 'com_alvo' (correlação de cada coluna com o alvo, da mais forte para a
+        mais fraca), 'colunas_selecionadas' (as `top_k` mais fortes, para treinar só
+        com elas), 'pares' (os `top_k` pares de colunas mais correlacionados) e
+        'matriz' (DataFrame), esses dois None sem a matriz, e 'linhas'; ou None em
+        caso de erro.
+    """
+    if dados is None:
+        print("Não foi possível calcular as correlações, pois os dados não foram carregados.")
+        return None
+    print("\n--- Procurando as informações mais ligadas ao alvo (correlação) ---")
+    try:
+        colunas, lotes = _lotes_de_dados(dados, coluna_target)
+        if com_matriz is None:
+            com_matriz = len(colunas) <= LIMITE_COLUNAS_MATRIZ
+        acumulador = AcumuladorCorrelacao(len(colunas), com_matriz, tamanho_bloco)
+        for X, y in lotes:
+            acumulador.atualizar(X, y)
+    except KeyError:
+        print(f"Erro: A coluna alvo '{coluna_target}' não foi encontrada nos dados.")
+        return None
+    except Exception as e:
+        print(f"Ocorreu um problema ao calcular as correlações. Detalhes: {e}")
+        return None
+    if acumulador.n < 2:
+        print("Erro: São precisos pelo menos dois registros completos para calcular correlações.")
+        return None
+
+    com_alvo = pd.Series(acumulador.correlacoes_com_alvo(), index=colunas, name='correlacao')
+    com_alvo = com_alvo.iloc[np.argsort(-np.nan_to_num(com_alvo.abs().to_numpy(), nan=-1.0), kind='stable')]
+    selecionadas = list(com_alvo.dropna().index[:top_k])
+    print(f"As {len(selecionadas)} informações (de {len(colunas)}) que mais acompanham '{coluna_target}' "
+          f"(perto de 1 ou -1 = ligação forte, perto de 0 = fraca):")
+    print(com_alvo.loc[selecionadas].round(4).to_string())
+    constantes = int(com_alvo.isnull().sum())
+    if constantes:
+        print(f"{constantes} coluna(s) têm sempre o mesmo valor e não ajudam o modelo.")
+
+    pares, matriz = None, None
+    if com_matriz:
+        valores = acumulador.matriz_correlacao()
+        matriz = pd.DataFrame(valores, index=colunas, columns=colunas)
+        pares = _pares_mais_fortes(valores, colunas, top_k)
+        if not pares.empty:
+            print("\nPares de informações mais parecidos entre si (uma delas pode ser dispensável):")
+            print(pares.head(min(top_k, 10)).round(4).to_string(index=False))
+    else:
+        print(f"\nCom {len(colunas)} colunas, a correlação entre todas elas não foi calculada (use com_matriz=True).")
+    if acumulador.linhas_ignoradas:
+        print(f"{acumulador.linhas_ignoradas} registro(s) com informações faltando foram deixados de fora.")
+    return {'com_alvo': com_alvo, 'colunas_selecionadas': selecionadas, 'pares': pares, 'matriz': matriz,
+            'linhas': acumulador.n}
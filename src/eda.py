@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Funções para Análise Exploratória de Dados (EDA)."""
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .instrumentacao import instrumentar
+from .perfil import PerfilDados
+from .previa import ler_fim, ler_inicio, resumir_por_amostragem
+
+
+@instrumentar
+def perfilar_dados(df, n_extremos=5, frequentes_numericas=False):
+    """Calcula o PerfilDados de um DataFrame ou de um FluxoDeBlocos em uma passada.
+
+    Com `frequentes_numericas=True`, guarda também os valores mais frequentes
+    das colunas numéricas (mais lento; só é preciso para 'most_frequent').
+    """
+    if df is None:
+        print("Não foi possível analisar os dados, pois os dados não foram carregados.")
+        return None
+    print("\n--- Analisando todas as colunas de uma só vez ---")
+    perfil = PerfilDados(n_extremos, frequentes_numericas)
+    for bloco in (df if eh_fluxo(df) else [df]):
+        perfil.atualizar(bloco)
+    print(f"Análise concluída: {perfil.linhas} registros e {len(perfil.colunas)} colunas examinados em uma única leitura.")
+    return perfil
+
+
+def _perfil_aproximado(df, perfil):
+    """Perfil usado no lugar dos dados: só com dados em blocos (calculado, se preciso) ou sem o DataFrame.
+
+    Com o DataFrame em memória, os valores exatos custam só uma passada por
+    ele, então os resumos aproximados do perfil não são usados.
+    """
+    if df is None:
+        return perfil
+    if eh_fluxo(df):
+        return perfil if perfil is not None else perfilar_dados(df)
+    return None
+
+
+def exibir_inicio_fim(df, n=5, perfil=None):
+    """Exibe as primeiras e últimas n linhas do DataFrame."""
+    if perfil is None and df is not None and eh_fluxo(df):
+        perfil = perfilar_dados(df, n)
+    if perfil is not None:
+        print("\n--- Dando uma olhada nos primeiros e últimos registros ---")
+        print(perfil.inicio.head(n).to_string())
+        print("\n--- ... ---")
+        print(perfil.fim.tail(n).to_string())
+    elif df is not None:
+        print("\n--- Dando uma olhada nos primeiros e últimos registros ---")
+        print(df.head(n).to_string()) # Usar to_string() para garantir que tudo seja exibido
+        print("\n--- ... ---")
+        print(df.tail(n).to_string()) # Usar to_string()
+    else:
+        print("Não foi possível ver os registros, pois os dados não foram carregados.")
+
+def exibir_info_gerais(df, perfil=None):
+    """Exibe informações gerais sobre o DataFrame (tipos, não nulos)."""
+    if perfil is None and df is not None and eh_fluxo(df):
+        perfil = perfilar_dados(df)
+    if perfil is not None:
+        print("\n--- Entendendo os tipos de informações e se há dados faltando ---")
+        print(f"Total de registros: {perfil.linhas}")
+        print(pd.DataFrame({'Não nulos': perfil.nao_nulos(), 'Tipo': perfil.tipos.astype(str)}).to_string())
+        print("\nIsso nos mostra quantas entradas temos para cada tipo de informação (coluna) e o tipo de dado (texto, número, etc.).")
+    elif df is not None:
+        print("\n--- Entendendo os tipos de informações e se há dados faltando ---")
+        df.info(verbose=True)
+        print("\nIsso nos mostra quantas entradas temos para cada tipo de informação (coluna) e o tipo de dado (texto, número, etc.).")
+    else:
+        print("Não foi possível obter informações gerais, pois os dados não foram carregados.")
+
+def exibir_estatisticas_descritivas(df, perfil=None):
+    """Exibe estatísticas descritivas para colunas numéricas.
+
+    Com um DataFrame em memória, os valores são os exatos do `describe()`; o
+    `perfil`, com quartis aproximados, só é usado com dados em blocos ou sem o
+    DataFrame.
+
+    Returns:
+        DataFrame: A tabela exibida, ou None se não houver números para resumir.
+    """
+    perfil = _perfil_aproximado(df, perfil)
+    if df is not None or perfil is not None:
+        print("\n--- Resumo das informações numéricas (média, mínimo, máximo, etc.) ---")
+        df_numeric = perfil.estatisticas_descritivas() if perfil is not None else df.select_dtypes(include=np.number)
+        if not df_numeric.empty:
+            estatisticas = df_numeric if perfil is not None else df_numeric.describe()
+            print(estatisticas.to_string()) # Usar to_string()
+            print("\nEste é um resumo rápido dos números em suas colunas.")
+            return estatisticas
+        print("Não foi encontrada nenhuma coluna com números para resumir.")
+    else:
+        print("Não foi possível obter estatísticas, pois os dados não foram carregados.")
+    return None
+
+def verificar_valores_ausentes(df, perfil=None):
+    """Verifica e exibe a contagem de valores ausentes por coluna."""
+    if perfil is None and df is not None and eh_fluxo(df):
+        perfil = perfilar_dados(df)
+    if df is not None or perfil is not None:
+        print("\n--- Verificando se há dados faltando ---")
+        ausentes = perfil.valores_ausentes() if perfil is not None else df.isnull().sum()
+        ausentes = ausentes[ausentes > 0]
+        if not ausentes.empty:
+            print("Sim, foi encontrado alguns dados faltando nas seguintes colunas:")
+            print(ausentes.to_string()) # Usar to_string()
+            print(f"\nNo total, faltam {ausentes.sum()} informações.")
+        else:
+            print("Ótimo! Não foi encontrada nenhuma informação faltando (dados ausentes).")
+    else:
+        print("Não foi possível verificar dados faltando, pois os dados não foram carregados.")
+
+def verificar_valores_unicos(df, colunas_categoricas, perfil=None):
+    """Exibe a contagem de valores únicos para colunas categóricas especificadas.
+
+    Com dados em blocos (ou só o `perfil`, sem o DataFrame) as contagens são
+    aproximadas e só os valores mais frequentes aparecem, junto com o total
+    aproximado de opções. Com um DataFrame em memória, as contagens são exatas.
+    """
+    perfil = _perfil_aproximado(df, perfil)
+    if df is not None or perfil is not None:
+        print("\n--- Contando as opções em categorias de texto selecionadas ---")
+        colunas_df = perfil.colunas if perfil is not None else df.columns
+        for coluna in colunas_categoricas:
+            if coluna in colunas_df:
+                print(f"\nOpções na coluna: '{coluna}'")
+                # Mostra também a quantidade de NaNs se houver, tratando-os como 'Não Informado'
+                if perfil is not None:
+                    print(perfil.valores_mais_frequentes(coluna).rename('Contagem').to_string())
+                    print(f"Cerca de {perfil.colunas[coluna].distintos.estimativa()} opções diferentes no total.")
+                else:
+                    print(df[coluna].value_counts(dropna=False).rename('Contagem').to_string()) # Usar to_string()
+                print("Isso nos mostra quais opções aparecem e com que frequência.")
+            else:
+                print(f"Atenção: A coluna '{coluna}' que você pediu para verificar não foi encontrada.")
+    else:
+        print("Não foi possível verificar as opções em categorias, pois os dados não foram carregados.")
+
+def exibir_previa_arquivo(caminho_arquivo, n=5, n_blocos=100, linhas_por_bloco=1000):
+    """Exibe o início, o fim e um resumo numérico de um arquivo CSV, sem carregá-lo.
+
+    O fim é lido voltando a partir do último byte e o resumo sai de uma
+    amostra de `n_blocos` blocos de `linhas_por_bloco` linhas, com as médias
+    acompanhadas de um intervalo de 95% de confiança (veja `resumir_por_amostragem`).
+
+    Returns:
+        dict: O retorno de `resumir_por_amostragem`, ou None em caso de erro.
+    """
+    try:
+        inicio, fim = ler_inicio(caminho_arquivo, n), ler_fim(caminho_arquivo, n)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo não foi encontrado em: {caminho_arquivo}")
+        return None
+    except Exception as e:
+        print(f"Ocorreu um problema ao ler o início e o fim do arquivo. Detalhes: {e}")
+        return None
+    print("\n--- Dando uma olhada nos primeiros e últimos registros (sem carregar o arquivo) ---")
+    print(inicio.to_string())
+    print("\n--- ... ---")
+    print(fim.to_string())
+    print("(No fim, a numeração conta a partir da última linha do arquivo.)")
+
+    resumo = resumir_por_amostragem(caminho_arquivo, n_blocos, linhas_por_bloco)
+    if resumo is None:
+        return None
+    print("\n--- Resumo das informações numéricas, estimado por amostragem ---")
+    if resumo['estatisticas'].empty:
+        print("Não foi encontrada nenhuma coluna com números para resumir.")
+        return resumo
+    print(resumo['estatisticas'].to_string())
+    if resumo['metodo'] == 'completo':
+        print(f"\nO arquivo é pequeno e foi lido inteiro ({resumo['linhas_amostradas']} registros): os valores são exatos.")
+        return resumo
+    origem = (f"{resumo['blocos']} trechos espalhados pelo arquivo" if resumo['metodo'] == 'blocos'
+              else "um sorteio feito em uma leitura do arquivo compactado")
+    print(f"\nValores calculados com {resumo['linhas_amostradas']} de cerca de {resumo['linhas_estimadas']} "
+          f"registros, de {origem}.")
+    print(f"A média real de cada coluna deve estar entre 'ic_inferior' e 'ic_superior' "
+          f"(com {resumo['confianca']:.0%} de confiança); os demais valores são estimativas.")
+    return resumo
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Grafo de etapas com resultados guardados em disco (memoização).
+
+Cada etapa declara a função que a executa, os parâmetros e de quais etapas
+anteriores ela recebe resultados (`Resultado('nome')`). A chave de uma etapa
+é um hash do seu nome, do código de todo o pacote `src` (a função pode usar
+funções de outros módulos), dos parâmetros, do conteúdo dos arquivos de
+entrada e das chaves das etapas de que depende.
+Assim, ao mudar um parâmetro (ex.: `test_size` da divisão treino/teste), só
+mudam as chaves dessa etapa e das seguintes; as anteriores são lidas do disco
+e, se nenhuma etapa seguinte precisar delas, nem isso.
+
+    grafo = GrafoDeEtapas('data/cache/etapas')
+    grafo.adicionar('carregar_dados', carregar_dados, arquivos=('caminho_arquivo',),
+                    caminho_arquivo='data/raw/dados_exemplo_2.csv')
+    grafo.adicionar('tratar_valores_ausentes', tratar_valores_ausentes, Resultado('carregar_dados'))
+    df_tratado = grafo.resultado('tratar_valores_ausentes')
+
+Resultados None (falha) e fluxos em blocos (que só descrevem como ler o
+arquivo) não são guardados. O espaço ocupado é limitado apagando as entradas
+usadas há mais tempo, como no cache colunar de `carregar_dados`.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+
+from .carregamento import PASTA_CACHE_PADRAO, _aplicar_limite_lru, _hash_arquivo, eh_fluxo, listar_particoes
+
+PASTA_ETAPAS_PADRAO = os.path.join(PASTA_CACHE_PADRAO, 'etapas')
+LIMITE_ETAPAS_BYTES = 5 * 1024 ** 3
+# Aumente ao mudar algo que afete os resultados e que não esteja no código do pacote (ex.: o formato do cache)
+VERSAO_ETAPAS = 1
+PASTA_PACOTE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Resultado:
+    """Marca um argumento de etapa que é o resultado de outra etapa (ou um item dele, com `indice`)."""
+
+    def __init__(self, etapa, indice=None):
+        self.etapa = etapa
+        self.indice = indice
+
+    def __repr__(self):
+        return f"Resultado({self.etapa!r}, indice={self.indice!r})"
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_do_pacote(pasta=PASTA_PACOTE):
+    """Hash de todos os arquivos .py do pacote, calculado uma vez por execução."""
+    soma = hashlib.sha256()
+    for raiz, pastas, arquivos in os.walk(pasta):
+        pastas[:] = sorted(p for p in pastas if p != '__pycache__')
+        for nome in sorted(a for a in arquivos if a.endswith('.py')):
+            caminho = os.path.join(raiz, nome)
+            soma.update(os.path.relpath(caminho, pasta).encode())
+            with open(caminho, 'rb') as f:
+                soma.update(hashlib.sha256(f.read()).digest())
+    return soma.hexdigest()
+
+
+def _hash_do_codigo(funcao):
+    """Hash do código de que a etapa depende: mudar qualquer módulo do pacote invalida os resultados guardados.
+
+    Funções de fora do pacote (ex.: definidas em um notebook) também têm o seu
+    próprio arquivo incluído, quando ele existe.
+    """
+    partes = [_hash_do_pacote()]
+    try:
+        arquivo = os.path.abspath(inspect.getsourcefile(inspect.unwrap(funcao)))
+        if os.path.commonpath([arquivo, PASTA_PACOTE]) != PASTA_PACOTE:
+            with open(arquivo, 'rb') as f:
+                partes.append(hashlib.sha256(f.read()).hexdigest())
+    except (OSError, TypeError, ValueError):
+        partes.append(f"{funcao.__module__}.{funcao.__qualname__}")
+    return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+
+class GrafoDeEtapas:
+    """Etapas ligadas pelos seus resultados, executadas sob demanda e guardadas em disco.
+
+    Com `pasta_cache=None`, nada é guardado: as etapas só rodam na ordem das
+    dependências, cada uma no máximo uma vez.
+    """
+
+    def __init__(self, pasta_cache=PASTA_ETAPAS_PADRAO, limite_cache_bytes=LIMITE_ETAPAS_BYTES):
+        self.pasta_cache = pasta_cache
+        self.limite_cache_bytes = limite_cache_bytes
+        self.etapas = {}
+        self._chaves = {}
+        self._resultados = {}
+        self.reaproveitadas = []
+        self.executadas = []
+        if pasta_cache:
+            os.makedirs(pasta_cache, exist_ok=True)
+
+    def adicionar(self, nome, funcao, *args, arquivos=(), memorizar=True, **kwargs):
+        """Declara uma etapa, executada como `funcao(*args, **kwargs)`.
+
+        Args:
+            arquivos (tuple): Nomes dos parâmetros que são caminhos de arquivos; entra
+                na chave o conteúdo do arquivo, não só o caminho.
+            memorizar (bool): False para etapas que precisam rodar sempre (ex.: as que
+                mostram gráficos). Elas não são guardadas, mas continuam no grafo.
+        """
+        if nome in self.etapas:
+            raise ValueError(f"A etapa '{nome}' já existe no grafo.")
+        argumentos = list(args) + list(kwargs.values())
+        for dependencia in (a.etapa for a in argumentos if isinstance(a, Resultado)):
+            if dependencia not in self.etapas:
+                raise ValueError(f"A etapa '{nome}' depende de '{dependencia}', que ainda não foi adicionada.")
+        self.etapas[nome] = {'funcao': funcao, 'args': args, 'kwargs': kwargs,
+                             'arquivos': tuple(arquivos), 'memorizar': memorizar}
+
+    def dependencias(self, nome):
+        etapa = self.etapas[nome]
+        argumentos = list(etapa['args']) + list(etapa['kwargs'].values())
+        return list(dict.fromkeys(a.etapa for a in argumentos if isinstance(a, Resultado)))
+
+    def _hash_entrada(self, caminho):
+        """Hash do conteúdo de um arquivo ou de todos os arquivos de uma pasta/padrão (None se não existirem)."""
+        arquivos = listar_particoes(caminho)
+        if not arquivos:
+            return None
+        pasta = self.pasta_cache or PASTA_CACHE_PADRAO
+        os.makedirs(pasta, exist_ok=True)
+        return [(os.path.basename(arquivo), _hash_arquivo(arquivo, pasta)) for arquivo in arquivos]
+
+    def chave(self, nome):
+        """Hash que identifica o resultado da etapa: muda se ela ou qualquer etapa anterior mudar."""
+        if nome not in self._chaves:
+            etapa = self.etapas[nome]
+
+            def descrever(valor):
+                if isinstance(valor, Resultado):
+                    return {'etapa': self.chave(valor.etapa), 'indice': valor.indice}
+                return valor
+
+            parametros = {
+                'args': [descrever(a) for a in etapa['args']],
+                'kwargs': {k: descrever(v) for k, v in etapa['kwargs'].items()},
+                'arquivos': {k: self._hash_entrada(etapa['kwargs'][k]) for k in etapa['arquivos']},
+            }
+            texto = json.dumps([VERSAO_ETAPAS, nome, _hash_do_codigo(etapa['funcao']), parametros],
+                               sort_keys=True, default=repr)
+            self._chaves[nome] = hashlib.sha256(texto.encode()).hexdigest()[:32]
+        return self._chaves[nome]
+
+    def _ler_do_cache(self, nome):
+        pasta = os.path.join(self.pasta_cache, self.chave(nome))
+        caminho_meta = os.path.join(pasta, 'meta.json')
+        if not os.path.exists(caminho_meta):
+            return False, None
+        try:
+            with open(os.path.join(pasta, 'resultado.pkl'), 'rb') as f:
+                resultado = pickle.load(f)
+        except Exception:
+            # Entrada incompleta ou de outra versão das bibliotecas: é recalculada
+            shutil.rmtree(pasta, ignore_errors=True)
+            return False, None
+        os.utime(caminho_meta)
+        return True, resultado
+
+    def _gravar_no_cache(self, nome, resultado):
+        pasta = os.path.join(self.pasta_cache, self.chave(nome))
+        temporaria = f"{pasta}.{os.getpid()}.tmp"
+        shutil.rmtree(temporaria, ignore_errors=True)
+        os.makedirs(temporaria)
+        try:
+            with open(os.path.join(temporaria, 'resultado.pkl'), 'wb') as f:
+                pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(os.path.join(temporaria, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({'etapa': nome, 'versao': VERSAO_ETAPAS}, f, ensure_ascii=False)
+            shutil.rmtree(pasta, ignore_errors=True)
+            os.replace(temporaria, pasta)
+        except Exception as e:
+            shutil.rmtree(temporaria, ignore_errors=True)
+            print(f"Aviso: O resultado da etapa '{nome}' não pôde ser guardado e será recalculado na próxima vez. Detalhes: {e}")
+            return
+        _aplicar_limite_lru(self.pasta_cache, self.limite_cache_bytes, preservar=pasta)
+
+    def resultado(self, nome):
+        """Resultado da etapa: da memória, do disco ou executando-a (e, se preciso, as anteriores)."""
+        if nome in self._resultados:
+            return self._resultados[nome]
+        etapa = self.etapas[nome]
+        guardar = bool(self.pasta_cache) and etapa['memorizar']
+        if guardar:
+            encontrado, resultado = self._ler_do_cache(nome)
+            if encontrado:
+                print(f"Etapa '{nome}' reaproveitada: nada mudou desde a última execução.")
+                self.reaproveitadas.append(nome)
+                self._resultados[nome] = resultado
+                return resultado
+
+        def resolver(valor):
+            if not isinstance(valor, Resultado):
+                return valor
+            dados = self.resultado(valor.etapa)
+            return dados if valor.indice is None or dados is None else dados[valor.indice]
+
+        args = [resolver(a) for a in etapa['args']]
+        kwargs = {k: resolver(v) for k, v in etapa['kwargs'].items()}
+        resultado = etapa['funcao'](*args, **kwargs)
+        self.executadas.append(nome)
+        itens = resultado if isinstance(resultado, tuple) else (resultado,)
+        if guardar and resultado is not None and not any(eh_fluxo(item) for item in itens):
+            self._gravar_no_cache(nome, resultado)
+        self._resultados[nome] = resultado
+        return resultado
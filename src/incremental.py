@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""Atualização incremental para arquivos CSV que só crescem no final.
+
+Quando novas linhas são apenas acrescentadas ao arquivo (ex.: registros de
+clientes chegando a cada hora), não é preciso reler tudo. O estado de uma
+execução guarda até onde o arquivo foi lido (posição em bytes e número de
+linhas) e os resumos dos dados lidos:
+
+    - perfil (PerfilDados), de onde saem as estatísticas da EDA;
+    - pré-processamento ajustado (preenchimentos e categorias);
+    - estatísticas suficientes da regressão (EstatisticasSuficientes).
+
+Na execução seguinte só o trecho novo é lido; o perfil e as estatísticas são
+combinados com os do trecho, e os coeficientes são recalculados a partir das
+estatísticas, sem passar de novo pelas linhas antigas.
+
+    atualizar_incremental('data/raw/clientes.csv', ['sexo', 'categoria'])
+
+Se o início do arquivo mudar (arquivo reescrito ou truncado), ou a
+configuração for outra, tudo é refeito a partir do zero.
+"""
+import hashlib
+import os
+import pickle
+import time
+
+import numpy as np
+
+from .carregamento import (
+    PASTA_CACHE_PADRAO,
+    dividir_arquivo_em_faixas,
+    eh_comprimido,
+    eh_particionado,
+    inferir_esquema,
+    ler_faixa,
+)
+from .instrumentacao import instrumentar
+from .modelagem import EstatisticasSuficientes, modelo_com_coeficientes
+from .perfil import PerfilDados
+from .preprocessamento import PreProcessador
+
+PASTA_ESTADO_PADRAO = os.path.join(PASTA_CACHE_PADRAO, 'incremental')
+# Aumente ao mudar o conteúdo do estado; estados de outra versão são refeitos
+VERSAO_ESTADO = 2
+# Bytes antes da posição já lida que identificam o arquivo (além do cabeçalho)
+_BYTES_ASSINATURA = 64 * 1024
+
+
+def caminho_estado_padrao(caminho_csv):
+    """Arquivo de estado usado quando nenhum é informado: um por CSV, em data/cache/incremental/."""
+    nome = os.path.basename(caminho_csv)
+    codigo = hashlib.sha256(os.path.abspath(caminho_csv).encode()).hexdigest()[:12]
+    return os.path.join(PASTA_ESTADO_PADRAO, f"{nome}.{codigo}.pkl")
+
+
+def _fim_das_linhas_completas(caminho_arquivo):
+    """Posição logo após a última quebra de linha: uma linha ainda sendo escrita fica para a próxima vez."""
+    tamanho = os.path.getsize(caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as f:
+        posicao = tamanho
+        while posicao > 0:
+            inicio = max(0, posicao - 64 * 1024)
+            f.seek(inicio)
+            trecho = f.read(posicao - inicio)
+            quebra = trecho.rfind(b'\n')
+            if quebra >= 0:
+                return inicio + quebra + 1
+            posicao = inicio
+    return 0
+
+
+def _assinatura(caminho_arquivo, posicao):
+    """Hash do cabeçalho e dos bytes logo antes de `posicao`, para saber se o trecho já lido continua igual."""
+    with open(caminho_arquivo, 'rb') as f:
+        cabecalho = f.readline()
+        inicio = max(len(cabecalho), posicao - _BYTES_ASSINATURA)
+        f.seek(inicio)
+        final = f.read(posicao - inicio)
+    return hashlib.sha256(cabecalho + b'\0' + final).hexdigest()
+
+
+def _ler_estado(caminho_estado):
+    if not os.path.exists(caminho_estado):
+        return None
+    try:
+        with open(caminho_estado, 'rb') as f:
+            estado = pickle.load(f)
+    except Exception as e:
+        print(f"Aviso: O estado salvo em {caminho_estado} não pôde ser lido e será refeito. Detalhes: {e}")
+        return None
+    return estado if estado.get('versao') == VERSAO_ESTADO else None
+
+
+def _gravar_estado(caminho_estado, estado):
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_estado)), exist_ok=True)
+    temporario = f"{caminho_estado}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Troca atômica: uma execução interrompida nunca deixa um estado pela metade
+    os.replace(temporario, caminho_estado)
+
+
+def _motivo_para_refazer(estado, caminho_arquivo, configuracao, fim):
+    """Por que o estado salvo não serve para continuar a leitura (None se serve)."""
+    if estado is None:
+        return "primeira leitura deste arquivo"
+    if estado['configuracao'] != configuracao:
+        return "as colunas categóricas, o alvo ou o método mudaram"
+    if fim < estado['posicao']:
+        return "o arquivo ficou menor do que na última leitura"
+    if _assinatura(caminho_arquivo, estado['posicao']) != estado['assinatura']:
+        return "o início do arquivo foi alterado"
+    return None
+
+
+def _resumir_trecho(tarefa):
+    """Executada em cada processo: perfil e categorias (se `perfilar`) e, com o pré-processamento,
+    estatísticas da regressão de uma faixa."""
+    arquivo, inicio, fim, colunas, esquema, tamanho_chunk, colunas_categoricas, perfilar, preprocessador = tarefa
+    perfil = PerfilDados() if perfilar else None
+    vocabularios = {coluna: set() for coluna in colunas_categoricas if coluna in colunas} if perfilar else {}
+    estatisticas = EstatisticasSuficientes(len(preprocessador.colunas_saida)) if preprocessador else None
+    linhas = 0
+    for bloco in ler_faixa(arquivo, inicio, fim, colunas, esquema, tamanho_chunk):
+        linhas += len(bloco)
+        if perfil is not None:
+            perfil.atualizar(bloco)
+        for coluna, vocabulario in vocabularios.items():
+            vocabulario.update(bloco[coluna].dropna().astype(str).unique())
+        if estatisticas is not None:
+            y = bloco[preprocessador.coluna_target].to_numpy(dtype='float64', na_value=np.nan)
+            # Linhas sem alvo não ensinam nada ao modelo
+            validas = ~np.isnan(y)
+            if not validas.all():
+                bloco, y = bloco[validas], y[validas]
+            estatisticas.atualizar(preprocessador.transformar_matriz(bloco), y)
+    return linhas, perfil, vocabularios, estatisticas
+
+
+def _percorrer_trecho(tarefas, n_processos):
+    """Resultados de `_resumir_trecho` para cada faixa, na ordem do arquivo."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    if n_processos == 1 or len(tarefas) <= 1:
+        yield from map(_resumir_trecho, tarefas)
+        return
+    with ProcessPoolExecutor(max_workers=min(n_processos, len(tarefas))) as executor:
+        yield from executor.map(_resumir_trecho, tarefas)
+
+
+@instrumentar
+def atualizar_incremental(caminho_csv, colunas_categoricas, coluna_target='target', metodo='onehot', alfa=0.0,
+                          caminho_estado=None, n_processos=None, tamanho_chunk=100_000,
+                          tamanho_faixa=64 * 1024 ** 2):
+    """Atualiza o perfil e a Regressão Linear com as linhas acrescentadas ao CSV desde a última execução.
+
+    Na primeira execução, o arquivo inteiro é lido (duas passadas: perfil e
+    categorias para ajustar o PreProcessador, depois as estatísticas da
+    regressão). Nas seguintes, só as linhas novas são lidas, uma vez.
+
+    O pré-processamento (preenchimentos e categorias) fica fixo desde a
+    primeira leitura, pois as estatísticas já acumuladas foram calculadas com
+    ele: categorias novas ficam com zeros em todas as colunas da sua variável,
+    como em `PreProcessador.transformar`, e são informadas. Para incorporá-las,
+    apague o arquivo de estado (ou use outro) e tudo será refeito.
+
+    Args:
+        caminho_csv (str): Arquivo CSV que só recebe linhas novas no final.
+        colunas_categoricas (list): Colunas de texto a transformar em números.
+        metodo (str): 'label' ou 'onehot'.
+        alfa (float): Regularização ridge; pode mudar entre execuções sem refazer nada.
+        caminho_estado (str, opcional): Onde guardar o estado (padrão: um arquivo por
+            CSV em data/cache/incremental/).
+        n_processos (int): Processos de trabalho; None usa todos os núcleos.
+        tamanho_chunk (int): Linhas lidas de cada vez.
+        tamanho_faixa (int): Bytes de arquivo entregues a cada processo por vez.
+
+    Returns:
+        dict: 'linhas', 'linhas_novas', 'perfil', 'preprocessador', 'modelo', 'r2',
+        'categorias_novas', 'refeito' e 'segundos', ou None em caso de erro.
+    """
+    print(f"\n--- Atualizando a análise com as linhas novas de {caminho_csv} ---")
+    if eh_particionado(caminho_csv):
+        print("Erro: A atualização incremental é para um único arquivo que cresce no final, não para uma pasta.")
+        return None
+    if eh_comprimido(caminho_csv):
+        print("Erro: Um arquivo compactado não pode ser lido a partir do ponto em que parou; use o CSV sem compactação.")
+        return None
+    caminho_estado = caminho_estado or caminho_estado_padrao(caminho_csv)
+    configuracao = {'colunas_categoricas': list(colunas_categoricas), 'coluna_target': coluna_target,
+                    'metodo': metodo}
+    n_processos = n_processos or os.cpu_count() or 1
+    try:
+        inicio_tempo = time.perf_counter()
+        fim = _fim_das_linhas_completas(caminho_csv)
+        estado = _ler_estado(caminho_estado)
+        motivo = _motivo_para_refazer(estado, caminho_csv, configuracao, fim)
+        linhas_novas = 0
+        categorias_novas = {}
+        if motivo:
+            print(f"Lendo o arquivo inteiro ({motivo}).")
+            colunas, faixas = dividir_arquivo_em_faixas(caminho_csv, tamanho_faixa, fim=fim)
+            if coluna_target not in colunas:
+                print(f"Erro: A coluna alvo '{coluna_target}' não foi encontrada no arquivo.")
+                return None
+            esquema = inferir_esquema(caminho_csv)
+            estado = {'versao': VERSAO_ESTADO, 'arquivo': os.path.abspath(caminho_csv), 'configuracao': configuracao,
+                      'colunas': colunas, 'esquema': esquema, 'linhas': 0, 'perfil': PerfilDados(),
+                      'vocabularios': {coluna: set() for coluna in colunas_categoricas if coluna in colunas}}
+            # Primeira passada: perfil e categorias, para ajustar o pré-processamento
+            tarefas = [(caminho_csv, a, b, colunas, esquema, tamanho_chunk, list(colunas_categoricas), True, None)
+                       for a, b in faixas]
+            for linhas_faixa, perfil_faixa, vocabularios_faixa, _ in _percorrer_trecho(tarefas, n_processos):
+                linhas_novas += linhas_faixa
+                estado['perfil'].combinar(perfil_faixa)
+                for coluna, vocabulario in vocabularios_faixa.items():
+                    estado['vocabularios'][coluna] |= vocabulario
+            preprocessador = PreProcessador(colunas_categoricas, coluna_target, metodo=metodo)
+            preprocessador.ajustar_com_resumos(colunas, estado['perfil'], estado['vocabularios'])
+            estado['preprocessador'] = preprocessador.para_dict()
+            estado['estatisticas'] = EstatisticasSuficientes(len(preprocessador.colunas_saida))
+            perfilar = False
+        else:
+            preprocessador = PreProcessador.de_dict(estado['preprocessador'])
+            faixas = dividir_arquivo_em_faixas(caminho_csv, tamanho_faixa, inicio=estado['posicao'], fim=fim)[1]
+            perfilar = True
+
+        # Linhas novas (ou, ao refazer, a segunda passada): estatísticas da regressão e, se faltar, o perfil
+        tarefas = [(caminho_csv, a, b, estado['colunas'], estado['esquema'], tamanho_chunk,
+                    list(colunas_categoricas), perfilar, preprocessador) for a, b in faixas]
+        for linhas_faixa, perfil_faixa, vocabularios_faixa, estatisticas_faixa in _percorrer_trecho(tarefas,
+                                                                                                   n_processos):
+            estado['estatisticas'].combinar(estatisticas_faixa)
+            if not perfilar:
+                continue
+            linhas_novas += linhas_faixa
+            # Combinados na ordem do arquivo, para o início e o fim do perfil serem os dos dados
+            estado['perfil'].combinar(perfil_faixa)
+            for coluna, vocabulario in vocabularios_faixa.items():
+                novas = vocabulario - estado['vocabularios'][coluna]
+                if novas:
+                    categorias_novas.setdefault(coluna, set()).update(novas)
+                estado['vocabularios'][coluna] |= vocabulario
+        estado['linhas'] += linhas_novas
+        estado['posicao'] = fim
+        estado['assinatura'] = _assinatura(caminho_csv, fim)
+
+        if estado['estatisticas'].n == 0:
+            print("Erro: Os dados que o modelo precisa para aprender estão vazios.")
+            return None
+        modelo = modelo_com_coeficientes(*estado['estatisticas'].resolver(alfa), preprocessador.colunas_saida, alfa)
+        r2 = float(estado['estatisticas'].r2(alfa))
+        _gravar_estado(caminho_estado, estado)
+    except Exception as e:
+        print(f"Ocorreu um problema ao atualizar a análise. Detalhes: {e}")
+        return None
+
+    segundos = time.perf_counter() - inicio_tempo
+    if motivo:
+        print(f"Análise completa de {estado['linhas']} registros em {segundos:.1f}s.")
+    elif linhas_novas:
+        print(f"{linhas_novas} registros novos incorporados em {segundos:.1f}s; total de {estado['linhas']} registros.")
+    else:
+        print(f"Nenhum registro novo desde a última leitura; total de {estado['linhas']} registros.")
+    for coluna, novas in categorias_novas.items():
+        print(f"Atenção: categorias novas em '{coluna}' ({', '.join(sorted(novas))}) não fazem parte do modelo. "
+              f"Para incluí-las, apague {caminho_estado} e rode de novo.")
+    print(f"O modelo explica {r2 * 100:.2f}% da variação dos {estado['estatisticas'].n} registros lidos até agora.")
+    return {'linhas': estado['linhas'], 'linhas_novas': linhas_novas, 'perfil': estado['perfil'],
+            'preprocessador': preprocessador, 'modelo': modelo, 'r2': r2,
+            'categorias_novas': {c: sorted(v) for c, v in categorias_novas.items()},
+            'refeito': bool(motivo), 'segundos': segundos}
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""Registro estruturado de cada etapa do fluxo: tempo, CPU, linhas, bytes e memória.
+
+As funções do fluxo são decoradas com `@instrumentar`. Enquanto nenhuma saída
+estiver registrada, o decorador só chama a função (o custo é uma verificação
+de lista). Com uma ou mais saídas registradas, cada chamada gera um evento
+(um dicionário) entregue a todas elas:
+
+    from src.instrumentacao import SaidaJsonLinhas, SaidaTexto, registrando
+
+    with registrando(SaidaJsonLinhas('logs/etapas.jsonl'), SaidaTexto()):
+        executar_fluxo('data/raw/dados_exemplo_2.csv')
+
+Uma saída é qualquer função que recebe o evento; as três abaixo cobrem os
+usos comuns (arquivo JSON Lines, mensagem na tela e lista em memória).
+"""
+import contextlib
+import datetime
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .memoria import JanelaDePico, rss_atual
+
+_SAIDAS = []
+# Etapas em andamento nesta thread, para que etapas internas não apaguem o pico das externas
+_local = threading.local()
+
+
+def adicionar_saida(saida):
+    """Passa a entregar os eventos das etapas a `saida` (uma função que recebe o evento)."""
+    _SAIDAS.append(saida)
+    return saida
+
+
+def remover_saida(saida):
+    if saida in _SAIDAS:
+        _SAIDAS.remove(saida)
+
+
+@contextlib.contextmanager
+def registrando(*saidas):
+    """Registra as saídas só durante o bloco `with`."""
+    for saida in saidas:
+        adicionar_saida(saida)
+    try:
+        yield saidas
+    finally:
+        for saida in saidas:
+            remover_saida(saida)
+
+
+def _emitir(evento):
+    for saida in list(_SAIDAS):
+        try:
+            saida(evento)
+        except Exception as e:
+            # Um problema no registro nunca deve interromper a análise
+            print(f"Aviso: Não foi possível registrar a etapa '{evento['etapa']}'. Detalhes: {e}")
+
+
+def _linhas(dados):
+    """Número de linhas de DataFrames, matrizes e afins; None para fluxos em blocos, caminhos e escalares."""
+    if dados is None or isinstance(dados, (str, bytes)) or hasattr(dados, 'mapear'):
+        return None
+    if isinstance(dados, tuple):
+        # Ex.: (X_treino, X_teste, y_treino, y_teste): contam as tabelas com duas dimensões
+        contagens = [_linhas(item) for item in dados if len(getattr(item, 'shape', ())) == 2]
+        return sum(contagens) if contagens and None not in contagens else None
+    forma = getattr(dados, 'shape', None)
+    return int(forma[0]) if forma else None
+
+
+def _bytes(dados):
+    """Bytes ocupados pelos dados (sem contar o conteúdo dos textos), ou o tamanho do arquivo para caminhos."""
+    if isinstance(dados, str):
+        return os.path.getsize(dados) if os.path.isfile(dados) else None
+    if isinstance(dados, tuple):
+        tamanhos = [_bytes(item) for item in dados]
+        return sum(t for t in tamanhos if t is not None) or None
+    if isinstance(dados, (pd.DataFrame, pd.Series)):
+        return int(np.sum(dados.memory_usage(index=True, deep=False)))
+    if isinstance(dados, np.ndarray):
+        return int(dados.nbytes)
+    if hasattr(dados, 'X') and hasattr(dados, 'y'):  # MatrizModelo
+        return int(dados.X.nbytes + dados.y.nbytes)
+    if hasattr(dados, 'matriz') and hasattr(dados, 'df'):  # DadosEsparsos
+        return _bytes(dados.df) + _bytes(dados.matriz)
+    if hasattr(dados, 'indptr'):  # matriz esparsa do SciPy
+        return int(dados.data.nbytes + dados.indices.nbytes + dados.indptr.nbytes)
+    return None
+
+
+def _mb(valor):
+    return round(valor / 1024 ** 2, 3) if valor is not None else None
+
+
+def instrumentar(funcao=None, nome=None, entrada=None):
+    """Decorador que mede cada chamada de uma etapa do fluxo e emite um evento.
+
+    Args:
+        nome (str): Nome da etapa nos eventos (padrão: nome da função).
+        entrada (str): Parâmetro cujas linhas e bytes contam como entrada da
+            etapa (padrão: o primeiro parâmetro da função).
+
+    O evento tem: etapa, funcao, inicio (UTC), segundos, cpu_segundos,
+    linhas_entrada, linhas_saida, bytes_entrada, bytes_saida, rss_inicio_mb,
+    rss_fim_mb, pico_rss_mb, nivel (0 para etapas chamadas diretamente),
+    sucesso (False se a função devolveu None ou lançou uma exceção), erro e pid.
+    Linhas de fluxos em blocos não são conhecidas antes da leitura e ficam None.
+    """
+    if funcao is None:
+        return functools.partial(instrumentar, nome=nome, entrada=entrada)
+
+    nome_etapa = nome or funcao.__name__
+    assinatura = inspect.signature(funcao)
+    parametro_entrada = entrada or next(iter(assinatura.parameters))
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not _SAIDAS:
+            return funcao(*args, **kwargs)
+
+        try:
+            dados_entrada = assinatura.bind_partial(*args, **kwargs).arguments.get(parametro_entrada)
+        except TypeError:
+            dados_entrada = None
+        pilha = getattr(_local, 'pilha', None)
+        if pilha is None:
+            pilha = _local.pilha = []
+        # A janela guarda o pico desta etapa mesmo que etapas internas (ou o
+        # MedidorMemoria) zerem o pico do processo
+        janela = JanelaDePico().abrir()
+        pilha.append(janela)
+
+        evento = {
+            'etapa': nome_etapa,
+            'funcao': f"{funcao.__module__}.{funcao.__qualname__}",
+            'inicio': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'linhas_entrada': _linhas(dados_entrada),
+            'bytes_entrada': _bytes(dados_entrada),
+            'rss_inicio_mb': _mb(rss_atual()),
+        }
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        resultado, erro = None, None
+        try:
+            resultado = funcao(*args, **kwargs)
+            return resultado
+        except BaseException as e:
+            erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            cpu_segundos = time.process_time() - inicio_cpu
+            pilha.pop()
+            pico = janela.fechar()
+            evento.update({
+                'segundos': round(segundos, 6),
+                'cpu_segundos': round(cpu_segundos, 6),
+                'linhas_saida': _linhas(resultado),
+                'bytes_saida': _bytes(resultado),
+                'rss_fim_mb': _mb(rss_atual()),
+                # Sem como zerar o pico (fora do Linux), vale o pico desde o início do processo
+                'pico_rss_mb': _mb(pico),
+                'pico_desde_inicio_do_processo': not janela.por_etapa,
+                'nivel': len(pilha),
+                'sucesso': erro is None and resultado is not None,
+                'erro': erro,
+                'pid': os.getpid(),
+            })
+            _emitir(evento)
+
+    return envoltorio
+
+
+class SaidaJsonLinhas:
+    """Acrescenta cada evento como uma linha JSON em um arquivo (formato JSON Lines).
+
+    O arquivo é aberto a cada evento, então vários processos e execuções podem
+    escrever no mesmo arquivo, e nada se perde se a execução for interrompida.
+    """
+
+    def __init__(self, caminho_arquivo):
+        self.caminho_arquivo = caminho_arquivo
+        pasta = os.path.dirname(os.path.abspath(caminho_arquivo))
+        os.makedirs(pasta, exist_ok=True)
+
+    def __call__(self, evento):
+        with open(self.caminho_arquivo, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(evento, ensure_ascii=False) + '\n')
+
+
+class SaidaTexto:
+    """Mostra uma mensagem curta por etapa na tela; `nivel_maximo=0` omite as etapas internas."""
+
+    def __init__(self, nivel_maximo=None):
+        self.nivel_maximo = nivel_maximo
+
+    def __call__(self, evento):
+        if self.nivel_maximo is not None and evento['nivel'] > self.nivel_maximo:
+            return
+        partes = [f"{evento['segundos']:.2f}s (CPU {evento['cpu_segundos']:.2f}s)"]
+        linhas = [n for n in (evento['linhas_entrada'], evento['linhas_saida']) if n is not None]
+        if len(linhas) == 2:
+            partes.append(f"{linhas[0]} -> {linhas[1]} linhas")
+        elif linhas:
+            partes.append(f"{linhas[0]} linhas")
+        if evento['pico_rss_mb'] is not None:
+            partes.append(f"pico de memória {evento['pico_rss_mb']:.1f} MB")
+        situacao = '' if evento['sucesso'] else ' [falhou]'
+        print(f"[etapa] {'  ' * evento['nivel']}{evento['etapa']}: {', '.join(partes)}{situacao}")
+
+
+class ColetorEventos:
+    """Guarda os eventos em memória; `tabela()` os devolve como DataFrame."""
+
+    def __init__(self):
+        self.eventos = []
+
+    def __call__(self, evento):
+        self.eventos.append(evento)
+
+    def tabela(self):
+        return pd.DataFrame(self.eventos)
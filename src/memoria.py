@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Medição do pico de memória residente (RSS) de cada etapa do fluxo.
+
+No Linux o pico do processo (VmHWM) pode ser zerado escrevendo "5" em
+/proc/self/clear_refs, o que permite medir o pico de cada etapa
+separadamente. Em outros sistemas só existe o pico desde o início do
+processo (`resource.getrusage`), e o relatório indica isso.
+
+Como o pico é um só para o processo, medições aninhadas (o `MedidorMemoria`
+de `--medir-memoria` e o `@instrumentar` de cada função) não podem zerá-lo
+sem avisar as outras: cada medição em andamento é uma `JanelaDePico`, e
+`zerar_pico_rss` guarda o pico atingido até ali em todas as janelas abertas
+antes de zerá-lo.
+"""
+import contextlib
+import re
+import sys
+import threading
+
+import pandas as pd
+
+
+def _ler_status(campo):
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            encontrado = re.search(rf'^{campo}:\s+(\d+) kB', f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(encontrado.group(1)) * 1024 if encontrado else None
+
+
+def rss_atual():
+    """Memória residente atual do processo, em bytes (None se indisponível)."""
+    return _ler_status('VmRSS')
+
+
+def pico_rss():
+    """Pico de memória residente desde o último `zerar_pico_rss`, em bytes."""
+    pico = _ler_status('VmHWM')
+    if pico is not None:
+        return pico
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No macOS o valor já vem em bytes; no Linux, em kB
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+_JANELAS_ABERTAS = []
+_TRAVA_JANELAS = threading.Lock()
+
+
+def zerar_pico_rss():
+    """Zera o pico de RSS do processo. Retorna False se o sistema não permitir.
+
+    O pico atingido até aqui fica guardado nas janelas de medição abertas.
+    """
+    with _TRAVA_JANELAS:
+        if _JANELAS_ABERTAS:
+            atual = pico_rss() or 0
+            for janela in _JANELAS_ABERTAS:
+                janela.acumulado = max(janela.acumulado, atual)
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class JanelaDePico:
+    """Pico de RSS de um trecho do programa, mesmo que medições internas zerem o pico do processo.
+
+    Uso:
+        janela = JanelaDePico().abrir()
+        ...
+        pico = janela.fechar()
+
+    `por_etapa` é False quando o pico não pode ser zerado (fora do Linux): aí
+    o valor é o pico desde o início do processo.
+    """
+
+    def __init__(self):
+        self.acumulado = 0
+        self.por_etapa = False
+
+    def abrir(self):
+        self.por_etapa = zerar_pico_rss()
+        with _TRAVA_JANELAS:
+            _JANELAS_ABERTAS.append(self)
+        return self
+
+    def pico(self):
+        """Maior RSS desde `abrir`, em bytes (None se indisponível)."""
+        return max(self.acumulado, pico_rss() or 0) or None
+
+    def fechar(self):
+        pico = self.pico()
+        with _TRAVA_JANELAS:
+            if self in _JANELAS_ABERTAS:
+                _JANELAS_ABERTAS.remove(self)
+        return pico
+
+
+def tamanho_em_memoria(dados):
+    """Bytes ocupados por um DataFrame (incluindo textos) ou por um array NumPy."""
+    if dados is None:
+        return 0
+    if isinstance(dados, pd.DataFrame):
+        return int(dados.memory_usage(deep=True, index=True).sum())
+    if isinstance(dados, pd.Series):
+        return int(dados.memory_usage(deep=True, index=True))
+    return int(getattr(dados, 'nbytes', 0))
+
+
+class MedidorMemoria:
+    """Registra, para cada etapa, o RSS no início e no fim e o pico durante a etapa.
+
+    Uso:
+        medidor = MedidorMemoria()
+        with medidor.etapa('carregar_dados'):
+            df = carregar_dados(...)
+        medidor.exibir_relatorio(tamanho_entrada=tamanho_em_memoria(df))
+
+    Com `ativo=False`, `etapa` não mede nada, para que o mesmo código sirva
+    com e sem a medição.
+    """
+
+    def __init__(self, ativo=True):
+        self.ativo = ativo
+        self.rss_base = rss_atual() if ativo else None
+        self.pico_por_etapa = zerar_pico_rss() if ativo else False
+        self.registros = []
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        if not self.ativo:
+            yield
+            return
+        inicio = rss_atual()
+        janela = JanelaDePico().abrir()
+        try:
+            yield
+        finally:
+            self.registros.append({'etapa': nome, 'rss_inicio': inicio, 'rss_fim': rss_atual(), 'pico_rss': janela.fechar()})
+
+    def relatorio(self, tamanho_entrada=None):
+        """DataFrame com as medições em MB e, se informado, o pico em relação à entrada."""
+        tabela = pd.DataFrame(self.registros, columns=['etapa', 'rss_inicio', 'rss_fim', 'pico_rss'])
+        tabela = tabela.set_index('etapa').astype('float64') / 1024 ** 2
+        if tamanho_entrada and self.rss_base is not None:
+            # Quanto a etapa usou além do processo antes dos dados, em múltiplos da entrada
+            tabela['pico_vs_entrada'] = (tabela['pico_rss'] - self.rss_base / 1024 ** 2) / (tamanho_entrada / 1024 ** 2)
+        return tabela.rename(columns={'rss_inicio': 'rss_inicio_mb', 'rss_fim': 'rss_fim_mb', 'pico_rss': 'pico_rss_mb'})
+
+    def exibir_relatorio(self, tamanho_entrada=None):
+        if not self.ativo or not self.registros:
+            return
+        print("\n--- Uso de memória por etapa ---")
+        if tamanho_entrada:
+            print(f"Tamanho dos dados carregados: {tamanho_entrada / 1024 ** 2:.1f} MB")
+        print(self.relatorio(tamanho_entrada).round(2).to_string())
+        if not self.pico_por_etapa:
+            print("Atenção: este sistema só informa o pico desde o início do processo, não o de cada etapa.")
+        print("('pico_vs_entrada' desconta a memória que o processo já usava antes de carregar os dados.)")
@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""Funções para Modelagem (Regressão Linear) e Avaliação.
+
+Scikit-learn e Matplotlib só são importados quando um modelo é treinado ou
+avaliado.
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from .carregamento import (
+    carregar_dados,
+    dividir_particoes_em_faixas,
+    eh_fluxo,
+    inferir_esquema,
+    iterar_em_pares,
+    ler_faixa,
+    listar_particoes,
+)
+from .instrumentacao import instrumentar
+from .preprocessamento import PreProcessador
+
+
+class EstatisticasSuficientes:
+    """Estatísticas que bastam para ajustar uma regressão linear (com ou sem ridge).
+
+    Guarda o número de linhas, as médias de X e de y e os produtos cruzados
+    centrados Σ(x - x̄)(x - x̄)ᵀ e Σ(x - x̄)(y - ȳ). Ocupam memória proporcional
+    ao quadrado do número de colunas, não ao número de linhas, e podem ser
+    somadas bloco a bloco (`atualizar`) ou entre processos (`combinar`), com a
+    mesma fórmula de Chan usada pelos momentos de `PerfilColuna`. Trabalhar com
+    valores centrados evita a perda de precisão de XᵀX quando as colunas têm
+    médias grandes, e dá exatamente a solução do scikit-learn, que também
+    centraliza os dados antes de resolver.
+    """
+
+    def __init__(self, n_colunas):
+        self.n = 0
+        self.media_x = np.zeros(n_colunas)
+        self.media_y = 0.0
+        self.cxx = np.zeros((n_colunas, n_colunas))
+        self.cxy = np.zeros(n_colunas)
+        self.cyy = 0.0
+
+    def atualizar(self, X, y):
+        """Acrescenta um bloco (matriz n×p e vetor de n alvos)."""
+        X = np.asarray(X, dtype='float64')
+        y = np.asarray(y, dtype='float64')
+        if len(y) == 0:
+            return self
+        bloco = EstatisticasSuficientes(X.shape[1])
+        bloco.n = len(y)
+        bloco.media_x = X.mean(axis=0)
+        bloco.media_y = float(y.mean())
+        X_c = X - bloco.media_x
+        y_c = y - bloco.media_y
+        bloco.cxx = X_c.T @ X_c
+        bloco.cxy = X_c.T @ y_c
+        bloco.cyy = float(y_c @ y_c)
+        return self.combinar(bloco)
+
+    def combinar(self, outra):
+        """Soma as estatísticas de outra parte dos dados (ex.: de outro processo)."""
+        if outra.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update({k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in outra.__dict__.items()})
+            return self
+        n = self.n + outra.n
+        peso = self.n * outra.n / n
+        delta_x = outra.media_x - self.media_x
+        delta_y = outra.media_y - self.media_y
+        self.cxx += outra.cxx + peso * np.outer(delta_x, delta_x)
+        self.cxy += outra.cxy + peso * delta_x * delta_y
+        self.cyy += outra.cyy + peso * delta_y ** 2
+        self.media_x += delta_x * outra.n / n
+        self.media_y += delta_y * outra.n / n
+        self.n = n
+        return self
+
+    def resolver(self, alfa=0.0):
+        """Resolve os coeficientes; com `alfa` > 0 aplica ridge (o intercepto não é penalizado).
+
+        Returns:
+            tuple: (coeficientes, intercepto)
+        """
+        if self.n == 0:
+            raise ValueError("Não há linhas acumuladas para resolver a regressão.")
+        matriz = self.cxx + alfa * np.eye(len(self.cxy)) if alfa else self.cxx
+        # lstsq também resolve colunas constantes ou repetidas (matriz singular), como o LinearRegression
+        coeficientes = np.linalg.lstsq(matriz, self.cxy, rcond=None)[0]
+        intercepto = self.media_y - float(self.media_x @ coeficientes)
+        return coeficientes, intercepto
+
+    def r2(self, alfa=0.0):
+        """R² do ajuste nos próprios dados acumulados."""
+        coeficientes, _ = self.resolver(alfa)
+        residuo = self.cyy - 2 * coeficientes @ self.cxy + coeficientes @ self.cxx @ coeficientes
+        return 1 - residuo / self.cyy
+
+
+class AcumuladorMetricas:
+    """MAE e R² somados bloco a bloco, sem guardar os valores previstos.
+
+    A variância dos valores reais (o denominador do R²) é acumulada em torno
+    da média de cada bloco e combinada pela fórmula de Chan, como nas
+    `EstatisticasSuficientes`, e não por Σy² - (Σy)²/n, que perde precisão
+    quando o alvo tem média grande. Os resultados são os de
+    `mean_absolute_error` e `r2_score` do scikit-learn.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.soma_abs = 0.0
+        self.soma_quad = 0.0
+        self.media_y = 0.0
+        self.cyy = 0.0
+
+    def atualizar(self, reais, previstos):
+        """Acrescenta um bloco de valores reais e previstos."""
+        reais = np.asarray(reais, dtype='float64')
+        if len(reais) == 0:
+            return self
+        erro = reais - np.asarray(previstos, dtype='float64')
+        bloco = AcumuladorMetricas()
+        bloco.n = len(reais)
+        bloco.soma_abs = float(np.abs(erro).sum())
+        bloco.soma_quad = float(erro @ erro)
+        bloco.media_y = float(reais.mean())
+        y_c = reais - bloco.media_y
+        bloco.cyy = float(y_c @ y_c)
+        return self.combinar(bloco)
+
+    def combinar(self, outro):
+        """Soma as métricas de outra parte dos dados (ex.: de outro processo)."""
+        if outro.n == 0:
+            return self
+        n = self.n + outro.n
+        delta_y = outro.media_y - self.media_y
+        self.cyy += outro.cyy + self.n * outro.n / n * delta_y ** 2
+        self.media_y += delta_y * outro.n / n
+        self.soma_abs += outro.soma_abs
+        self.soma_quad += outro.soma_quad
+        self.n = n
+        return self
+
+    def mae(self):
+        """Erro absoluto médio."""
+        return self.soma_abs / self.n
+
+    def r2(self):
+        """Coeficiente de determinação (R²)."""
+        return 1 - self.soma_quad / self.cyy
+
+
+def modelo_com_coeficientes(coeficientes, intercepto, colunas, alfa=0.0):
+    """Monta um modelo do scikit-learn com coeficientes já calculados, pronto para `predict`."""
+    from sklearn.linear_model import LinearRegression, Ridge
+    modelo = Ridge(alpha=alfa) if alfa else LinearRegression()
+    modelo.coef_ = np.asarray(coeficientes, dtype='float64')
+    modelo.intercept_ = float(intercepto)
+    modelo.n_features_in_ = len(colunas)
+    modelo.feature_names_in_ = np.asarray(colunas, dtype=object)
+    return modelo
+
+
+def salvar_modelo(modelo, preprocessador, caminho_arquivo, colunas=None):
+    """Salva o modelo linear e o pré-processamento ajustado em um único arquivo JSON.
+
+    `colunas` são os nomes das colunas com que o modelo foi treinado (por
+    padrão, `modelo.feature_names_in_`). Elas precisam ser as mesmas colunas
+    produzidas pelo `preprocessador`, em qualquer ordem; os coeficientes são
+    guardados na ordem do pré-processamento.
+
+    Returns:
+        str: O caminho do arquivo salvo, ou None em caso de erro.
+    """
+    if modelo is None or preprocessador is None or not preprocessador.ajustado:
+        print("Erro: É preciso um modelo treinado e um pré-processamento ajustado para salvar.")
+        return None
+    colunas = list(colunas if colunas is not None else getattr(modelo, 'feature_names_in_', []))
+    if sorted(colunas) != sorted(preprocessador.colunas_saida):
+        print("Erro: As colunas do modelo não são as mesmas produzidas pelo pré-processamento; o modelo não foi salvo.")
+        return None
+    coeficientes = dict(zip(colunas, np.ravel(modelo.coef_).tolist()))
+    dados = {
+        'versao': 1,
+        'tipo': type(modelo).__name__,
+        'alfa': float(getattr(modelo, 'alpha', 0.0)),
+        'coeficientes': [coeficientes[coluna] for coluna in preprocessador.colunas_saida],
+        'intercepto': float(modelo.intercept_),
+        'preprocessador': preprocessador.para_dict(),
+    }
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(caminho_arquivo)), exist_ok=True)
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Erro: Não foi possível salvar o modelo em {caminho_arquivo}. Detalhes: {e}")
+        return None
+    print(f"Modelo salvo em: {caminho_arquivo}")
+    return caminho_arquivo
+
+
+def carregar_modelo(caminho_arquivo):
+    """Lê um arquivo de `salvar_modelo`.
+
+    Returns:
+        tuple: (modelo, PreProcessador), ou (None, None) em caso de erro.
+    """
+    try:
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            dados = json.load(f)
+        preprocessador = PreProcessador.de_dict(dados['preprocessador'])
+        modelo = modelo_com_coeficientes(dados['coeficientes'], dados['intercepto'],
+                                          preprocessador.colunas_saida, dados.get('alfa', 0.0))
+        return modelo, preprocessador
+    except FileNotFoundError:
+        print(f"Erro: O arquivo do modelo não foi encontrado em: {caminho_arquivo}")
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Erro: O arquivo {caminho_arquivo} não parece ser um modelo salvo. Detalhes: {e}")
+    return None, None
+
+
+@instrumentar
+def treinar_modelo_regressao(X_treino, y_treino, alfa=0.0):
+    """Treina um modelo de Regressão Linear (ou Ridge, se `alfa` > 0).
+
+    Com X_treino e y_treino em blocos, o modelo é ajustado pelas equações
+    normais: as `EstatisticasSuficientes` são somadas bloco a bloco e
+    resolvidas no final, com memória proporcional ao número de colunas e não
+    ao de linhas.
+    """
+    if X_treino is None or y_treino is None:
+        print("Erro: Não há dados válidos para o modelo aprender.")
+        return None
+    if eh_fluxo(X_treino):
+        return _treinar_regressao_em_blocos(X_treino, y_treino, alfa)
+    # shape e len também funcionam para matrizes NumPy e esparsas (MatrizModelo, 'esparso', 'hashing')
+    if min(X_treino.shape) == 0 or len(y_treino) == 0:
+        print("Erro: Os dados que o modelo precisa para aprender estão vazios.")
+        return None
+
+    print("\n--- Ensinando o modelo a fazer previsões (Regressão Linear) ---")
+    try:
+        from sklearn.linear_model import LinearRegression, Ridge
+        modelo = Ridge(alpha=alfa) if alfa else LinearRegression()
+        modelo.fit(X_treino, y_treino)
+        print("O modelo aprendeu com os dados com sucesso!")
+        return modelo
+    except Exception as e:
+        print(f"Ops! Ocorreu um problema enquanto o modelo tentava aprender. Detalhes: {e}")
+        print("Isso pode acontecer se houver dados inesperados ou formatos incorretos.")
+        return None
+
+def _treinar_regressao_em_blocos(X_treino, y_treino, alfa=0.0):
+    print("\n--- Ensinando o modelo a fazer previsões (Regressão Linear, em blocos) ---")
+    try:
+        estatisticas, colunas = None, None
+        for X_bloco, y_bloco in iterar_em_pares(X_treino, y_treino):
+            if colunas is None:
+                colunas = X_bloco.columns
+                estatisticas = EstatisticasSuficientes(len(colunas))
+            estatisticas.atualizar(X_bloco[colunas].to_numpy(dtype='float64'), y_bloco.to_numpy(dtype='float64'))
+        if estatisticas is None or estatisticas.n == 0:
+            print("Erro: Os dados que o modelo precisa para aprender estão vazios.")
+            return None
+        modelo = modelo_com_coeficientes(*estatisticas.resolver(alfa), colunas, alfa)
+        print(f"O modelo aprendeu com {estatisticas.n} registros com sucesso!")
+        return modelo
+    except Exception as e:
+        print(f"Ops! Ocorreu um problema enquanto o modelo tentava aprender. Detalhes: {e}")
+        print("Isso pode acontecer se houver dados inesperados ou formatos incorretos.")
+        return None
+
+
+def _estatisticas_da_faixa(tarefa):
+    """Executada em cada processo: lê uma faixa do CSV e acumula suas estatísticas."""
+    caminho_arquivo, inicio, fim, colunas, esquema, tamanho_chunk, preprocessador = tarefa
+    estatisticas = EstatisticasSuficientes(len(preprocessador.colunas_saida))
+    for bloco in ler_faixa(caminho_arquivo, inicio, fim, colunas, esquema, tamanho_chunk):
+        y = bloco[preprocessador.coluna_target].to_numpy(dtype='float64', na_value=np.nan)
+        # Linhas sem alvo não ensinam nada ao modelo
+        validas = ~np.isnan(y)
+        if not validas.all():
+            bloco, y = bloco[validas], y[validas]
+        estatisticas.atualizar(preprocessador.transformar_matriz(bloco), y)
+    return estatisticas
+
+
+@instrumentar
+def treinar_regressao_fora_da_memoria(caminho_arquivo, preprocessador, alfa=0.0, n_processos=None,
+                                      tamanho_chunk=100_000, tamanho_faixa=64 * 1024 ** 2):
+    """Treina a regressão direto do CSV em disco, dividindo o arquivo entre vários processos.
+
+    O arquivo é cortado em faixas de bytes (`tamanho_faixa`); cada processo lê
+    as suas em blocos de `tamanho_chunk` linhas, aplica o `preprocessador` e
+    acumula `EstatisticasSuficientes`, que são combinadas e resolvidas no
+    final. Nenhum processo guarda mais que uma faixa e as estatísticas, cujo
+    tamanho depende só do número de colunas. O resultado é o mesmo do
+    `LinearRegression` (ou `Ridge`, com `alfa` > 0) treinado com todas as
+    linhas em memória.
+
+    Args:
+        caminho_arquivo (str): CSV com cabeçalho, ou pasta/padrão com vários CSVs de
+            mesmas colunas (as faixas de todos os arquivos são divididas entre os processos).
+        preprocessador (PreProcessador): Se ainda não estiver ajustado, é ajustado
+            antes com uma passada em blocos pelo arquivo (para ajustá-lo também em
+            paralelo, veja `processar_particoes`).
+        alfa (float): Força da regularização ridge; 0 é a regressão comum.
+        n_processos (int): Processos de trabalho; None usa todos os núcleos e 1 roda
+            tudo no processo atual.
+
+    Returns:
+        LinearRegression ou Ridge: O modelo treinado, ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if preprocessador is None:
+        print("Erro: É preciso informar o pré-processamento (PreProcessador) usado para montar as colunas do modelo.")
+        return None
+    print("\n--- Ensinando o modelo a fazer previsões (Regressão Linear, direto do disco) ---")
+    try:
+        inicio_tempo = time.perf_counter()
+        if not preprocessador.ajustado:
+            fluxo = carregar_dados(caminho_arquivo, tamanho_chunk=tamanho_chunk)
+            if fluxo is None or preprocessador.ajustar(fluxo) is None:
+                return None
+        arquivos = listar_particoes(caminho_arquivo)
+        if not arquivos:
+            print(f"Erro: Nenhum arquivo CSV foi encontrado em: {caminho_arquivo}")
+            return None
+        colunas, faixas = dividir_particoes_em_faixas(arquivos, tamanho_faixa)
+        if preprocessador.coluna_target not in colunas:
+            print(f"Erro: A coluna alvo '{preprocessador.coluna_target}' não foi encontrada no arquivo.")
+            return None
+        esquema = inferir_esquema(arquivos[0])
+        tarefas = [(arquivo, inicio, fim, colunas, esquema, tamanho_chunk, preprocessador)
+                   for arquivo, inicio, fim in faixas]
+        n_processos = min(n_processos or os.cpu_count() or 1, max(len(tarefas), 1))
+
+        estatisticas = EstatisticasSuficientes(len(preprocessador.colunas_saida))
+        if n_processos == 1:
+            for parte in map(_estatisticas_da_faixa, tarefas):
+                estatisticas.combinar(parte)
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                for parte in executor.map(_estatisticas_da_faixa, tarefas):
+                    estatisticas.combinar(parte)
+        if estatisticas.n == 0:
+            print("Erro: Os dados que o modelo precisa para aprender estão vazios.")
+            return None
+
+        modelo = modelo_com_coeficientes(*estatisticas.resolver(alfa), preprocessador.colunas_saida, alfa)
+        duracao = time.perf_counter() - inicio_tempo
+        print(f"O modelo aprendeu com {estatisticas.n} registros em {duracao:.1f}s "
+              f"({len(faixas)} partes de {len(arquivos)} arquivo(s), {n_processos} processo(s)).")
+        return modelo
+    except Exception as e:
+        print(f"Ops! Ocorreu um problema enquanto o modelo tentava aprender. Detalhes: {e}")
+        print("Isso pode acontecer se houver dados inesperados ou formatos incorretos.")
+        return None
+
+def plotar_reais_vs_previstos(reais, previstos, titulo="Comparação: Valores Reais vs. Valores Previstos pelo Modelo",
+                              caminho_saida=None):
+    """Gráfico dos valores reais contra os previstos; a linha tracejada marca a previsão perfeita."""
+    import matplotlib.pyplot as plt
+
+    from .visualizacao import _mostrar_ou_salvar
+    reais, previstos = np.asarray(reais, dtype='float64'), np.asarray(previstos, dtype='float64')
+    plt.figure(figsize=(8, 5))
+    plt.scatter(reais, previstos, alpha=0.6)
+    plt.plot([reais.min(), reais.max()], [reais.min(), reais.max()], '--r', linewidth=2)
+    plt.xlabel("Valores Reais (o que realmente aconteceu)")
+    plt.ylabel("Valores Previstos (o que o modelo estimou)")
+    plt.title(titulo)
+    plt.grid(True, alpha=0.3)
+    _mostrar_ou_salvar(plt, caminho_saida)
+
+def _avaliar_modelo_em_blocos(modelo, X_teste, y_teste, mostrar_grafico=True, max_pontos_grafico=5000,
+                              caminho_saida=None):
+    print("\n--- Verificando o quão bem o modelo prevê resultados novos ---")
+    try:
+        metricas = AcumuladorMetricas()
+        reais, previstos = [], []
+        for X_bloco, y_bloco in iterar_em_pares(X_teste, y_teste):
+            if len(X_bloco) == 0:
+                continue
+            y_vals = y_bloco.to_numpy(dtype='float64')
+            y_pred = modelo.predict(X_bloco)
+            metricas.atualizar(y_vals, y_pred)
+            faltam = max_pontos_grafico - sum(len(r) for r in reais)
+            if faltam > 0:
+                reais.append(y_vals[:faltam])
+                previstos.append(y_pred[:faltam])
+        if metricas.n == 0:
+            print("Erro: Os dados para testar o modelo estão vazios.")
+            return None, None
+
+        mae, r2 = metricas.mae(), metricas.r2()
+        print(f"A diferença média entre o que o modelo previu e o valor real foi de: {mae:.2f}")
+        print(f"O modelo conseguiu explicar {r2*100:.2f}% da variação nos dados. Quanto mais perto de 100%, melhor!")
+
+        if not mostrar_grafico:
+            return mae, r2
+
+        reais, previstos = np.concatenate(reais), np.concatenate(previstos)
+        plotar_reais_vs_previstos(reais, previstos, caminho_saida=caminho_saida,
+                                  titulo=f"Comparação: Valores Reais vs. Valores Previstos pelo Modelo (primeiros {len(reais)} pontos)")
+
+        return mae, r2
+    except Exception as e:
+        print(f"Ocorreu um problema ao avaliar o modelo. Detalhes: {e}")
+        return None, None
+
+@instrumentar(entrada='X_teste')
+def avaliar_modelo(modelo, X_teste, y_teste, mostrar_grafico=True, caminho_saida=None):
+    """Avalia o modelo treinado usando MAE e R².
+
+    Com `caminho_saida`, o gráfico de valores reais vs. previstos é salvo nesse
+    arquivo em vez de aparecer na tela.
+    """
+    if modelo is None or X_teste is None or y_teste is None:
+        print("Erro: Não há modelo treinado ou dados de teste para avaliar.")
+        return None, None
+    if eh_fluxo(X_teste):
+        return _avaliar_modelo_em_blocos(modelo, X_teste, y_teste, mostrar_grafico, caminho_saida=caminho_saida)
+    if min(X_teste.shape) == 0 or len(y_teste) == 0:
+        print("Erro: Os dados para testar o modelo estão vazios.")
+        return None, None
+
+    print("\n--- Verificando o quão bem o modelo prevê resultados novos ---")
+    try:
+        from sklearn.metrics import mean_absolute_error, r2_score
+        y_pred = modelo.predict(X_teste)
+
+        mae = mean_absolute_error(y_teste, y_pred)
+        r2 = r2_score(y_teste, y_pred)
+
+        # Mensagens mais amigáveis
+        print(f"A diferença média entre o que o modelo previu e o valor real foi de: {mae:.2f}")
+        print(f"O modelo conseguiu explicar {r2*100:.2f}% da variação nos dados. Quanto mais perto de 100%, melhor!")
+        if not mostrar_grafico:
+            return mae, r2
+
+        plotar_reais_vs_previstos(y_teste, y_pred, caminho_saida=caminho_saida)
+
+        return mae, r2
+    except Exception as e:
+        print(f"Ocorreu um problema ao avaliar o modelo. Detalhes: {e}")
+        return None, None
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Dados divididos em vários arquivos (ex.: um CSV por dia) processados em paralelo.
+
+Os arquivos de uma pasta ou padrão ('dados/2024-*.csv') são cortados em
+faixas de bytes, distribuídas entre processos. Cada processo devolve só
+resumos da sua faixa, que depois são combinados em um resultado único:
+
+    - perfil (PerfilDados): contagens, momentos, quantis, distintos e frequentes;
+    - vocabulários: as categorias vistas em cada coluna categórica;
+    - estatísticas suficientes da regressão (EstatisticasSuficientes).
+
+Com isso o tempo cai com o número de núcleos, e nenhum processo guarda mais
+que uma faixa de um arquivo em memória.
+"""
+import os
+import time
+
+from .carregamento import dividir_particoes_em_faixas, inferir_esquema, ler_faixa, listar_particoes
+from .instrumentacao import instrumentar
+from .modelagem import treinar_regressao_fora_da_memoria
+from .perfil import PerfilDados
+from .preprocessamento import PreProcessador
+
+
+def _resumir_faixa(tarefa):
+    """Executada em cada processo: perfil e vocabulários de uma faixa de um dos arquivos."""
+    arquivo, inicio, fim, colunas, esquema, tamanho_chunk, colunas_categoricas, n_extremos = tarefa
+    perfil = PerfilDados(n_extremos)
+    vocabularios = {coluna: set() for coluna in colunas_categoricas if coluna in colunas}
+    for bloco in ler_faixa(arquivo, inicio, fim, colunas, esquema, tamanho_chunk):
+        perfil.atualizar(bloco)
+        for coluna, vocabulario in vocabularios.items():
+            vocabulario.update(bloco[coluna].dropna().astype(str).unique())
+    return perfil, vocabularios
+
+
+def _resumir_particoes(caminho, colunas_categoricas, n_processos, tamanho_chunk, tamanho_faixa, n_extremos):
+    """Combina os resumos de todas as faixas. Retorna (arquivos, colunas, perfil, vocabulários, processos)."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    arquivos = listar_particoes(caminho)
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum arquivo CSV foi encontrado em: {caminho}")
+    colunas, faixas = dividir_particoes_em_faixas(arquivos, tamanho_faixa)
+    # O mesmo esquema para todas as faixas, para os perfis parciais terem os mesmos tipos
+    esquema = inferir_esquema(arquivos[0])
+    tarefas = [(arquivo, inicio, fim, colunas, esquema, tamanho_chunk, list(colunas_categoricas), n_extremos)
+               for arquivo, inicio, fim in faixas]
+    n_processos = min(n_processos or os.cpu_count() or 1, max(len(tarefas), 1))
+
+    perfil = PerfilDados(n_extremos)
+    vocabularios = {coluna: set() for coluna in colunas_categoricas if coluna in colunas}
+    if n_processos == 1:
+        partes = map(_resumir_faixa, tarefas)
+    else:
+        executor = ProcessPoolExecutor(max_workers=n_processos)
+        partes = executor.map(_resumir_faixa, tarefas)
+    try:
+        # Combinados na ordem dos arquivos, para o início e o fim do perfil serem os dos dados
+        for perfil_parcial, vocabularios_parciais in partes:
+            perfil.combinar(perfil_parcial)
+            for coluna, vocabulario in vocabularios_parciais.items():
+                vocabularios[coluna] |= vocabulario
+    finally:
+        if n_processos > 1:
+            executor.shutdown()
+    return arquivos, colunas, perfil, vocabularios, n_processos
+
+
+@instrumentar
+def perfilar_particoes(caminho, n_processos=None, tamanho_chunk=100_000, tamanho_faixa=64 * 1024 ** 2, n_extremos=5):
+    """Calcula o PerfilDados de todos os arquivos de uma pasta ou padrão, em paralelo.
+
+    O resultado é o mesmo de `perfilar_dados` com os arquivos lidos em sequência
+    (com quantis, distintos e frequentes igualmente aproximados).
+
+    Returns:
+        PerfilDados: O perfil combinado, ou None em caso de erro.
+    """
+    print(f"\n--- Analisando todas as colunas dos arquivos em {caminho}, em paralelo ---")
+    try:
+        inicio_tempo = time.perf_counter()
+        arquivos, _, perfil, _, n_processos = _resumir_particoes(caminho, (), n_processos, tamanho_chunk,
+                                                                 tamanho_faixa, n_extremos)
+    except Exception as e:
+        print(f"Ocorreu um problema ao analisar os arquivos. Detalhes: {e}")
+        return None
+    print(f"Análise concluída: {perfil.linhas} registros de {len(arquivos)} arquivo(s) e {len(perfil.colunas)} colunas "
+          f"examinados em {time.perf_counter() - inicio_tempo:.1f}s com {n_processos} processo(s).")
+    return perfil
+
+
+@instrumentar
+def processar_particoes(caminho, colunas_categoricas, coluna_target='target', metodo='onehot', alfa=0.0,
+                        n_processos=None, tamanho_chunk=100_000, tamanho_faixa=64 * 1024 ** 2):
+    """Perfil, pré-processamento e Regressão Linear de vários arquivos CSV, em paralelo.
+
+    São duas passadas pelas faixas dos arquivos, ambas divididas entre os
+    processos: a primeira calcula o perfil e os vocabulários das colunas
+    categóricas, combinados para ajustar o PreProcessador
+    (`ajustar_com_resumos`); a segunda acumula as estatísticas suficientes da
+    regressão (`treinar_regressao_fora_da_memoria`).
+
+    Args:
+        caminho (str): Pasta com os arquivos .csv ou padrão como 'dados/2024-*.csv'.
+            Todos os arquivos precisam ter as mesmas colunas.
+        colunas_categoricas (list): Colunas de texto a transformar em números.
+        metodo (str): 'label' ou 'onehot'.
+        alfa (float): Regularização ridge; 0 é a regressão comum.
+        n_processos (int): Processos de trabalho; None usa todos os núcleos.
+        tamanho_chunk (int): Linhas lidas de cada vez dentro de uma faixa.
+        tamanho_faixa (int): Bytes de arquivo entregues a cada processo por vez.
+
+    Returns:
+        dict: 'arquivos', 'linhas', 'perfil', 'preprocessador', 'modelo' e 'segundos',
+        ou None em caso de erro.
+    """
+    print(f"\n--- Processando os arquivos em {caminho}, em paralelo ---")
+    try:
+        inicio_tempo = time.perf_counter()
+        arquivos, colunas, perfil, vocabularios, n_processos = _resumir_particoes(
+            caminho, colunas_categoricas, n_processos, tamanho_chunk, tamanho_faixa, n_extremos=5)
+        print(f"Perfil e categorias de {perfil.linhas} registros em {len(arquivos)} arquivo(s) "
+              f"combinados em {time.perf_counter() - inicio_tempo:.1f}s.")
+        preprocessador = PreProcessador(colunas_categoricas, coluna_target, metodo=metodo)
+        preprocessador.ajustar_com_resumos(colunas, perfil, vocabularios)
+    except Exception as e:
+        print(f"Ocorreu um problema ao processar os arquivos. Detalhes: {e}")
+        return None
+
+    modelo = treinar_regressao_fora_da_memoria(caminho, preprocessador, alfa=alfa, n_processos=n_processos,
+                                               tamanho_chunk=tamanho_chunk, tamanho_faixa=tamanho_faixa)
+    if modelo is None:
+        return None
+    segundos = time.perf_counter() - inicio_tempo
+    print(f"{len(arquivos)} arquivo(s) processados em {segundos:.1f}s com {n_processos} processo(s).")
+    return {'arquivos': arquivos, 'linhas': perfil.linhas, 'perfil': perfil, 'preprocessador': preprocessador,
+            'modelo': modelo, 'segundos': segundos}
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""Perfil dos dados calculado em uma única passada.
+
+Cada estatística é guardada em um "resumo" que pode ser combinado com outro
+do mesmo tipo, de modo que blocos (ou processos) diferentes podem ser
+perfilados separadamente e juntados no final.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _hashes_dos_valores(valores):
+    """Hash de 64 bits de cada valor, estável entre blocos e processos."""
+    if pd.api.types.is_numeric_dtype(valores) and not pd.api.types.is_bool_dtype(valores):
+        return pd.util.hash_array(valores.to_numpy(dtype='float64'))
+    return pd.util.hash_array(valores.astype(str).to_numpy(dtype=object))
+
+
+class ResumoQuantis:
+    """Resumo de quantis no estilo t-digest.
+
+    Os valores viram centróides (média, peso) que são agrupados pela função de
+    escala do t-digest: centróides pequenos nas caudas e maiores no meio. O
+    agrupamento é feito de forma vetorizada com `np.add.reduceat`.
+    """
+
+    def __init__(self, compressao=200):
+        self.compressao = compressao
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype='float64')
+        if len(valores) == 0:
+            return self
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self._comprimir(np.concatenate([self.medias, valores]),
+                        np.concatenate([self.pesos, np.ones(len(valores))]))
+        return self
+
+    def combinar(self, outro):
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        self._comprimir(np.concatenate([self.medias, outro.medias]),
+                        np.concatenate([self.pesos, outro.pesos]))
+        return self
+
+    def _comprimir(self, medias, pesos):
+        ordem = np.argsort(medias, kind='mergesort')
+        medias, pesos = medias[ordem], pesos[ordem]
+        acumulado = np.cumsum(pesos)
+        q = (acumulado - pesos / 2) / acumulado[-1]
+        escala = self.compressao * (np.arcsin(2 * q - 1) / np.pi + 0.5)
+        grupos = np.floor(escala).astype(np.int64)
+        inicios = np.flatnonzero(np.r_[True, grupos[1:] != grupos[:-1]])
+        self.pesos = np.add.reduceat(pesos, inicios)
+        self.medias = np.add.reduceat(medias * pesos, inicios) / self.pesos
+
+    def quantil(self, q):
+        if len(self.pesos) == 0:
+            return np.nan
+        acumulado = np.cumsum(self.pesos)
+        total = acumulado[-1]
+        posicoes = np.concatenate([[0.0], acumulado - self.pesos / 2, [total]])
+        valores = np.concatenate([[self.minimo], self.medias, [self.maximo]])
+        return float(np.interp(q * total, posicoes, valores))
+
+
+class ResumoDistintos:
+    """Contagem aproximada de valores distintos (HyperLogLog).
+
+    Com precisao=14 usa 16 KB por coluna e o erro típico fica perto de 1%.
+    """
+
+    def __init__(self, precisao=14):
+        self.precisao = precisao
+        self.registros = np.zeros(2 ** precisao, dtype=np.uint8)
+
+    def atualizar(self, hashes):
+        if len(hashes) == 0:
+            return self
+        p = np.uint64(self.precisao)
+        indices = (hashes >> np.uint64(64 - self.precisao)).astype(np.int64)
+        # O bit extra garante resto diferente de zero (posto máximo 64 - p + 1)
+        resto = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        expoentes = np.frexp(resto.astype('float64'))[1]
+        postos = (65 - expoentes).astype(np.uint8)
+        np.maximum.at(self.registros, indices, postos)
+        return self
+
+    def combinar(self, outro):
+        np.maximum(self.registros, outro.registros, out=self.registros)
+        return self
+
+    def estimativa(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimado = alfa * m * m / np.sum(np.ldexp(1.0, -self.registros.astype(np.int64)))
+        vazios = np.count_nonzero(self.registros == 0)
+        if estimado <= 2.5 * m and vazios:
+            estimado = m * np.log(m / vazios)
+        return int(round(estimado))
+
+
+class ResumoFrequentes:
+    """Frequências aproximadas (count-min sketch) e os k valores mais comuns.
+
+    Os candidatos a mais frequentes são reavaliados pelo sketch a cada bloco,
+    então um valor que é comum no total mas raro em cada bloco não se perde.
+    """
+
+    def __init__(self, k=20, largura=2048, profundidade=4):
+        self.k = k
+        self.largura = largura
+        self.tabela = np.zeros((profundidade, largura), dtype=np.int64)
+        self.candidatos = {}
+
+    def _posicoes(self, hashes):
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = hashes >> np.uint64(32)
+        linhas = np.arange(self.tabela.shape[0], dtype=np.uint64)[:, None]
+        return ((h1 + linhas * h2) % np.uint64(self.largura)).astype(np.int64)
+
+    def _estimar(self, hashes):
+        posicoes = self._posicoes(hashes)
+        return self.tabela[np.arange(self.tabela.shape[0])[:, None], posicoes].min(axis=0)
+
+    def atualizar(self, valores):
+        contagem = valores.value_counts()
+        if contagem.empty:
+            return self
+        hashes = _hashes_dos_valores(contagem.index.to_series())
+        posicoes = self._posicoes(hashes)
+        for linha in range(self.tabela.shape[0]):
+            np.add.at(self.tabela[linha], posicoes[linha], contagem.to_numpy(dtype=np.int64))
+        self._selecionar(dict(zip(contagem.index, hashes)))
+        return self
+
+    def combinar(self, outro):
+        self.tabela += outro.tabela
+        self._selecionar(outro.candidatos)
+        return self
+
+    def _selecionar(self, novos):
+        candidatos = {**self.candidatos, **novos}
+        valores = list(candidatos)
+        estimativas = self._estimar(np.fromiter(candidatos.values(), dtype=np.uint64, count=len(valores)))
+        melhores = np.argsort(-estimativas, kind='stable')[:self.k]
+        self.candidatos = {valores[i]: candidatos[valores[i]] for i in melhores}
+
+    def mais_frequentes(self):
+        valores = list(self.candidatos)
+        if not valores:
+            return pd.Series(dtype='int64')
+        estimativas = self._estimar(np.fromiter(self.candidatos.values(), dtype=np.uint64, count=len(valores)))
+        return pd.Series(estimativas, index=valores).sort_values(ascending=False, kind='stable')
+
+
+class PerfilColuna:
+    """Estatísticas combináveis de uma coluna: contagens, momentos e resumos.
+
+    Colunas numéricas só guardam os valores mais frequentes com
+    `com_frequentes=True`, pois isso custa bem mais que os outros resumos.
+    """
+
+    def __init__(self, numerica, com_frequentes=False):
+        self.numerica = numerica
+        self.contagem = 0
+        self.nulos = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.soma = 0.0
+        self.quantis = ResumoQuantis() if numerica else None
+        self.frequentes = ResumoFrequentes() if com_frequentes or not numerica else None
+        self.distintos = ResumoDistintos()
+
+    def atualizar(self, serie):
+        valores = serie.dropna()
+        self.nulos += len(serie) - len(valores)
+        if len(valores) == 0:
+            return self
+        parcial = PerfilColuna(self.numerica)
+        parcial.contagem = len(valores)
+        if self.numerica:
+            numeros = valores.to_numpy(dtype='float64')
+            parcial.soma = float(numeros.sum())
+            parcial.media = parcial.soma / len(numeros)
+            parcial.m2 = float(((numeros - parcial.media) ** 2).sum())
+            self.quantis.atualizar(numeros)
+        if self.frequentes is not None:
+            self.frequentes.atualizar(valores)
+        self.distintos.atualizar(_hashes_dos_valores(valores))
+        self._combinar_momentos(parcial)
+        return self
+
+    def _combinar_momentos(self, outro):
+        # Fórmula de Chan: junta médias e variâncias parciais sem rever os dados
+        total = self.contagem + outro.contagem
+        if total == 0:
+            return
+        delta = outro.media - self.media
+        self.m2 += outro.m2 + delta ** 2 * self.contagem * outro.contagem / total
+        self.media += delta * outro.contagem / total
+        self.soma += outro.soma
+        self.contagem = total
+
+    def combinar(self, outro):
+        self.nulos += outro.nulos
+        self._combinar_momentos(outro)
+        if self.numerica:
+            self.quantis.combinar(outro.quantis)
+        if self.frequentes is not None and outro.frequentes is not None:
+            self.frequentes.combinar(outro.frequentes)
+        else:
+            self.frequentes = None
+        self.distintos.combinar(outro.distintos)
+        return self
+
+    @property
+    def desvio_padrao(self):
+        return np.sqrt(self.m2 / (self.contagem - 1)) if self.contagem > 1 else np.nan
+
+
+class PerfilDados:
+    """Perfil de um DataFrame (ou de um fluxo em blocos) calculado em uma passada.
+
+    Reúne o que antes exigia uma varredura por função: tipos, contagens de não
+    nulos e de ausentes, média, desvio padrão, mínimo, máximo, quantis
+    aproximados, número aproximado de valores distintos e os valores mais
+    frequentes das colunas de texto. Também guarda as primeiras e últimas
+    linhas. `combinar` junta perfis de partes consecutivas dos dados.
+
+    Com `frequentes_numericas=True`, os valores mais frequentes também são
+    guardados para as colunas numéricas (necessários para preencher ausentes
+    numéricos com 'most_frequent').
+    """
+
+    def __init__(self, n_extremos=5, frequentes_numericas=False):
+        self.n_extremos = n_extremos
+        self.frequentes_numericas = frequentes_numericas
+        self.linhas = 0
+        self.tipos = None
+        self.colunas = {}
+        self.inicio = None
+        self.fim = None
+
+    def atualizar(self, bloco):
+        if self.tipos is None:
+            self.tipos = bloco.dtypes
+        for coluna in bloco.columns:
+            if coluna not in self.colunas:
+                serie = bloco[coluna]
+                numerica = pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+                self.colunas[coluna] = PerfilColuna(numerica, self.frequentes_numericas)
+            self.colunas[coluna].atualizar(bloco[coluna])
+        self.linhas += len(bloco)
+        # Só as n primeiras/últimas linhas do bloco entram na concatenação, nunca o bloco inteiro
+        if self.inicio is None or len(self.inicio) < self.n_extremos:
+            inicio = bloco.head(self.n_extremos)
+            self.inicio = inicio if self.inicio is None else pd.concat([self.inicio, inicio]).head(self.n_extremos)
+        fim = bloco.tail(self.n_extremos)
+        self.fim = fim if self.fim is None else pd.concat([self.fim, fim]).tail(self.n_extremos)
+        return self
+
+    def combinar(self, outro):
+        """Junta o perfil de `outro`, que deve vir logo depois destes dados.
+
+        Cada parte (ex.: uma faixa de bytes de um arquivo) numera as suas linhas
+        a partir de 0, então o início e o fim combinados são renumerados pela
+        posição nos dados inteiros, como nas linhas lidas em blocos.
+        """
+        self.frequentes_numericas = self.frequentes_numericas and outro.frequentes_numericas
+        for coluna, perfil in outro.colunas.items():
+            if coluna in self.colunas:
+                self.colunas[coluna].combinar(perfil)
+            else:
+                self.colunas[coluna] = perfil
+        self.linhas += outro.linhas
+        self.tipos = self.tipos if self.tipos is not None else outro.tipos
+        if outro.inicio is not None:
+            self.inicio = outro.inicio if self.inicio is None else pd.concat([self.inicio, outro.inicio]).head(self.n_extremos)
+            self.fim = outro.fim if self.fim is None else pd.concat([self.fim, outro.fim]).tail(self.n_extremos)
+            self.inicio = self.inicio.set_axis(pd.RangeIndex(len(self.inicio)))
+            self.fim = self.fim.set_axis(pd.RangeIndex(self.linhas - len(self.fim), self.linhas))
+        return self
+
+    def estatisticas_descritivas(self):
+        """Tabela no formato de `describe()`, com quartis aproximados."""
+        resumo = {}
+        for nome, coluna in self.colunas.items():
+            if not coluna.numerica:
+                continue
+            vazia = coluna.contagem == 0
+            resumo[nome] = {
+                'count': coluna.contagem,
+                'mean': np.nan if vazia else coluna.media,
+                'std': coluna.desvio_padrao,
+                'min': np.nan if vazia else coluna.quantis.minimo,
+                '25%': coluna.quantis.quantil(0.25),
+                '50%': coluna.quantis.quantil(0.50),
+                '75%': coluna.quantis.quantil(0.75),
+                'max': np.nan if vazia else coluna.quantis.maximo,
+            }
+        return pd.DataFrame(resumo)
+
+    def valores_ausentes(self):
+        return pd.Series({nome: coluna.nulos for nome, coluna in self.colunas.items()}, dtype='int64')
+
+    def nao_nulos(self):
+        return pd.Series({nome: coluna.contagem for nome, coluna in self.colunas.items()}, dtype='int64')
+
+    def distintos(self):
+        return pd.Series({nome: coluna.distintos.estimativa() for nome, coluna in self.colunas.items()}, dtype='int64')
+
+    def valores_mais_frequentes(self, coluna):
+        """Contagens aproximadas dos valores mais comuns, com os ausentes como NaN."""
+        perfil = self.colunas[coluna]
+        contagem = perfil.frequentes.mais_frequentes() if perfil.frequentes is not None else pd.Series(dtype='int64')
+        if perfil.nulos:
+            contagem = pd.concat([contagem, pd.Series([perfil.nulos], index=[np.nan])])
+        return contagem.sort_values(ascending=False, kind='stable')
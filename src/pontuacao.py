@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Pontuação em lote: aplica um modelo salvo a arquivos inteiros de novos registros.
+
+O arquivo de entrada é dividido em faixas de bytes, pontuadas por vários
+processos ao mesmo tempo. As previsões são gravadas na mesma ordem das
+linhas de entrada, e só algumas faixas ficam em memória de cada vez.
+"""
+import collections
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import dividir_arquivo_em_faixas, eh_comprimido, inferir_esquema, ler_faixa
+from .instrumentacao import instrumentar
+from .modelagem import carregar_modelo
+
+# Faixas menores que isso custam mais para distribuir entre processos do que para pontuar
+TAMANHO_MINIMO_FAIXA = 256 * 1024
+
+
+def _pontuar_faixa(tarefa):
+    """Executada em cada processo: pontua uma faixa e devolve o trecho do CSV de saída já formatado."""
+    (caminho_entrada, inicio, fim, colunas, esquema, tamanho_chunk,
+     preprocessador, coeficientes, intercepto, colunas_copiadas, coluna_previsao) = tarefa
+    partes, linhas = [], 0
+    for bloco in ler_faixa(caminho_entrada, inicio, fim, colunas, esquema, tamanho_chunk):
+        # Produto direto com os coeficientes: não precisa importar o scikit-learn em cada processo
+        previsoes = preprocessador.transformar_matriz(bloco) @ coeficientes + intercepto
+        saida = bloco[colunas_copiadas].copy()
+        saida[coluna_previsao] = previsoes
+        partes.append(saida.to_csv(header=False, index=False))
+        linhas += len(bloco)
+    return ''.join(partes), linhas
+
+
+@instrumentar
+def pontuar_arquivo(caminho_entrada, caminho_modelo, caminho_saida, colunas_copiadas=('id',),
+                    coluna_previsao='previsao', n_processos=None, tamanho_chunk=100_000,
+                    tamanho_faixa=16 * 1024 ** 2):
+    """Calcula as previsões de um modelo salvo para todas as linhas de um CSV.
+
+    Args:
+        caminho_entrada (str): CSV com as mesmas colunas usadas no treino (a coluna alvo é opcional).
+        caminho_modelo (str): Arquivo criado por `salvar_modelo` (modelo e pré-processamento).
+        caminho_saida (str): CSV de saída, com `colunas_copiadas` (as que existirem na
+            entrada, ex.: o identificador do cliente) e a coluna `coluna_previsao`.
+        n_processos (int): Processos de trabalho; None usa todos os núcleos e 1 roda
+            tudo no processo atual.
+        tamanho_chunk (int): Linhas lidas de cada vez dentro de uma faixa.
+        tamanho_faixa (int): Bytes do arquivo de entrada entregues a cada processo por vez.
+            Em arquivos menores que `n_processos` faixas, as faixas encolhem (até 256 KB)
+            para que todos os processos recebam uma parte.
+
+    Returns:
+        dict: Linhas pontuadas, segundos e linhas por segundo, ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    modelo, preprocessador = carregar_modelo(caminho_modelo)
+    if modelo is None:
+        return None
+    if not os.path.exists(caminho_entrada):
+        print(f"Erro: O arquivo não foi encontrado em: {caminho_entrada}")
+        return None
+
+    print(f"\n--- Calculando as previsões para os registros de {caminho_entrada} ---")
+    try:
+        inicio_tempo = time.perf_counter()
+        pedidos = n_processos or os.cpu_count() or 1
+        if not eh_comprimido(caminho_entrada):
+            por_processo = -(-os.path.getsize(caminho_entrada) // pedidos)
+            tamanho_faixa = max(min(tamanho_faixa, por_processo), TAMANHO_MINIMO_FAIXA)
+        colunas, faixas = dividir_arquivo_em_faixas(caminho_entrada, tamanho_faixa)
+        faltando = [c for c in preprocessador.colunas_numericas + list(preprocessador.vocabularios) if c not in colunas]
+        if faltando:
+            print(f"Erro: O arquivo não tem as colunas que o modelo usa: {', '.join(faltando)}")
+            return None
+        copiadas = [c for c in colunas_copiadas if c in colunas]
+        esquema = inferir_esquema(caminho_entrada)
+        for coluna in copiadas:
+            # Identificadores são copiados como texto, exatamente como estão na entrada
+            if coluna not in preprocessador.colunas_numericas:
+                esquema[coluna] = 'str'
+        coeficientes = np.asarray(modelo.coef_, dtype='float64')
+        tarefas = [(caminho_entrada, inicio, fim, colunas, esquema, tamanho_chunk, preprocessador,
+                    coeficientes, modelo.intercept_, copiadas, coluna_previsao) for inicio, fim in faixas]
+        if n_processos and len(tarefas) < n_processos:
+            motivo = ("arquivos compactados são lidos do começo ao fim" if eh_comprimido(caminho_entrada)
+                      else "o arquivo é pequeno demais para ser dividido")
+            print(f"Aviso: Foram pedidos {n_processos} processos, mas {motivo}: serão usados "
+                  f"{max(len(tarefas), 1)} processo(s).")
+        n_processos = min(pedidos, max(len(tarefas), 1))
+
+        linhas = 0
+        with open(caminho_saida, 'w', encoding='utf-8', newline='') as saida:
+            saida.write(pd.DataFrame(columns=copiadas + [coluna_previsao]).to_csv(index=False))
+            if n_processos == 1:
+                for texto, n in map(_pontuar_faixa, tarefas):
+                    saida.write(texto)
+                    linhas += n
+            else:
+                with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                    # Poucas faixas em andamento por vez: a memória não cresce com o tamanho do
+                    # arquivo, e a saída é gravada na ordem da entrada
+                    pendentes = collections.deque()
+                    for tarefa in tarefas:
+                        pendentes.append(executor.submit(_pontuar_faixa, tarefa))
+                        if len(pendentes) >= 2 * n_processos:
+                            texto, n = pendentes.popleft().result()
+                            saida.write(texto)
+                            linhas += n
+                    while pendentes:
+                        texto, n = pendentes.popleft().result()
+                        saida.write(texto)
+                        linhas += n
+
+        segundos = time.perf_counter() - inicio_tempo
+        linhas_por_segundo = linhas / segundos if segundos > 0 else float('inf')
+        print(f"{linhas} registros pontuados em {segundos:.1f}s ({linhas_por_segundo:,.0f} registros por segundo, "
+              f"{n_processos} processo(s)).")
+        print(f"Previsões salvas em: {caminho_saida}")
+        return {'linhas': linhas, 'segundos': segundos, 'linhas_por_segundo': linhas_por_segundo,
+                'caminho_saida': caminho_saida}
+    except Exception as e:
+        print(f"Ocorreu um problema ao calcular as previsões. Detalhes: {e}")
+        return None
@@ -0,0 +1,769 @@
+# -*- coding: utf-8 -*-
+"""Funções para Pré-processamento: ausentes, codificação e divisão treino/teste.
+
+O Scikit-learn só é importado dentro das funções que o utilizam.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .eda import perfilar_dados
+from .instrumentacao import instrumentar
+from .perfil import PerfilDados
+
+# Linhas copiadas de cada vez ao percorrer uma MatrizModelo (ou um arquivo mapeado dela) em lotes
+LINHAS_POR_LOTE = 100_000
+
+
+@instrumentar
+def tratar_valores_ausentes(df, estrategia_num= 'median', estrategia_cat='most_frequent', perfil=None, inplace=False):
+    """Trata valores ausentes usando SimpleImputer.
+
+    No modo em blocos, os valores de preenchimento vêm do `perfil` já
+    calculado na EDA (ou de um novo, se nenhum for informado).
+
+    Com `inplace=True`, o próprio `df` é alterado (sem a cópia inicial) e cada
+    coluna é preenchida separadamente, com os mesmos valores do SimpleImputer.
+    """
+    if df is None:
+        print("Não foi possível preencher os dados faltando, pois os dados não foram carregados.")
+        return None
+    if eh_fluxo(df):
+        return _tratar_valores_ausentes_em_blocos(df, estrategia_num, estrategia_cat, perfil)
+
+    df_tratado = df if inplace else df.copy()
+    colunas_com_ausentes = df_tratado.columns[df_tratado.isnull().any()].tolist()
+
+    if not colunas_com_ausentes:
+        print("Não há informações faltando para preencher.")
+        return df_tratado
+
+    print(f"\n--- Preenchendo as informações que estão faltando em {len(colunas_com_ausentes)} colunas ---")
+
+    # Sem nenhum valor observado não há média, mediana ou moda: a coluna fica como está
+    colunas_vazias = [c for c in colunas_com_ausentes if df_tratado[c].isnull().all()]
+    if colunas_vazias:
+        print(f"Atenção: {len(colunas_vazias)} coluna(s) sem nenhum valor preenchido não puderam ser completadas: "
+              f"{', '.join(colunas_vazias)}.")
+    colunas_a_preencher = [c for c in colunas_com_ausentes if c not in colunas_vazias]
+    colunas_num = df_tratado[colunas_a_preencher].select_dtypes(include=np.number).columns
+    colunas_cat = df_tratado[colunas_a_preencher].select_dtypes(exclude=np.number).columns
+
+    if inplace:
+        # Os mesmos valores que o SimpleImputer usaria, calculados coluna a coluna
+        try:
+            preenchimentos = {c: _valor_de_preenchimento(df_tratado[c].dropna(), estrategia_num, numerica=True)
+                              for c in colunas_num}
+            preenchimentos.update({c: _valor_de_preenchimento(df_tratado[c].dropna(), estrategia_cat, numerica=False)
+                                   for c in colunas_cat})
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return None
+        for coluna, preenchimento in preenchimentos.items():
+            valores = df_tratado[coluna]
+            if isinstance(valores.dtype, pd.CategoricalDtype) and preenchimento not in valores.cat.categories:
+                # Colunas 'category' (ex.: de `compactar_tipos`) só aceitam categorias já conhecidas
+                valores = valores.cat.add_categories([preenchimento])
+            df_tratado[coluna] = valores.fillna(preenchimento)
+        print("Informações faltando preenchidas diretamente nos dados, coluna por coluna, sem criar uma cópia.")
+    elif not colunas_num.empty or not colunas_cat.empty:
+        from sklearn.impute import SimpleImputer
+
+        if not colunas_num.empty:
+            imputer_num = SimpleImputer(strategy=estrategia_num)
+            df_tratado[colunas_num] = imputer_num.fit_transform(df_tratado[colunas_num])
+            print(f"Informações numéricas faltando ({', '.join(colunas_num)}) foram preenchidas usando a {estrategia_num} dos valores existentes.")
+
+        if not colunas_cat.empty:
+            imputer_cat = SimpleImputer(strategy=estrategia_cat)
+            df_tratado[colunas_cat] = imputer_cat.fit_transform(df_tratado[colunas_cat])
+            print(f"Informações de texto faltando ({', '.join(colunas_cat)}) foram preenchidas com a opção mais comum.")
+
+    print("Preenchimento de informações faltando concluído.")
+    # Só as colunas que tinham ausentes precisam ser conferidas de novo
+    restantes = df_tratado[colunas_com_ausentes].isna().sum()
+    restantes = restantes[restantes > 0]
+    if restantes.empty:
+        print("Ótimo! Não foi encontrada nenhuma informação faltando (dados ausentes).")
+    else:
+        print("Ainda faltam informações nas seguintes colunas:")
+        print(restantes.to_string())
+    return df_tratado
+
+def _moda(contagem):
+    # Em caso de empate, o SimpleImputer escolhe o menor valor
+    return sorted(contagem[contagem == contagem.max()].index)[0]
+
+def _valor_de_preenchimento(valores, estrategia, numerica):
+    """Valor com que o SimpleImputer preencheria a coluna (`valores` já sem os ausentes, não vazio)."""
+    if estrategia == 'constant':
+        return 0 if numerica else 'missing_value'
+    if estrategia == 'most_frequent':
+        return _moda(valores.value_counts())
+    if numerica and estrategia == 'mean':
+        return valores.mean()
+    if numerica and estrategia == 'median':
+        return valores.median()
+    raise ValueError(f"A estratégia de preenchimento '{estrategia}' não é suportada para colunas "
+                     f"{'numéricas' if numerica else 'de texto'}.")
+
+def _perfil_serve_para(perfil, estrategia_num):
+    """Indica se o perfil tem o que é preciso para calcular os preenchimentos numéricos."""
+    return perfil is not None and (estrategia_num != 'most_frequent' or perfil.frequentes_numericas)
+
+def _preenchimento_pelo_perfil(perfil, colunas, estrategia_num, estrategia_cat):
+    """Valores de preenchimento de cada coluna, obtidos de um PerfilDados."""
+    valores_preenchimento = {}
+    for coluna in colunas:
+        resumo = perfil.colunas[coluna]
+        if resumo.numerica:
+            if estrategia_num == 'mean':
+                valores_preenchimento[coluna] = resumo.media if resumo.contagem else np.nan
+            elif estrategia_num == 'median':
+                valores_preenchimento[coluna] = resumo.quantis.quantil(0.5)
+            elif estrategia_num == 'most_frequent':
+                if resumo.frequentes is None:
+                    raise ValueError(f"O perfil não guardou os valores mais frequentes da coluna numérica '{coluna}'; "
+                                     "calcule-o com PerfilDados(frequentes_numericas=True).")
+                contagem = resumo.frequentes.mais_frequentes()
+                valores_preenchimento[coluna] = _moda(contagem) if not contagem.empty else np.nan
+            elif estrategia_num == 'constant':
+                valores_preenchimento[coluna] = 0
+            else:
+                raise ValueError(f"A estratégia de preenchimento '{estrategia_num}' não é suportada para colunas numéricas.")
+        else:
+            contagem = resumo.frequentes.mais_frequentes()
+            if estrategia_cat == 'most_frequent' and not contagem.empty:
+                valores_preenchimento[coluna] = _moda(contagem)
+            else:
+                valores_preenchimento[coluna] = 'missing_value'
+    return valores_preenchimento
+
+def _tratar_valores_ausentes_em_blocos(fluxo, estrategia_num, estrategia_cat, perfil=None):
+    """Versão em blocos de `tratar_valores_ausentes`.
+
+    Os valores de preenchimento vêm do perfil dos dados (média exata, mediana
+    e moda aproximadas) e o preenchimento em si é aplicado a cada bloco.
+    """
+    if not _perfil_serve_para(perfil, estrategia_num):
+        perfil = perfilar_dados(fluxo, frequentes_numericas=estrategia_num == 'most_frequent')
+    ausentes = perfil.valores_ausentes()
+    colunas_com_ausentes = ausentes[ausentes > 0].index.tolist()
+    if not colunas_com_ausentes:
+        print("Não há informações faltando para preencher.")
+        return fluxo
+
+    print(f"\n--- Preenchendo as informações que estão faltando em {len(colunas_com_ausentes)} colunas ---")
+    valores_preenchimento = _preenchimento_pelo_perfil(perfil, colunas_com_ausentes, estrategia_num, estrategia_cat)
+    colunas_num = [c for c in colunas_com_ausentes if perfil.colunas[c].numerica]
+    colunas_cat = [c for c in colunas_com_ausentes if not perfil.colunas[c].numerica]
+
+    if colunas_num:
+        print(f"Informações numéricas faltando ({', '.join(colunas_num)}) serão preenchidas usando a {estrategia_num} dos valores existentes.")
+    if colunas_cat:
+        print(f"Informações de texto faltando ({', '.join(colunas_cat)}) serão preenchidas com a opção mais comum.")
+    print("Preenchimento de informações faltando concluído (aplicado a cada bloco durante a leitura).")
+    return fluxo.mapear(lambda bloco: bloco.fillna(valores_preenchimento))
+
+def _codificar_em_blocos(fluxo, colunas_existentes, metodo):
+    """Versão em blocos de `codificar_variaveis_categoricas`.
+
+    O vocabulário de cada coluna é coletado em uma passada e fixado, para que
+    todos os blocos recebam exatamente as mesmas colunas codificadas.
+    """
+    vocabularios = {coluna: set() for coluna in colunas_existentes}
+    for bloco in fluxo:
+        for coluna in colunas_existentes:
+            valores = bloco[coluna].fillna('Desconhecido') if metodo == 'label' else bloco[coluna].dropna()
+            vocabularios[coluna].update(valores.astype(str).unique())
+    vocabularios = {coluna: sorted(valores) for coluna, valores in vocabularios.items()}
+
+    if metodo == 'label':
+        def transformar(bloco):
+            bloco = bloco.copy()
+            for coluna in colunas_existentes:
+                valores = bloco[coluna].fillna('Desconhecido').astype(str)
+                bloco[coluna] = pd.Categorical(valores, categories=vocabularios[coluna]).codes.astype('int64')
+            return bloco
+        for coluna in colunas_existentes:
+            print(f"Coluna  '{coluna}' transformada para números de 0 a X.")
+    else:
+        def transformar(bloco):
+            bloco = bloco.copy()
+            for coluna in colunas_existentes:
+                valores = bloco[coluna].where(bloco[coluna].isnull(), bloco[coluna].astype(str))
+                bloco[coluna] = pd.Categorical(valores, categories=vocabularios[coluna])
+            return pd.get_dummies(bloco, columns=colunas_existentes, drop_first=True, dummy_na=False)
+        print(f"Colunas {colunas_existentes} foram transformadas em várias novas colunas com 0s e 1s.")
+
+    print("Transformação de categorias concluída.")
+    return fluxo.mapear(transformar)
+
+class DadosEsparsos:
+    """Resultado das codificações 'esparso' e 'hashing'.
+
+    As colunas categóricas codificadas ficam em uma matriz esparsa CSR do SciPy
+    (`matriz`, com os nomes em `colunas_codificadas`) e as demais colunas seguem
+    no DataFrame `df`. `dividir_dados_treino_teste` junta as duas partes em uma
+    única matriz CSR, sem nunca criar a versão densa das categorias.
+    """
+
+    def __init__(self, df, matriz, colunas_codificadas):
+        self.df = df
+        self.matriz = matriz
+        self.colunas_codificadas = list(colunas_codificadas)
+
+    @property
+    def columns(self):
+        return self.df.columns
+
+    @property
+    def shape(self):
+        return (self.df.shape[0], self.df.shape[1] + self.matriz.shape[1])
+
+
+def _matriz_esparsa(linhas, colunas, valores, forma):
+    from scipy import sparse
+    # Entradas repetidas (colisões do hashing) são somadas na conversão para CSR
+    return sparse.coo_matrix((valores, (linhas, colunas)), shape=forma).tocsr()
+
+
+def _codificar_esparso(df, colunas_existentes):
+    """One-hot (drop_first, como o 'onehot') montado direto como CSR."""
+    linhas, colunas, nomes = [], [], []
+    for coluna in colunas_existentes:
+        valores = df[coluna]
+        categorias = sorted(valores.dropna().astype(str).unique())
+        codigos = pd.Categorical(valores.where(valores.isnull(), valores.astype(str)), categories=categorias).codes
+        presentes = np.flatnonzero(codigos >= 1)
+        linhas.append(presentes)
+        colunas.append(len(nomes) + codigos[presentes].astype(np.int64) - 1)
+        nomes += [f"{coluna}_{categoria}" for categoria in categorias[1:]]
+    linhas, colunas = np.concatenate(linhas), np.concatenate(colunas)
+    matriz = _matriz_esparsa(linhas, colunas, np.ones(len(linhas)), (len(df), len(nomes)))
+    return matriz, nomes
+
+
+def _codificar_hashing(df, colunas_existentes, n_colunas_hash):
+    """Truque do hashing: cada par coluna=valor vai para uma de `n_colunas_hash`
+    colunas, com sinal +1/-1 para que as colisões se cancelem em média."""
+    linhas, colunas, sinais = [], [], []
+    for coluna in colunas_existentes:
+        valores = df[coluna]
+        presentes = np.flatnonzero(valores.notnull().to_numpy())
+        textos = (coluna + '=' + valores.iloc[presentes].astype(str)).to_numpy(dtype=object)
+        hashes = pd.util.hash_array(textos)
+        linhas.append(presentes)
+        colunas.append((hashes % np.uint64(n_colunas_hash)).astype(np.int64))
+        sinais.append(np.where(hashes >> np.uint64(63), -1.0, 1.0))
+    matriz = _matriz_esparsa(np.concatenate(linhas), np.concatenate(colunas), np.concatenate(sinais),
+                             (len(df), n_colunas_hash))
+    return matriz, [f"hash_{i}" for i in range(n_colunas_hash)]
+
+
+@instrumentar
+def codificar_variaveis_categoricas(df, colunas_categoricas, metodo= 'onehot', n_colunas_hash=1024, inplace=False):
+    """Transforma colunas categóricas em números.
+
+    Métodos: 'label' (um número por categoria), 'onehot' (uma coluna de 0/1 por
+    categoria), 'esparso' (o mesmo one-hot, mas em uma matriz esparsa CSR) e
+    'hashing' (número fixo de `n_colunas_hash` colunas, também esparsas). Os
+    dois últimos servem para colunas com milhares de categorias e retornam um
+    DadosEsparsos.
+
+    Com `inplace=True`, o próprio `df` é alterado: as colunas originais saem
+    e as codificadas entram, sem copiar as demais colunas.
+    """
+    if df is None:
+        print("Não foi possível transformar as categorias, pois os dados não foram carregados.")
+        return None
+    if eh_fluxo(df):
+        print(f"\n--- Transformando categorias de texto em números (Método: {metodo}) ---")
+        colunas_existentes = [col for col in colunas_categoricas if col in df.colunas]
+        if not colunas_existentes:
+            print("Não foi encontrada as colunas de categorias que você pediu para transformar.")
+            return df
+        if metodo in ('esparso', 'hashing'):
+            print(f"Desculpe, o método '{metodo}' ainda não funciona com dados em blocos. Use 'label' ou 'onehot'.")
+            return df
+        if metodo not in ('label', 'onehot'):
+            print(f"Desculpe, o método de transformação '{metodo}' não é reconhecido. Use 'label' ou 'onehot'.")
+            return df
+        return _codificar_em_blocos(df, colunas_existentes, metodo)
+    df_codificado = df if inplace else df.copy()
+    print(f"\n--- Transformando categorias de texto em números (Método: {metodo}) ---")
+
+    colunas_existentes = [col for col in colunas_categoricas if col in df_codificado.columns]
+    if not colunas_existentes:
+        print("Não foi encontrada as colunas de categorias que você pediu para transformar.")
+        return df_codificado
+
+    if metodo =='label':
+        from sklearn.preprocessing import LabelEncoder
+        encoder = LabelEncoder()
+        for coluna in colunas_existentes:
+            if df_codificado[coluna].isnull().any():
+                df_codificado[coluna] = df_codificado[coluna].fillna('Desconhecido')
+            df_codificado[coluna] = encoder.fit_transform(df_codificado[coluna].astype(str))
+            print(f"Coluna  '{coluna}' transformada para números de 0 a X.")
+    elif metodo =='onehot' and inplace:
+        # Só as colunas categóricas passam pelo get_dummies; as novas colunas
+        # entram no final, na mesma ordem que o get_dummies do DataFrame inteiro
+        dummies = pd.get_dummies(df_codificado[colunas_existentes], drop_first=True, dummy_na=False)
+        df_codificado.drop(columns=colunas_existentes, inplace=True)
+        for coluna in dummies.columns:
+            df_codificado[coluna] = dummies[coluna]
+        print(f"Colunas {colunas_existentes} foram transformadas em várias novas colunas com 0s e 1s.")
+    elif metodo =='onehot':
+        df_codificado = pd.get_dummies(df_codificado, columns=colunas_existentes, drop_first=True, dummy_na=False)
+        print(f"Colunas {colunas_existentes} foram transformadas em várias novas colunas com 0s e 1s.")
+    elif metodo in ('esparso', 'hashing'):
+        if metodo == 'esparso':
+            matriz, nomes = _codificar_esparso(df_codificado, colunas_existentes)
+        else:
+            matriz, nomes = _codificar_hashing(df_codificado, colunas_existentes, n_colunas_hash)
+        if inplace:
+            df_codificado.drop(columns=colunas_existentes, inplace=True)
+        else:
+            df_codificado = df_codificado.drop(columns=colunas_existentes)
+        df_codificado = DadosEsparsos(df_codificado, matriz, nomes)
+        print(f"Colunas {colunas_existentes} foram transformadas em {len(nomes)} colunas esparsas "
+              f"({matriz.nnz} valores diferentes de zero guardados).")
+    else:
+        print(f"Desculpe, o método de transformação '{metodo}' não é reconhecido. Use 'label', 'onehot', 'esparso' ou 'hashing'.")
+        return df
+
+    print("Transformação de categorias concluída.")
+    return df_codificado
+
+@instrumentar
+def remover_colunas_nao_numericas_para_modelo(df, coluna_target, inplace=False):
+    """Remove as colunas de texto que não foram codificadas (exceto a alvo).
+
+    Com `inplace=True`, as colunas são removidas do próprio `df`, sem cópia.
+    """
+    if df is None:
+        return None
+    if isinstance(df, DadosEsparsos):
+        return DadosEsparsos(remover_colunas_nao_numericas_para_modelo(df.df, coluna_target, inplace),
+                             df.matriz, df.colunas_codificadas)
+
+    # No modo em blocos, os tipos das colunas vêm do primeiro bloco
+    df_limpo = df if eh_fluxo(df) or inplace else df.copy()
+    referencia = df.primeiro_bloco() if eh_fluxo(df) else df_limpo
+    colunas_para_remover = []
+
+    for col in referencia.columns:
+        if col != coluna_target and not pd.api.types.is_numeric_dtype(referencia[col]):
+            colunas_para_remover.append(col)
+
+    if colunas_para_remover:
+        print(f"\n--- Removendo colunas de texto que não servem para o modelo: {', '.join(colunas_para_remover)} ---")
+        if eh_fluxo(df):
+            df_limpo = df.mapear(lambda bloco: bloco.drop(columns=colunas_para_remover))
+        elif inplace:
+            df_limpo.drop(columns=colunas_para_remover, inplace=True)
+        else:
+            df_limpo = df_limpo.drop(columns=colunas_para_remover)
+        print("Colunas de texto indesejadas removidas antes de treinar o modelo.")
+    else:
+        print("\nTodas as colunas, exceto a alvo, já são numéricas ou foram transformadas. Ótimo!")
+
+    return df_limpo
+
+class MatrizModelo:
+    """Dados prontos para o modelo: uma matriz float64 contígua (`X`), o alvo (`y`)
+    e os nomes das colunas de `X`.
+
+    Se `random_state` não for None, as linhas já estão na ordem sorteada por
+    `train_test_split` com essa semente, então a divisão treino/teste vira
+    só um corte da matriz, sem cópia.
+    """
+
+    def __init__(self, X, y, colunas, random_state=None):
+        self.X = X
+        self.y = y
+        self.colunas = list(colunas)
+        self.random_state = random_state
+
+    @property
+    def columns(self):
+        return self.colunas
+
+    @property
+    def shape(self):
+        return self.X.shape
+
+    def salvar(self, pasta):
+        """Grava X e y como arquivos .npy em `pasta`, para serem abertos por outros processos com `abrir`."""
+        os.makedirs(pasta, exist_ok=True)
+        np.save(os.path.join(pasta, 'X.npy'), self.X)
+        np.save(os.path.join(pasta, 'y.npy'), self.y)
+        with open(os.path.join(pasta, 'colunas.json'), 'w', encoding='utf-8') as f:
+            json.dump({'colunas': self.colunas, 'random_state': self.random_state}, f, ensure_ascii=False)
+        return pasta
+
+    @classmethod
+    def abrir(cls, pasta, mmap_mode='r'):
+        """Abre uma matriz gravada por `salvar` mapeando os arquivos na memória, sem lê-los por inteiro.
+
+        Vários processos que abrem a mesma pasta compartilham as mesmas páginas
+        do arquivo em vez de receber cada um a sua cópia dos dados.
+        """
+        with open(os.path.join(pasta, 'colunas.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        X = np.load(os.path.join(pasta, 'X.npy'), mmap_mode=mmap_mode)
+        y = np.load(os.path.join(pasta, 'y.npy'), mmap_mode=mmap_mode)
+        return cls(X, y, meta['colunas'], meta['random_state'])
+
+    def linhas_treino_teste(self, test_size=0.3, random_state=42):
+        """Linhas de treino e de teste da divisão de `train_test_split` com essa semente.
+
+        Se as linhas já estão na ordem dessa semente, treino e teste são fatias
+        (a matriz é cortada sem cópia); senão, são os índices sorteados.
+
+        Returns:
+            tuple: (linhas de treino, linhas de teste)
+        """
+        n = self.X.shape[0]
+        if self.random_state == random_state:
+            # As linhas já estão na ordem sorteada: teste primeiro, treino depois
+            n_teste = int(np.ceil(test_size * n))
+            return slice(n_teste, n), slice(0, n_teste)
+        ordem, n_teste = _ordem_train_test_split(n, test_size, random_state)
+        return ordem[n_teste:], ordem[:n_teste]
+
+    def em_lotes(self, linhas=None, y=None):
+        """Percorre as linhas pedidas (todas, uma fatia ou índices) em lotes de (X, y).
+
+        Fatias viram visões da matriz, sem cópia; índices são ordenados e
+        copiados um lote de cada vez, para a memória não crescer com o número de
+        linhas quando a matriz está mapeada de um arquivo. `y` substitui o alvo
+        (ex.: uma das colunas quando há vários alvos).
+        """
+        y = self.y if y is None else y
+        if linhas is None or isinstance(linhas, slice):
+            inicio, fim, _ = (linhas or slice(None)).indices(len(y))
+            for posicao in range(inicio, fim, LINHAS_POR_LOTE):
+                final = min(posicao + LINHAS_POR_LOTE, fim)
+                yield self.X[posicao:final], y[posicao:final]
+            return
+        linhas = np.sort(linhas)
+        for posicao in range(0, len(linhas), LINHAS_POR_LOTE):
+            lote = linhas[posicao:posicao + LINHAS_POR_LOTE]
+            yield self.X[lote], y[lote]
+
+
+def _ordem_train_test_split(n, test_size, random_state):
+    """Ordem das linhas com o teste primeiro, igual à sorteada por train_test_split."""
+    n_teste = int(np.ceil(test_size * n))
+    return np.random.RandomState(random_state).permutation(n), n_teste
+
+
+@instrumentar
+def montar_matriz_modelo(df, coluna_target, random_state=None, test_size=0.3, liberar_colunas=False):
+    """Monta a matriz do modelo (float64, contígua por colunas) coluna por coluna.
+
+    A matriz é alocada uma única vez e cada coluna do DataFrame é copiada para
+    ela. Com `liberar_colunas=True`, cada coluna é apagada do `df` logo depois
+    de copiada, mas a memória só volta quando o bloco do pandas que a guarda
+    fica vazio (e o alocador a devolve ao sistema): colunas criadas uma a uma (ex.: as da codificação) têm cada uma
+    o seu bloco e são liberadas à medida que são copiadas, enquanto as colunas
+    numéricas lidas do CSV costumam dividir um mesmo bloco, liberado só depois
+    da última delas. O pico fica então perto da entrada mais a parte da matriz
+    já preenchida até o fim do maior bloco. Com `random_state`, as linhas já
+    saem na ordem da divisão treino/teste (veja MatrizModelo).
+
+    Com uma lista em `coluna_target` (vários alvos para comparar), nenhum dos
+    alvos entra em X e `y` vira uma matriz com uma coluna por alvo.
+
+    Returns:
+        MatrizModelo: ou None se ocorrer erro.
+    """
+    alvos = coluna_target if isinstance(coluna_target, list) else [coluna_target]
+    if df is None or not alvos or any(alvo not in df.columns for alvo in alvos):
+        print(f"Erro: Não foi possível montar a matriz do modelo. A coluna principal '{coluna_target}' não foi encontrada ou os dados estão vazios.")
+        return None
+
+    print("\n--- Montando a matriz de números que o modelo vai usar ---")
+    colunas = [c for c in df.columns if c not in alvos]
+    ordem = None
+    if random_state is not None:
+        ordem, _ = _ordem_train_test_split(len(df), test_size, random_state)
+
+    # O alvo é copiado antes, para que a sua coluna também possa ser apagada no caminho
+    y = df[coluna_target].to_numpy(dtype='float64', copy=True)
+    y = y if ordem is None else y[ordem]
+    # Com as colunas contíguas, preencher uma coluna só ocupa a memória dela (por
+    # linhas, a primeira coluna copiada já tocaria todas as páginas da matriz)
+    X = np.empty((len(df), len(colunas)), dtype='float64', order='F')
+    posicoes = {coluna: j for j, coluna in enumerate(colunas)}
+    for coluna in list(df.columns):
+        if coluna in posicoes:
+            valores = df[coluna].to_numpy(dtype='float64')
+            X[:, posicoes[coluna]] = valores if ordem is None else valores[ordem]
+        if liberar_colunas:
+            del df[coluna]
+    print(f"Matriz pronta: {X.shape[0]} linhas x {X.shape[1]} colunas ({X.nbytes / 1024 ** 2:.1f} MB).")
+    return MatrizModelo(X, y, colunas, random_state)
+
+
+@instrumentar
+def dividir_dados_treino_teste(df, coluna_target, test_size=0.3, random_state=42):
+    """Divide o DataFrame em conjuntos de treino e teste.
+
+    No modo em blocos, cada linha é sorteada para treino ou teste com uma
+    semente derivada de `random_state` e da posição do bloco, de modo que
+    todas as releituras do fluxo produzem a mesma divisão.
+    """
+    if eh_fluxo(df) and coluna_target in df.colunas:
+        return _dividir_em_blocos(df, coluna_target, test_size, random_state)
+    if isinstance(df, MatrizModelo):
+        return _dividir_matriz(df, test_size, random_state)
+    if df is None or eh_fluxo(df) or coluna_target not in df.columns:
+        print(f"Erro: Não foi possível dividir os dados. A coluna principal '{coluna_target}' não foi encontrada ou os dados estão vazios.")
+        return None, None, None, None
+
+    print("\n--- Separando os dados para 'aprender' e para 'testar' ---")
+    if isinstance(df, DadosEsparsos):
+        from scipy import sparse
+        # As colunas numéricas restantes entram na mesma matriz CSR das categorias
+        numericas = sparse.csr_matrix(df.df.drop(columns=coluna_target).to_numpy(dtype='float64'))
+        X = sparse.hstack([numericas, df.matriz], format='csr')
+        y = df.df[coluna_target]
+    else:
+        X = df.drop(coluna_target, axis=1) # O que o modelo vai aprender
+        y = df[coluna_target] # O que o modelo vai prever
+
+    if min(X.shape) == 0 or y.empty:
+        print("Erro: Os dados para aprender (X) ou o que deve ser previsto (y) ficaram vazios após a separação.")
+        return None, None, None, None
+
+    try:
+        from sklearn.model_selection import train_test_split
+        X_treino, X_teste, y_treino, y_teste = train_test_split(
+            X, y, test_size=test_size, random_state=random_state
+        )
+        print(f"Dados separados: {X_treino.shape[0]} amostras para o modelo aprender, e {X_teste.shape[0]} amostras para testá-lo.")
+        return X_treino, X_teste, y_treino, y_teste
+    except Exception as e:
+        print(f"Ocorreu um problema ao separar os dados para treino e teste: {e}")
+        return None, None, None, None
+
+def _dividir_matriz(matriz, test_size, random_state):
+    print("\n--- Separando os dados para 'aprender' e para 'testar' ---")
+    treino, teste = matriz.linhas_treino_teste(test_size, random_state)
+    X_treino, X_teste = matriz.X[treino], matriz.X[teste]
+    y_treino, y_teste = matriz.y[treino], matriz.y[teste]
+    print(f"Dados separados: {X_treino.shape[0]} amostras para o modelo aprender, e {X_teste.shape[0]} amostras para testá-lo.")
+    return X_treino, X_teste, y_treino, y_teste
+
+def _dividir_em_blocos(fluxo, coluna_target, test_size, random_state):
+    print("\n--- Separando os dados para 'aprender' e para 'testar' ---")
+
+    def mascara_teste(bloco):
+        inicio = int(bloco.index[0]) if len(bloco) else 0
+        rng = np.random.default_rng([random_state, inicio])
+        return rng.random(len(bloco)) < test_size
+
+    treino = fluxo.mapear(lambda bloco: bloco[~mascara_teste(bloco)])
+    teste = fluxo.mapear(lambda bloco: bloco[mascara_teste(bloco)])
+    X_treino = treino.mapear(lambda bloco: bloco.drop(columns=coluna_target))
+    y_treino = treino.mapear(lambda bloco: bloco[coluna_target])
+    X_teste = teste.mapear(lambda bloco: bloco.drop(columns=coluna_target))
+    y_teste = teste.mapear(lambda bloco: bloco[coluna_target])
+    print(f"Dados separados em blocos: cerca de {100 * (1 - test_size):.0f}% das amostras para o modelo aprender, e {100 * test_size:.0f}% para testá-lo.")
+    return X_treino, X_teste, y_treino, y_teste
+
+# ==============================================================================
+# Pré-processamento ajustado uma vez e reaplicado a novos dados
+# ==============================================================================
+class PreProcessador:
+    """Aprende o pré-processamento uma vez e o reaplica, sem reajuste, a novos lotes.
+
+    `ajustar` guarda os valores de preenchimento das colunas numéricas e de
+    texto e o vocabulário de cada coluna categórica. `transformar` produz sempre
+    as mesmas colunas, na mesma ordem, qualquer que seja o lote: categorias que
+    não aparecem no lote viram colunas de zeros e categorias novas (não vistas
+    no ajuste) ficam com zeros em todas as colunas da sua variável.
+
+    O resultado equivale a `tratar_valores_ausentes` -> `codificar_variaveis_categoricas`
+    -> `remover_colunas_nao_numericas_para_modelo`, e o objeto ajustado pode ser
+    salvo em um arquivo JSON pequeno com `salvar` e lido com `PreProcessador.carregar`.
+    """
+
+    def __init__(self, colunas_categoricas, coluna_target='target', colunas_remover=('id',),
+                 estrategia_num='median', estrategia_cat='most_frequent', metodo='onehot'):
+        if metodo not in ('label', 'onehot'):
+            raise ValueError(f"Método de transformação '{metodo}' não reconhecido. Use 'label' ou 'onehot'.")
+        self.colunas_categoricas = list(colunas_categoricas)
+        self.coluna_target = coluna_target
+        self.colunas_remover = list(colunas_remover)
+        self.estrategia_num = estrategia_num
+        self.estrategia_cat = estrategia_cat
+        self.metodo = metodo
+        self.colunas_numericas = None
+        self.valores_preenchimento = None
+        self.vocabularios = None
+        self.colunas_saida = None
+
+    @property
+    def ajustado(self):
+        return self.colunas_saida is not None
+
+    def ajustar(self, dados, perfil=None):
+        """Aprende preenchimentos e vocabulários de um DataFrame ou FluxoDeBlocos.
+
+        Com dados em blocos, os preenchimentos vêm do `perfil` (mediana e moda
+        aproximadas) e os vocabulários são coletados em uma passada.
+        """
+        if eh_fluxo(dados):
+            primeiro = dados.primeiro_bloco()
+            categoricas = [c for c in self.colunas_categoricas if c in primeiro.columns]
+            precisa_perfil = not _perfil_serve_para(perfil, self.estrategia_num)
+            if precisa_perfil:
+                perfil = PerfilDados(frequentes_numericas=self.estrategia_num == 'most_frequent')
+            vocabularios = {coluna: set() for coluna in categoricas}
+            for bloco in dados:
+                if precisa_perfil:
+                    perfil.atualizar(bloco)
+                for coluna in categoricas:
+                    vocabularios[coluna].update(bloco[coluna].dropna().astype(str).unique())
+            return self.ajustar_com_resumos(list(primeiro.columns), perfil, vocabularios)
+        else:
+            colunas = [c for c in dados.columns if c not in self.colunas_remover and c != self.coluna_target]
+            categoricas = [c for c in self.colunas_categoricas if c in colunas]
+            self.colunas_numericas = [c for c in colunas
+                                      if c not in categoricas and pd.api.types.is_numeric_dtype(dados[c])]
+            self.valores_preenchimento = {}
+            for coluna in self.colunas_numericas:
+                valores = dados[coluna].dropna().astype('float64')
+                if valores.empty:
+                    self.valores_preenchimento[coluna] = np.nan
+                else:
+                    self.valores_preenchimento[coluna] = float(
+                        _valor_de_preenchimento(valores, self.estrategia_num, numerica=True))
+            vocabularios = {}
+            for coluna in categoricas:
+                valores = dados[coluna].dropna().astype(str)
+                vocabularios[coluna] = set(valores.unique())
+                contagem = valores.value_counts()
+                usar_moda = self.estrategia_cat == 'most_frequent' and not contagem.empty
+                self.valores_preenchimento[coluna] = _moda(contagem) if usar_moda else 'missing_value'
+        return self._concluir_ajuste(colunas, categoricas, vocabularios)
+
+    def ajustar_com_resumos(self, colunas, perfil, vocabularios):
+        """Ajusta a partir de resumos já calculados, sem ler os dados de novo.
+
+        Serve para dados resumidos em partes (ex.: um arquivo por dia, cada um em
+        um processo) cujos resumos já foram combinados: os preenchimentos vêm do
+        `perfil` (mediana e moda aproximadas) e `vocabularios` traz o conjunto de
+        categorias de cada coluna categórica.
+
+        Args:
+            colunas (list): Colunas dos dados, na ordem do arquivo.
+            perfil (PerfilDados): Perfil de todos os dados.
+            vocabularios (dict): Coluna categórica -> conjunto das categorias vistas.
+        """
+        colunas = [c for c in colunas if c not in self.colunas_remover and c != self.coluna_target]
+        categoricas = [c for c in self.colunas_categoricas if c in colunas]
+        self.colunas_numericas = [c for c in colunas if c not in categoricas and perfil.colunas[c].numerica]
+        self.valores_preenchimento = _preenchimento_pelo_perfil(
+            perfil, self.colunas_numericas + categoricas, self.estrategia_num, self.estrategia_cat)
+        return self._concluir_ajuste(colunas, categoricas, {c: set(vocabularios.get(c, ())) for c in categoricas})
+
+    def _concluir_ajuste(self, colunas, categoricas, vocabularios):
+        self.vocabularios = {}
+        for coluna in categoricas:
+            vocabulario = vocabularios[coluna] | {str(self.valores_preenchimento[coluna])}
+            self.vocabularios[coluna] = sorted(vocabulario)
+        self.valores_preenchimento = {c: (float(v) if c in self.colunas_numericas else str(v))
+                                      for c, v in self.valores_preenchimento.items()}
+
+        if self.metodo == 'onehot':
+            # Mesma ordem de pd.get_dummies(drop_first=True): primeiro as colunas
+            # numéricas, depois as novas colunas de cada variável categórica
+            self.colunas_saida = list(self.colunas_numericas)
+            for coluna, vocabulario in self.vocabularios.items():
+                self.colunas_saida += [f"{coluna}_{categoria}" for categoria in vocabulario[1:]]
+        else:
+            self.colunas_saida = [c for c in colunas if c in self.colunas_numericas or c in self.vocabularios]
+        print(f"Pré-processamento ajustado: {len(self.colunas_saida)} colunas de entrada para o modelo.")
+        return self
+
+    def transformar_matriz(self, df):
+        """Transforma um lote em uma matriz float64 contígua com as colunas de `colunas_saida`."""
+        if not self.ajustado:
+            raise RuntimeError("O pré-processamento precisa ser ajustado (ajustar) antes de transformar dados.")
+        faltando = [c for c in self.colunas_numericas + list(self.vocabularios) if c not in df.columns]
+        if faltando:
+            raise KeyError(f"Colunas ausentes no lote: {', '.join(faltando)}")
+
+        matriz = np.empty((len(df), len(self.colunas_saida)), dtype='float64')
+        posicao = {coluna: i for i, coluna in enumerate(self.colunas_saida)}
+        for coluna in self.colunas_numericas:
+            valores = df[coluna].to_numpy(dtype='float64', na_value=np.nan)
+            matriz[:, posicao[coluna]] = np.where(np.isnan(valores), self.valores_preenchimento[coluna], valores)
+        for coluna, vocabulario in self.vocabularios.items():
+            valores = df[coluna].fillna(self.valores_preenchimento[coluna]).astype(str)
+            codigos = pd.Categorical(valores, categories=vocabulario).codes
+            if self.metodo == 'label':
+                matriz[:, posicao[coluna]] = codigos
+                continue
+            inicio = posicao.get(f"{coluna}_{vocabulario[1]}") if len(vocabulario) > 1 else None
+            if inicio is None:
+                continue
+            bloco = matriz[:, inicio:inicio + len(vocabulario) - 1]
+            bloco[:] = 0.0
+            # A primeira categoria (código 0) é a referência e fica só com zeros
+            linhas = np.flatnonzero(codigos >= 1)
+            bloco[linhas, codigos[linhas] - 1] = 1.0
+        return matriz
+
+    def transformar(self, dados):
+        """Transforma um DataFrame (ou cada bloco de um fluxo) no layout fixo do modelo."""
+        if eh_fluxo(dados):
+            return dados.mapear(self.transformar)
+        X = pd.DataFrame(self.transformar_matriz(dados), columns=self.colunas_saida, index=dados.index, copy=False)
+        if self.coluna_target in dados.columns:
+            X[self.coluna_target] = dados[self.coluna_target].to_numpy()
+        return X
+
+    def para_dict(self):
+        return {
+            'versao': 1,
+            'colunas_categoricas': self.colunas_categoricas,
+            'coluna_target': self.coluna_target,
+            'colunas_remover': self.colunas_remover,
+            'estrategia_num': self.estrategia_num,
+            'estrategia_cat': self.estrategia_cat,
+            'metodo': self.metodo,
+            'colunas_numericas': self.colunas_numericas,
+            'valores_preenchimento': self.valores_preenchimento,
+            'vocabularios': self.vocabularios,
+            'colunas_saida': self.colunas_saida,
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        preprocessador = cls(dados['colunas_categoricas'], dados['coluna_target'], dados['colunas_remover'],
+                             dados['estrategia_num'], dados['estrategia_cat'], dados['metodo'])
+        preprocessador.colunas_numericas = dados['colunas_numericas']
+        preprocessador.valores_preenchimento = dados['valores_preenchimento']
+        preprocessador.vocabularios = dados['vocabularios']
+        preprocessador.colunas_saida = dados['colunas_saida']
+        return preprocessador
+
+    def salvar(self, caminho_arquivo):
+        """Salva o pré-processamento ajustado em um arquivo JSON."""
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False)
+        print(f"Pré-processamento salvo em: {caminho_arquivo}")
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            return cls.de_dict(json.load(f))
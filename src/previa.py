@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""Prévia rápida de arquivos CSV grandes, sem carregá-los inteiros.
+
+O início vem das primeiras linhas do arquivo e o fim é lido voltando a partir
+do último byte, então ver os primeiros e últimos registros de um arquivo de
+dezenas de GB leva o mesmo tempo que de um arquivo pequeno.
+
+O resumo numérico sai de uma amostra: em arquivos comuns, blocos de linhas
+seguidas começando em posições sorteadas (um sorteio em cada fatia igual do
+arquivo); em arquivos compactados, que não podem ser lidos a partir do meio,
+uma amostra aleatória simples (reservatório) em uma passada. As médias vêm com
+um intervalo de confiança calculado entre os blocos, já que linhas vizinhas
+costumam ser parecidas entre si. Assim como em `dividir_arquivo_em_faixas`,
+campos entre aspas com quebras de linha dentro não são suportados.
+"""
+import itertools
+import io
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_comprimido
+from .instrumentacao import instrumentar
+
+TAMANHO_PASSO_FIM = 64 * 1024
+
+
+def ler_inicio(caminho_arquivo, n=5):
+    """Primeiras `n` linhas do arquivo (só elas são lidas)."""
+    return pd.read_csv(caminho_arquivo, nrows=n)
+
+
+def ler_fim(caminho_arquivo, n=5, tamanho_passo=TAMANHO_PASSO_FIM):
+    """Últimas `n` linhas do arquivo, lidas voltando a partir do fim.
+
+    O índice conta a partir do fim (-n até -1), pois o total de linhas não é
+    conhecido. Arquivos compactados são percorridos até o fim, guardando só as
+    últimas linhas de cada bloco.
+    """
+    colunas = list(pd.read_csv(caminho_arquivo, nrows=0).columns)
+    if eh_comprimido(caminho_arquivo):
+        fim = pd.DataFrame(columns=colunas)
+        with pd.read_csv(caminho_arquivo, chunksize=max(n, 100_000)) as leitor:
+            for bloco in leitor:
+                fim = pd.concat([fim, bloco.tail(n)]).tail(n) if len(fim) else bloco.tail(n)
+    else:
+        with open(caminho_arquivo, 'rb') as f:
+            f.readline()
+            inicio_dados = f.tell()
+            posicao = f.seek(0, os.SEEK_END)
+            conteudo = b''
+            # Com n quebras de linha (sem contar a última) já há n linhas completas no trecho
+            while posicao > inicio_dados and conteudo.rstrip(b'\r\n').count(b'\n') < n:
+                passo = min(tamanho_passo, posicao - inicio_dados)
+                posicao -= passo
+                f.seek(posicao)
+                conteudo = f.read(passo) + conteudo
+        linhas = conteudo.rstrip(b'\r\n').split(b'\n')
+        if posicao > inicio_dados:
+            linhas = linhas[1:]  # A primeira pode ter começado antes do trecho lido
+        linhas = [linha for linha in linhas[-n:] if linha.strip()] if n > 0 else []
+        if not linhas:
+            return pd.DataFrame(columns=colunas)
+        fim = pd.read_csv(io.BytesIO(b'\n'.join(linhas)), header=None, names=colunas)
+    fim.index = range(-len(fim), 0)
+    return fim
+
+
+def _amostrar_blocos(caminho_arquivo, n_blocos, linhas_por_bloco, gerador):
+    """Blocos de linhas seguidas a partir de posições sorteadas, uma em cada fatia igual do arquivo.
+
+    Returns:
+        tuple: (amostra com a coluna '_bloco', linhas estimadas no arquivo, método)
+    """
+    colunas = list(pd.read_csv(caminho_arquivo, nrows=0).columns)
+    tamanho = os.path.getsize(caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as f:
+        f.readline()
+        inicio_dados = f.tell()
+        area = tamanho - inicio_dados
+        limites = inicio_dados + area * np.arange(n_blocos + 1) // n_blocos
+        pontos = limites[:-1] + (gerador.random(n_blocos) * np.diff(limites)).astype(np.int64)
+        trechos, bytes_lidos = [], 0
+        for ponto in pontos:
+            # Volta um byte para que uma linha que começa exatamente no ponto não seja descartada
+            f.seek(ponto - 1)
+            f.readline()
+            linhas = list(itertools.islice(f, linhas_por_bloco))
+            trechos.append(linhas)
+            bytes_lidos += sum(len(linha) for linha in linhas)
+            if len(trechos) == 1 and linhas and bytes_lidos * n_blocos >= area:
+                # A amostra cobriria o arquivo todo: é mais simples (e exato) lê-lo inteiro
+                amostra = pd.read_csv(caminho_arquivo)
+                amostra['_bloco'] = np.arange(len(amostra))
+                return amostra, len(amostra), 'completo'
+    blocos = []
+    for numero, linhas in enumerate(trechos):
+        if linhas:
+            bloco = pd.read_csv(io.BytesIO(b''.join(linhas)), header=None, names=colunas)
+            bloco['_bloco'] = numero
+            blocos.append(bloco)
+    amostra = pd.concat(blocos, ignore_index=True) if blocos else pd.DataFrame(columns=colunas + ['_bloco'])
+    linhas_estimadas = int(round(area * len(amostra) / bytes_lidos)) if bytes_lidos else 0
+    return amostra, linhas_estimadas, 'blocos'
+
+
+def _amostrar_reservatorio(caminho_arquivo, tamanho_amostra, gerador, tamanho_chunk=100_000):
+    """Amostra aleatória simples em uma passada: ficam as linhas com as menores chaves sorteadas.
+
+    Returns:
+        tuple: (amostra com a coluna '_bloco', total de linhas do arquivo, método)
+    """
+    amostra, chaves, total = None, None, 0
+    with pd.read_csv(caminho_arquivo, chunksize=tamanho_chunk) as leitor:
+        for bloco in leitor:
+            total += len(bloco)
+            novas = gerador.random(len(bloco))
+            if amostra is not None:
+                bloco = pd.concat([amostra, bloco], ignore_index=True)
+                novas = np.concatenate([chaves, novas])
+            manter = np.sort(np.argsort(novas, kind='stable')[:tamanho_amostra])
+            amostra, chaves = bloco.iloc[manter].reset_index(drop=True), novas[manter]
+    amostra['_bloco'] = np.arange(len(amostra))
+    return amostra, total, 'reservatorio'
+
+
+def _media_com_intervalo(somas, contagens, z):
+    """Média por estimador de razão entre blocos e seu intervalo (média ± z erros padrão).
+
+    Cada bloco contribui com a soma e a contagem dos seus valores; o erro padrão
+    vem da variação entre blocos, o que leva em conta a semelhança das linhas
+    vizinhas. Com blocos de uma linha, é o intervalo usual de uma amostra simples.
+    """
+    total = contagens.sum()
+    if total == 0:
+        return np.nan, np.nan, np.nan
+    media = somas.sum() / total
+    if len(somas) < 2:
+        return media, np.nan, np.nan
+    residuos = (somas - media * contagens) / (total / len(somas))
+    erro_padrao = np.sqrt(residuos.var(ddof=1) / len(somas))
+    return media, media - z * erro_padrao, media + z * erro_padrao
+
+
+@instrumentar
+def resumir_por_amostragem(caminho_arquivo, n_blocos=100, linhas_por_bloco=1000, confianca=0.95, semente=42):
+    """Resumo das colunas numéricas a partir de uma amostra do arquivo, com intervalos de confiança.
+
+    Em arquivos comuns, lê `n_blocos` blocos de `linhas_por_bloco` linhas
+    seguidas, espalhados pelo arquivo; em arquivos compactados, sorteia
+    `n_blocos * linhas_por_bloco` linhas em uma passada. Arquivos pequenos
+    demais para amostrar são lidos inteiros.
+
+    Returns:
+        dict: 'estatisticas' (tabela como a de `describe()`, com 'ic_inferior' e
+        'ic_superior' da média e 'ausentes_%'), 'amostra' (as linhas sorteadas),
+        'linhas_amostradas', 'blocos', 'linhas_estimadas' (total de linhas do
+        arquivo), 'metodo' e 'confianca'; ou None em caso de erro.
+    """
+    if not os.path.exists(caminho_arquivo):
+        print(f"Erro: O arquivo não foi encontrado em: {caminho_arquivo}")
+        return None
+    if not 0 < confianca < 1 or n_blocos < 1 or linhas_por_bloco < 1:
+        print("Erro: Use confiança entre 0 e 1 e pelo menos um bloco com uma linha.")
+        return None
+    try:
+        gerador = np.random.default_rng(semente)
+        if eh_comprimido(caminho_arquivo):
+            amostra, linhas_estimadas, metodo = _amostrar_reservatorio(
+                caminho_arquivo, n_blocos * linhas_por_bloco, gerador)
+        else:
+            amostra, linhas_estimadas, metodo = _amostrar_blocos(caminho_arquivo, n_blocos, linhas_por_bloco, gerador)
+    except Exception as e:
+        print(f"Ocorreu um problema ao amostrar o arquivo. Detalhes: {e}")
+        return None
+
+    z = NormalDist().inv_cdf(0.5 + confianca / 2)
+    blocos = amostra.pop('_bloco')
+    numericas = amostra.select_dtypes(include=np.number)
+    estatisticas = numericas.describe() if len(numericas) else pd.DataFrame(columns=numericas.columns)
+    if metodo == 'completo':
+        # Os dados todos foram lidos: a média é exata
+        intervalos = {coluna: (estatisticas.at['mean', coluna],) * 2 for coluna in numericas.columns}
+    else:
+        por_bloco = numericas.groupby(blocos.to_numpy())
+        somas, contagens = por_bloco.sum(), por_bloco.count()
+        intervalos = {coluna: _media_com_intervalo(somas[coluna].to_numpy(dtype='float64'),
+                                                   contagens[coluna].to_numpy(dtype='float64'), z)[1:]
+                      for coluna in numericas.columns}
+    estatisticas.loc['ic_inferior'] = {coluna: limites[0] for coluna, limites in intervalos.items()}
+    estatisticas.loc['ic_superior'] = {coluna: limites[1] for coluna, limites in intervalos.items()}
+    estatisticas.loc['ausentes_%'] = numericas.isnull().mean() * 100
+    ordem = ['count', 'mean', 'ic_inferior', 'ic_superior', 'std', 'min', '25%', '50%', '75%', 'max', 'ausentes_%']
+    return {
+        'estatisticas': estatisticas.reindex(ordem),
+        'amostra': amostra,
+        'linhas_amostradas': len(amostra),
+        'blocos': int(blocos.nunique()),
+        'linhas_estimadas': linhas_estimadas,
+        'metodo': metodo,
+        'confianca': confianca,
+    }
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Relatório da análise gerado sem tela: gráficos em arquivos, Markdown e PDF.
+
+Os gráficos são desenhados com o backend 'Agg' do Matplotlib (que não abre
+janelas), em vários processos, e cada um é guardado com uma chave calculada a
+partir dos dados que ele usa e dos seus parâmetros. Ao gerar o relatório de
+novo, só os gráficos cujos dados ou parâmetros mudaram são redesenhados.
+
+Uso, depois de rodar o fluxo:
+
+    resultados = executar_fluxo('data/raw/dados_exemplo_2.csv', mostrar_graficos=False)
+    gerar_relatorio(resultados, 'reports/analise')
+
+ou, pelo terminal, `python -m src relatorio data/raw/dados_exemplo_2.csv`.
+"""
+import datetime
+import glob
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo, iterar_em_pares
+from .instrumentacao import instrumentar
+from .modelagem import plotar_reais_vs_previstos
+from .visualizacao import plotar_grafico_barras, plotar_grafico_dispersao, plotar_histograma
+
+PASTA_RELATORIO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports', 'analise')
+# Mude quando o desenho dos gráficos mudar, para que o cache de figuras seja refeito
+VERSAO_FIGURAS = 1
+
+MESES = ('Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+         'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro')
+
+
+def _desenhar_reais_vs_previstos(df, caminho_saida=None):
+    plotar_reais_vs_previstos(df['real'], df['previsto'], caminho_saida=caminho_saida)
+
+
+GRAFICOS = {
+    'histograma': plotar_histograma,
+    'barras': plotar_grafico_barras,
+    'dispersao': plotar_grafico_dispersao,
+    'reais_vs_previstos': _desenhar_reais_vs_previstos,
+}
+
+
+def _hashes_das_colunas(dados, colunas):
+    """Hash do conteúdo de cada coluna (bloco a bloco, para dados em blocos)."""
+    resumos = {coluna: hashlib.sha256() for coluna in colunas}
+    for bloco in (dados if eh_fluxo(dados) else (dados,)):
+        for coluna in colunas:
+            resumos[coluna].update(pd.util.hash_pandas_object(bloco[coluna], index=False).to_numpy().tobytes())
+    return {coluna: resumo.hexdigest() for coluna, resumo in resumos.items()}
+
+
+def _chave_figura(tipo, parametros, hashes_colunas):
+    conteudo = json.dumps({'versao': VERSAO_FIGURAS, 'tipo': tipo, 'parametros': parametros,
+                           'colunas': hashes_colunas}, sort_keys=True)
+    return hashlib.sha256(conteudo.encode()).hexdigest()[:16]
+
+
+def _desenhar_figura(tarefa):
+    """Executada em cada processo: desenha um gráfico direto em arquivo, sem tela."""
+    tipo, dados, parametros, caminho_saida = tarefa
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    GRAFICOS[tipo](dados, caminho_saida=caminho_saida, **parametros)
+    return os.path.exists(caminho_saida)
+
+
+def _amostra_reais_e_previstos(modelo, X_teste, y_teste, max_pontos=5000):
+    """Até `max_pontos` pares (real, previsto) do conjunto de teste, para o gráfico do modelo."""
+    if eh_fluxo(X_teste):
+        reais, previstos, total = [], [], 0
+        for X_bloco, y_bloco in iterar_em_pares(X_teste, y_teste):
+            reais.append(y_bloco.to_numpy(dtype='float64')[:max_pontos - total])
+            previstos.append(modelo.predict(X_bloco.iloc[:max_pontos - total]))
+            total += len(reais[-1])
+            if total >= max_pontos:
+                break
+        return pd.DataFrame({'real': np.concatenate(reais), 'previsto': np.concatenate(previstos)})
+    n = X_teste.shape[0]
+    linhas = np.sort(np.random.default_rng(0).choice(n, max_pontos, replace=False)) if n > max_pontos else np.arange(n)
+    X_amostra = X_teste.iloc[linhas] if hasattr(X_teste, 'iloc') else X_teste[linhas]
+    y_amostra = y_teste.iloc[linhas] if hasattr(y_teste, 'iloc') else np.asarray(y_teste)[linhas]
+    return pd.DataFrame({'real': np.asarray(y_amostra, dtype='float64'), 'previsto': modelo.predict(X_amostra)})
+
+
+def _tabela_markdown(tabela):
+    linhas = ['| ' + ' | '.join([''] + [str(c) for c in tabela.columns]) + ' |',
+              '|' + '---|' * (len(tabela.columns) + 1)]
+    for indice, valores in tabela.iterrows():
+        linhas.append('| ' + ' | '.join([str(indice)] + [f"{v:.2f}" if isinstance(v, float) else str(v) for v in valores]) + ' |')
+    return '\n'.join(linhas)
+
+
+def _data_por_extenso(data):
+    return f"{data.day:02d} de {MESES[data.month - 1]} de {data.year}"
+
+
+def _estatisticas(resultados):
+    """As estatísticas exibidas na EDA (exatas com dados em memória) ou, sem elas, as do perfil."""
+    estatisticas = resultados.get('estatisticas')
+    return estatisticas if estatisticas is not None else resultados['perfil'].estatisticas_descritivas()
+
+
+def _escrever_markdown(caminho, resultados, caminho_csv, figuras):
+    perfil = resultados.get('perfil')
+    partes = ["# Relatório da Análise de Dados", "",
+              f"**Data:** {_data_por_extenso(datetime.date.today())}", ""]
+    if caminho_csv:
+        partes += [f"**Arquivo analisado:** `{caminho_csv}`", ""]
+    if perfil is not None:
+        ausentes = perfil.valores_ausentes()
+        partes += ["## 1. Visão Geral dos Dados", "",
+                   f"*   Registros: {perfil.linhas}",
+                   f"*   Colunas: {len(perfil.colunas)}",
+                   f"*   Valores ausentes: {int(ausentes.sum())}", "",
+                   "## 2. Estatísticas Descritivas", "",
+                   _tabela_markdown(_estatisticas(resultados).T), ""]
+        if ausentes.any():
+            partes += ["### Valores ausentes por coluna", "",
+                       _tabela_markdown(ausentes[ausentes > 0].to_frame('ausentes')), ""]
+    if figuras:
+        partes += ["## 3. Gráficos", ""]
+        for titulo, caminho_figura in figuras:
+            partes += [f"### {titulo}", "", f"![{titulo}]({os.path.relpath(caminho_figura, os.path.dirname(caminho))})", ""]
+    if resultados.get('mae') is not None:
+        partes += ["## 4. Modelo (Regressão Linear)", "",
+                   f"*   Diferença média entre previsto e real (MAE): {resultados['mae']:.2f}",
+                   f"*   Variação explicada pelo modelo (R²): {resultados['r2'] * 100:.2f}%", ""]
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(partes))
+
+
+def _escrever_pdf(caminho, resultados, caminho_csv, figuras):
+    # A API orientada a objetos do Matplotlib não depende de tela nem do backend do pyplot
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    import matplotlib.image as mpimg
+
+    perfil = resultados.get('perfil')
+    linhas = [f"Data: {_data_por_extenso(datetime.date.today())}"]
+    if caminho_csv:
+        linhas.append(f"Arquivo analisado: {caminho_csv}")
+    if perfil is not None:
+        linhas += [f"Registros: {perfil.linhas}", f"Colunas: {len(perfil.colunas)}",
+                   f"Valores ausentes: {int(perfil.valores_ausentes().sum())}"]
+    if resultados.get('mae') is not None:
+        linhas += [f"MAE do modelo: {resultados['mae']:.2f}", f"R² do modelo: {resultados['r2'] * 100:.2f}%"]
+
+    with PdfPages(caminho) as pdf:
+        pagina = Figure(figsize=(8.27, 11.69))
+        pagina.text(0.08, 0.92, "Relatório da Análise de Dados", fontsize=18, weight='bold')
+        for i, linha in enumerate(linhas):
+            pagina.text(0.08, 0.86 - 0.03 * i, linha, fontsize=11)
+        if perfil is not None:
+            estatisticas = _estatisticas(resultados).T.round(2)
+            eixo = pagina.add_axes([0.05, 0.2, 0.9, 0.35])
+            eixo.axis('off')
+            eixo.set_title("Estatísticas Descritivas")
+            tabela = eixo.table(cellText=estatisticas.to_numpy(), rowLabels=list(estatisticas.index),
+                                colLabels=list(estatisticas.columns), loc='upper center')
+            tabela.auto_set_font_size(False)
+            tabela.set_fontsize(8)
+        pdf.savefig(pagina)
+        for titulo, caminho_figura in figuras:
+            pagina = Figure(figsize=(11.69, 8.27))
+            eixo = pagina.add_axes([0.03, 0.03, 0.94, 0.9])
+            eixo.imshow(mpimg.imread(caminho_figura))
+            eixo.axis('off')
+            eixo.set_title(titulo)
+            pdf.savefig(pagina)
+
+
+@instrumentar
+def gerar_relatorio(resultados, pasta_saida=PASTA_RELATORIO_PADRAO, caminho_csv=None,
+                    coluna_numerica_hist='idade', coluna_categorica_bar='categoria',
+                    coluna_dispersao_x='valor_compra', coluna_dispersao_y='target',
+                    n_processos=None, gerar_pdf=True):
+    """Desenha os gráficos em arquivos e monta `relatorio.md` (e `relatorio.pdf`) em `pasta_saida`.
+
+    Args:
+        resultados (dict): O retorno de `executar_fluxo` (dados, perfil, modelo e métricas).
+        pasta_saida (str): Pasta do relatório; as figuras ficam em `figuras/` dentro dela
+            e servem de cache para as próximas execuções.
+        n_processos (int): Processos usados para desenhar; None usa todos os núcleos.
+            Dados em blocos são desenhados no processo atual, que é quem sabe lê-los.
+
+    Returns:
+        dict: Caminhos do Markdown, do PDF e das figuras e quantas figuras foram
+        desenhadas ou reaproveitadas, ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    df = resultados.get('df') if resultados else None
+    if df is None:
+        print("Não foi possível gerar o relatório, pois os dados não foram carregados.")
+        return None
+
+    print("\n--- Gerando o relatório da análise ---")
+    inicio_tempo = time.perf_counter()
+    pasta_figuras = os.path.join(pasta_saida, 'figuras')
+    os.makedirs(pasta_figuras, exist_ok=True)
+
+    # (nome, título, tipo, dados, colunas usadas, parâmetros)
+    especificacoes = [
+        ('histograma', f"Distribuição de {coluna_numerica_hist}", 'histograma', df,
+         [coluna_numerica_hist], {'coluna_numerica': coluna_numerica_hist}),
+        ('barras', f"Contagem de {coluna_categorica_bar}", 'barras', df,
+         [coluna_categorica_bar], {'coluna_categorica': coluna_categorica_bar}),
+        ('dispersao', f"Relação entre {coluna_dispersao_x} e {coluna_dispersao_y}", 'dispersao', df,
+         [coluna_dispersao_x, coluna_dispersao_y], {'coluna_x': coluna_dispersao_x, 'coluna_y': coluna_dispersao_y}),
+    ]
+    colunas_disponiveis = df.colunas if eh_fluxo(df) else df.columns
+    especificacoes = [e for e in especificacoes if all(c in colunas_disponiveis for c in e[4])]
+    if resultados.get('modelo') is not None and resultados.get('X_teste') is not None:
+        amostra = _amostra_reais_e_previstos(resultados['modelo'], resultados['X_teste'], resultados['y_teste'])
+        especificacoes.append(('reais_vs_previstos', "Valores reais vs. previstos pelo modelo", 'reais_vs_previstos',
+                               amostra, ['real', 'previsto'], {}))
+
+    # Um único cálculo de hash por coluna, mesmo que ela apareça em vários gráficos
+    hashes = _hashes_das_colunas(df, sorted({c for e in especificacoes if e[3] is df for c in e[4]}))
+    figuras, no_processo, em_paralelo, reaproveitadas = [], [], [], 0
+    for nome, titulo, tipo, dados, colunas, parametros in especificacoes:
+        hashes_figura = {c: hashes[c] for c in colunas} if dados is df else _hashes_das_colunas(dados, colunas)
+        caminho = os.path.join(pasta_figuras, f"{nome}-{_chave_figura(tipo, parametros, hashes_figura)}.png")
+        figuras.append((titulo, caminho))
+        if os.path.exists(caminho):
+            reaproveitadas += 1
+            continue
+        # Figuras antigas deste gráfico (com outros dados ou parâmetros) são substituídas
+        for antiga in glob.glob(os.path.join(pasta_figuras, f"{nome}-*.png")):
+            os.remove(antiga)
+        if eh_fluxo(dados):
+            # O perfil já tem o menor e o maior valor de cada coluna: poupa uma leitura dos blocos
+            extras = {'perfil': resultados.get('perfil')} if tipo in ('histograma', 'dispersao') else {}
+            no_processo.append((tipo, dados, dict(parametros, **extras), caminho))
+        else:
+            # Só as colunas usadas vão para o processo de trabalho
+            em_paralelo.append((tipo, dados[colunas], parametros, caminho))
+
+    try:
+        n_processos = min(n_processos or os.cpu_count() or 1, max(len(em_paralelo), 1))
+        if n_processos > 1:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                list(executor.map(_desenhar_figura, em_paralelo))
+        else:
+            no_processo = em_paralelo + no_processo
+        for tarefa in no_processo:
+            tipo, dados, parametros, caminho = tarefa
+            GRAFICOS[tipo](dados, caminho_saida=caminho, **parametros)
+    except Exception as e:
+        print(f"Ocorreu um problema ao desenhar os gráficos do relatório. Detalhes: {e}")
+        return None
+    figuras = [(titulo, caminho) for titulo, caminho in figuras if os.path.exists(caminho)]
+
+    caminho_md = os.path.join(pasta_saida, 'relatorio.md')
+    _escrever_markdown(caminho_md, resultados, caminho_csv, figuras)
+    caminho_pdf = None
+    if gerar_pdf:
+        caminho_pdf = os.path.join(pasta_saida, 'relatorio.pdf')
+        _escrever_pdf(caminho_pdf, resultados, caminho_csv, figuras)
+
+    desenhadas = len(especificacoes) - reaproveitadas
+    print(f"Relatório gerado em {time.perf_counter() - inicio_tempo:.1f}s: {desenhadas} gráfico(s) desenhado(s), "
+          f"{reaproveitadas} reaproveitado(s) do cache.")
+    print(f"Relatório salvo em: {caminho_md}" + (f" e {caminho_pdf}" if caminho_pdf else ""))
+    return {'markdown': caminho_md, 'pdf': caminho_pdf, 'figuras': dict(figuras),
+            'desenhadas': desenhadas, 'reaproveitadas': reaproveitadas}
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Validação cruzada (k-fold e divisões repetidas) executada em paralelo.
+
+Uma única divisão treino/teste dá um MAE e um R² que mudam bastante com a
+semente. Aqui o modelo é treinado e avaliado em várias divisões, cada uma em
+um processo. A matriz do modelo é montada uma só vez e gravada em arquivos
+.npy que os processos abrem mapeados na memória (`MatrizModelo.abrir`), em
+vez de receber uma cópia dos dados por divisão.
+"""
+import itertools
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .instrumentacao import instrumentar
+from .modelagem import AcumuladorMetricas, EstatisticasSuficientes
+from .preprocessamento import MatrizModelo, montar_matriz_modelo
+
+
+def _divisoes(n, estrategia, n_folds, repeticoes, test_size, random_state):
+    """Gera (índices de treino, índices de teste) de todas as divisões, sempre na mesma ordem."""
+    from sklearn.model_selection import KFold, RepeatedKFold, ShuffleSplit
+    if estrategia == 'kfold' and repeticoes > 1:
+        divisor = RepeatedKFold(n_splits=n_folds, n_repeats=repeticoes, random_state=random_state)
+    elif estrategia == 'kfold':
+        divisor = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    else:
+        divisor = ShuffleSplit(n_splits=n_folds * repeticoes, test_size=test_size, random_state=random_state)
+    return divisor.split(np.empty((n, 0)))
+
+
+def _avaliar_divisao(tarefa):
+    """Executada em cada processo: treina e avalia uma divisão a partir da matriz compartilhada."""
+    pasta, numero, estrategia, n_folds, repeticoes, test_size, random_state, alfa = tarefa
+    inicio_tempo = time.perf_counter()
+    matriz = MatrizModelo.abrir(pasta)
+    # Cada processo recalcula as divisões (é barato) em vez de receber os índices
+    divisoes = _divisoes(len(matriz.y), estrategia, n_folds, repeticoes, test_size, random_state)
+    treino, teste = next(itertools.islice(divisoes, numero, None))
+
+    estatisticas = EstatisticasSuficientes(matriz.X.shape[1])
+    for X_lote, y_lote in matriz.em_lotes(treino):
+        estatisticas.atualizar(X_lote, y_lote)
+    coeficientes, intercepto = estatisticas.resolver(alfa)
+
+    metricas = AcumuladorMetricas()
+    for X_lote, y_lote in matriz.em_lotes(teste):
+        metricas.atualizar(y_lote, X_lote @ coeficientes + intercepto)
+    return {
+        'divisao': numero + 1,
+        'repeticao': numero // n_folds + 1,
+        'n_treino': len(treino),
+        'n_teste': len(teste),
+        'mae': metricas.mae(),
+        'r2': metricas.r2(),
+        'segundos': time.perf_counter() - inicio_tempo,
+    }
+
+
+@instrumentar
+def validar_modelo(dados, coluna_target='target', n_folds=5, repeticoes=1, estrategia='kfold',
+                   test_size=0.3, random_state=42, alfa=0.0, n_processos=None, pasta_temporaria=None):
+    """Avalia a Regressão Linear em várias divisões treino/teste, em paralelo.
+
+    Args:
+        dados (pd.DataFrame ou MatrizModelo): Dados já pré-processados (só números), como os
+            que vão para `dividir_dados_treino_teste`.
+        n_folds (int): Número de partes do k-fold (ou de divisões por repetição, com
+            estrategia='divisoes').
+        repeticoes (int): Quantas vezes o k-fold é repetido, com embaralhamentos diferentes.
+        estrategia (str): 'kfold' (cada linha é testada uma vez por repetição) ou
+            'divisoes' (sorteios independentes com `test_size` das linhas para teste).
+        alfa (float): Regularização ridge; 0 é a regressão comum.
+        n_processos (int): Processos de trabalho; None usa todos os núcleos.
+        pasta_temporaria (str): Onde gravar a matriz compartilhada (padrão: pasta
+            temporária do sistema). Ela é apagada no final.
+
+    Returns:
+        dict: 'divisoes' (DataFrame com MAE, R² e tempo de cada divisão) e 'resumo'
+        (média e desvio padrão), ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if estrategia not in ('kfold', 'divisoes'):
+        print(f"Erro: Estratégia de validação '{estrategia}' não reconhecida. Use 'kfold' ou 'divisoes'.")
+        return None
+    if dados is None or eh_fluxo(dados) or not isinstance(dados, (pd.DataFrame, MatrizModelo)):
+        print("Erro: A validação cruzada precisa dos dados pré-processados completos em memória (DataFrame ou MatrizModelo).")
+        return None
+    if n_folds < 2:
+        print("Erro: A validação cruzada precisa de pelo menos 2 divisões.")
+        return None
+
+    print(f"\n--- Validando o modelo em várias divisões ({estrategia}, {n_folds} partes, {repeticoes} repetição(ões)) ---")
+    # Montada uma única vez; os processos só leem os arquivos
+    matriz = dados if isinstance(dados, MatrizModelo) else montar_matriz_modelo(dados, coluna_target)
+    if matriz is None:
+        return None
+    pasta = tempfile.mkdtemp(prefix='validacao_', dir=pasta_temporaria)
+    try:
+        inicio_tempo = time.perf_counter()
+        matriz.salvar(pasta)
+        n_divisoes = n_folds * repeticoes
+        tarefas = [(pasta, i, estrategia, n_folds, repeticoes, test_size, random_state, alfa) for i in range(n_divisoes)]
+        n_processos = min(n_processos or os.cpu_count() or 1, n_divisoes)
+        if n_processos == 1:
+            resultados = list(map(_avaliar_divisao, tarefas))
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                resultados = list(executor.map(_avaliar_divisao, tarefas))
+        duracao = time.perf_counter() - inicio_tempo
+    except Exception as e:
+        print(f"Ocorreu um problema durante a validação do modelo. Detalhes: {e}")
+        return None
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    tabela = pd.DataFrame(resultados).set_index('divisao')
+    resumo = tabela[['mae', 'r2', 'segundos']].agg(['mean', 'std']).rename(index={'mean': 'media', 'std': 'desvio_padrao'})
+    print(tabela.round(4).to_string())
+    print(f"\nDiferença média entre previsto e real (MAE): {resumo.loc['media', 'mae']:.2f} "
+          f"(± {resumo.loc['desvio_padrao', 'mae']:.2f} entre as divisões)")
+    print(f"Variação explicada (R²): {resumo.loc['media', 'r2'] * 100:.2f}% "
+          f"(± {resumo.loc['desvio_padrao', 'r2'] * 100:.2f} pontos)")
+    print(f"{n_divisoes} divisões avaliadas em {duracao:.1f}s com {n_processos} processo(s).")
+    return {'divisoes': tabela, 'resumo': resumo}
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""Funções para Visualização de Dados (com comentários narrativos).
+
+Matplotlib e Seaborn são importados só quando um gráfico é criado, pois
+somam segundos ao tempo de importação do pacote.
+
+Com muitas linhas (ou dados em blocos), o histograma e o gráfico de relação
+são desenhados a partir de contagens já agregadas com NumPy (`np.histogram`,
+`np.histogram2d`), e o custo do desenho passa a depender do número de
+intervalos, não do número de linhas. O gráfico de barras sempre usa só as
+contagens de `value_counts`.
+"""
+import numpy as np
+import pandas as pd
+
+from .carregamento import eh_fluxo
+from .instrumentacao import instrumentar
+
+# Acima deste número de linhas os gráficos usam o modo agregado
+LIMITE_LINHAS_AGREGADO = 100_000
+
+
+def _bibliotecas_graficas():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+def _mostrar_ou_salvar(plt, caminho_saida=None):
+    """Mostra o gráfico na tela ou, com `caminho_saida`, salva em arquivo e fecha a figura."""
+    if caminho_saida:
+        plt.savefig(caminho_saida, dpi=100, bbox_inches='tight')
+        plt.close()
+        print(f"Gráfico salvo em: {caminho_saida}")
+    else:
+        plt.show()
+
+def _colunas(df):
+    return df.colunas if eh_fluxo(df) else df.columns
+
+def _tipo(df, coluna):
+    return (df.primeiro_bloco() if eh_fluxo(df) else df)[coluna].dtype
+
+def _blocos(df):
+    return df if eh_fluxo(df) else (df,)
+
+def _usar_agregado(df, agregado):
+    if agregado is not None:
+        return agregado
+    return eh_fluxo(df) or len(df) > LIMITE_LINHAS_AGREGADO
+
+def _valores(bloco, coluna):
+    return bloco[coluna].to_numpy(dtype='float64', na_value=np.nan)
+
+def _limites(df, coluna, perfil=None):
+    """Menor e maior valor da coluna, do perfil quando houver ou com uma passada pelos dados."""
+    if perfil is not None and coluna in perfil.colunas and perfil.colunas[coluna].numerica:
+        quantis = perfil.colunas[coluna].quantis
+        minimo, maximo = quantis.minimo, quantis.maximo
+    else:
+        minimo, maximo = np.inf, -np.inf
+        for bloco in _blocos(df):
+            valores = _valores(bloco, coluna)
+            if not np.isnan(valores).all():
+                minimo, maximo = min(minimo, np.nanmin(valores)), max(maximo, np.nanmax(valores))
+    if not np.isfinite(minimo):
+        return None
+    # Uma coluna constante ainda precisa de um intervalo com largura
+    return (minimo - 0.5, maximo + 0.5) if minimo == maximo else (minimo, maximo)
+
+def _bordas(limites, bins):
+    return np.linspace(limites[0], limites[1], bins + 1)
+
+def _plotar_histograma_agregado(plt, df, coluna_numerica, bins, perfil, tamanho_amostra_kde):
+    limites = _limites(df, coluna_numerica, perfil)
+    if limites is None:
+        print(f"Erro: A coluna '{coluna_numerica}' só tem valores ausentes.")
+        return False
+    bordas = _bordas(limites, bins)
+    contagens = np.zeros(bins, dtype=np.int64)
+    # Amostra uniforme para a curva KDE: cada valor recebe uma prioridade aleatória
+    # e ficam os de menor prioridade, sem guardar a coluna inteira
+    gerador = np.random.default_rng(0)
+    amostra, prioridades = np.empty(0), np.empty(0)
+    for bloco in _blocos(df):
+        valores = _valores(bloco, coluna_numerica)
+        valores = valores[~np.isnan(valores)]
+        contagens += np.histogram(valores, bordas)[0]
+        amostra = np.concatenate([amostra, valores])
+        prioridades = np.concatenate([prioridades, gerador.random(len(valores))])
+        if len(amostra) > tamanho_amostra_kde:
+            mantidos = np.argpartition(prioridades, tamanho_amostra_kde)[:tamanho_amostra_kde]
+            amostra, prioridades = amostra[mantidos], prioridades[mantidos]
+
+    plt.bar(bordas[:-1], contagens, width=np.diff(bordas), align='edge', alpha=0.6, edgecolor='white')
+    if len(amostra) > 1 and amostra.std() > 0:
+        from scipy.stats import gaussian_kde
+        pontos = np.linspace(bordas[0], bordas[-1], 200)
+        # A densidade é levada à escala das contagens: total de valores x largura do intervalo
+        plt.plot(pontos, gaussian_kde(amostra)(pontos) * contagens.sum() * (bordas[1] - bordas[0]))
+    return True
+
+@instrumentar
+def plotar_histograma(df, coluna_numerica, bins=10, agregado=None, perfil=None, tamanho_amostra_kde=10_000,
+                      caminho_saida=None):
+    """Plota um histograma para visualizar a distribuição de uma coluna numérica.
+
+    O histograma agrupa os valores da coluna em 'bins' (intervalos) e mostra,
+    através da altura das barras, quantos valores caem em cada intervalo.
+    A curva KDE (Kernel Density Estimate) suavizada ajuda a visualizar a forma
+    geral da distribuição de probabilidade dos dados.
+
+    No modo agregado (`agregado=True`, ou automático acima de
+    LIMITE_LINHAS_AGREGADO linhas e com dados em blocos) as contagens vêm de
+    `np.histogram` e a KDE é calculada sobre uma amostra de
+    `tamanho_amostra_kde` valores. Com um `perfil`, o menor e o maior valor
+    vêm dele, sem uma passada extra pelos dados.
+
+    Com `caminho_saida`, o gráfico é salvo nesse arquivo (ex.: .png) em vez de
+    aparecer na tela, como em todas as funções de gráfico deste módulo.
+    """
+    if df is not None and coluna_numerica in _colunas(df) and pd.api.types.is_numeric_dtype(_tipo(df, coluna_numerica)):
+        print(f"\n--- Criando um gráfico de distribuição para '{coluna_numerica}' ---")
+        plt, sns = _bibliotecas_graficas()
+        plt.figure(figsize=(8, 5))
+
+        if _usar_agregado(df, agregado):
+            if not _plotar_histograma_agregado(plt, df, coluna_numerica, bins, perfil, tamanho_amostra_kde):
+                plt.close()
+                return
+        else:
+            sns.histplot(df[coluna_numerica].dropna(), kde=True, bins=bins)
+
+        plt.title(f'Como os valores de {coluna_numerica} se distribuem')
+        plt.xlabel(coluna_numerica)
+        plt.ylabel('Quantas vezes aparecem')
+        plt.grid(axis='y', alpha=0.5)
+        _mostrar_ou_salvar(plt, caminho_saida)
+
+    elif df is None:
+        print("Não foi possível criar o histograma, pois os dados não foram carregados.")
+    elif coluna_numerica not in _colunas(df):
+        print(f"Erro: Não foi encontrada a coluna '{coluna_numerica}' para o histograma.")
+    else:
+        print(f"Erro: A coluna '{coluna_numerica}' não tem números para criar um histograma.")
+
+@instrumentar
+def plotar_grafico_barras(df, coluna_categorica, caminho_saida=None):
+    """Plota um gráfico de barras para visualizar a frequência de cada categoria
+    em uma coluna categórica.
+
+    Cada barra representa uma categoria única presente na coluna. A altura da
+    barra indica quantas vezes essa categoria aparece no dataset (sua contagem).
+    As barras são ordenadas da mais frequente para a menos frequente.
+
+    Só as contagens de cada categoria (`value_counts`, somadas bloco a bloco
+    para dados em blocos) são usadas no desenho, nunca as linhas.
+    """
+    if df is not None and coluna_categorica in _colunas(df):
+        # --- ALTERAÇÃO AQUI: Atualiza a verificação de tipo de dado ---
+        # A forma mais moderna e recomendada pelo Pandas para verificar se a coluna é categórica ou de texto
+        # (no Pandas 3 os textos têm o tipo 'str', e não mais 'object')
+        tipo = _tipo(df, coluna_categorica)
+        if isinstance(tipo, pd.CategoricalDtype) or pd.api.types.is_string_dtype(tipo):
+            print(f"\n--- Criando um gráfico de barras para a coluna '{coluna_categorica}' ---")
+            plt, sns = _bibliotecas_graficas()
+            plt.figure(figsize=(8, 5))
+
+            # Conta as categorias de cada bloco, tratando NaNs como uma categoria 'Não Informado'.
+            contagens = None
+            for bloco in _blocos(df):
+                contagens_bloco = bloco[coluna_categorica].value_counts(dropna=False)
+                contagens_bloco.index = ['Não Informado' if pd.isna(valor) else str(valor) for valor in contagens_bloco.index]
+                contagens_bloco = contagens_bloco.groupby(level=0).sum()
+                contagens = contagens_bloco if contagens is None else contagens.add(contagens_bloco, fill_value=0)
+            # Ordena as barras pela frequência (do maior para o menor).
+            contagens = contagens.sort_values(ascending=False, kind='stable')
+
+            # Cria o gráfico de barras usando Seaborn, a partir das contagens.
+            sns.barplot(x=list(contagens.index), y=contagens.to_numpy())
+
+            # --- ALTERAÇÃO AQUI: Melhoria no título do gráfico ---
+            plt.title(f'Quantas vezes cada tipo de "{coluna_categorica}" aparece')
+
+            # Define o rótulo do eixo X, que representa as diferentes categorias.
+            plt.xlabel(coluna_categorica)
+
+            # Define o rótulo do eixo Y, que representa a contagem (frequência) de cada categoria.
+            plt.ylabel('Contagem')
+
+            # Rotaciona os rótulos do eixo X para melhor legibilidade se houver muitas categorias.
+            plt.xticks(rotation=45, ha='right')
+
+            # Adiciona uma grade horizontal.
+            plt.grid(axis='y', alpha=0.5)
+
+            # Ajusta o layout para evitar sobreposição de elementos.
+            plt.tight_layout()
+
+            # Exibe o gráfico (ou salva em arquivo, se um caminho foi informado).
+            _mostrar_ou_salvar(plt, caminho_saida)
+        else:
+            print(f"Erro: A coluna '{coluna_categorica}' não parece ser uma categoria (texto).")
+    elif df is None:
+        print("Não foi possível criar o gráfico de barras, pois os dados não foram carregados.")
+    else:
+        print(f"Erro: Não encontramos a coluna '{coluna_categorica}' para o gráfico de barras.")
+
+@instrumentar
+def plotar_grafico_dispersao(df, coluna_x, coluna_y, agregado=None, perfil=None, bins=100, caminho_saida=None):
+    """Plota um gráfico de dispersão (scatter plot) para visualizar a relação
+    entre duas colunas numéricas.
+
+    Cada ponto no gráfico representa uma linha (observação) do DataFrame.
+    A posição horizontal do ponto é determinada pelo valor da 'coluna_x'.
+    A posição vertical do ponto é determinada pelo valor da 'coluna_y'.
+    Este gráfico ajuda a identificar padrões como correlação (linear ou não),
+    clusters (agrupamentos) ou outliers (pontos distantes).
+
+    No modo agregado (`agregado=True`, ou automático acima de
+    LIMITE_LINHAS_AGREGADO linhas e com dados em blocos), em vez de um ponto
+    por linha o plano é dividido em `bins` x `bins` quadrados e a cor de cada
+    um mostra quantos registros caem nele (`np.histogram2d`).
+    """
+    if df is not None and coluna_x in _colunas(df) and coluna_y in _colunas(df):
+        if pd.api.types.is_numeric_dtype(_tipo(df, coluna_x)) and pd.api.types.is_numeric_dtype(_tipo(df, coluna_y)):
+            print(f"\n--- Criando um gráfico para ver a relação entre '{coluna_x}' e '{coluna_y}' ---")
+            plt, sns = _bibliotecas_graficas()
+            plt.figure(figsize=(8, 5))
+
+            if _usar_agregado(df, agregado):
+                limites_x, limites_y = _limites(df, coluna_x, perfil), _limites(df, coluna_y, perfil)
+                if limites_x is None or limites_y is None:
+                    print("Erro: Uma das colunas só tem valores ausentes.")
+                    plt.close()
+                    return
+                bordas_x, bordas_y = _bordas(limites_x, bins), _bordas(limites_y, bins)
+                contagens = np.zeros((bins, bins), dtype=np.int64)
+                for bloco in _blocos(df):
+                    x, y = _valores(bloco, coluna_x), _valores(bloco, coluna_y)
+                    validos = ~(np.isnan(x) | np.isnan(y))
+                    contagens += np.histogram2d(x[validos], y[validos], bins=[bordas_x, bordas_y])[0].astype(np.int64)
+                # Quadrados vazios ficam em branco; a escala logarítmica mostra regiões densas e raras juntas
+                plt.pcolormesh(bordas_x, bordas_y, np.ma.masked_equal(contagens.T, 0), norm='log', cmap='viridis')
+                plt.colorbar(label='Quantidade de registros')
+            else:
+                sns.scatterplot(x=coluna_x, y=coluna_y, data=df)
+
+            plt.title(f'Relação entre {coluna_x} e {coluna_y}')
+            plt.xlabel(coluna_x)
+            plt.ylabel(coluna_y)
+            plt.grid(True, alpha=0.5)
+            _mostrar_ou_salvar(plt, caminho_saida)
+        else:
+            print(f"Erro: Pelo menos uma das colunas ('{coluna_x}', '{coluna_y}') não tem números para criar este gráfico.")
+    elif df is None:
+        print("Não foi possível criar o gráfico de relação, pois os dados não foram carregados.")
+    else:
+        print(f"Erro: Não foi encontrado uma ou ambas as colunas ('{coluna_x}', '{coluna_y}') para o gráfico de relação.")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Os dados sintéticos devem seguir o exemplo e a suíte de benchmarks deve medir e comparar cada etapa."""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PASTA_BENCHMARKS = Path(__file__).resolve().parent.parent / 'benchmarks'
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+sys.path.insert(0, str(PASTA_BENCHMARKS))
+
+from bench_etapas import comparar, medir_etapas  # noqa: E402
+from gerar_dados import COLUNAS_COM_NULOS, gerar_dados, nomes_das_categorias  # noqa: E402
+
+
+def test_dados_sinteticos_com_as_colunas_do_exemplo(tmp_path):
+    caminho = gerar_dados(str(tmp_path / 'sintetico.csv'), 25_000, taxa_nulos=0.1, n_categorias=30,
+                          linhas_por_bloco=7_000)
+    df = pd.read_csv(caminho)
+
+    assert list(df.columns) == list(pd.read_csv(CAMINHO_DADOS, nrows=0).columns)
+    # Os blocos continuam a numeração uns dos outros
+    np.testing.assert_array_equal(df['id'], np.arange(1, 25_001))
+    for coluna in COLUNAS_COM_NULOS:
+        assert abs(df[coluna].isna().mean() - 0.1) < 0.01
+    assert df.drop(columns=list(COLUNAS_COM_NULOS)).notna().all().all()
+    assert set(df['categoria'].dropna()) == set(nomes_das_categorias(30))
+    assert set(df['sexo']) == {'F', 'M', 'Outro'}
+    # O alvo depende das outras colunas: há o que aprender
+    assert df[['valor_compra', 'target']].corr().iloc[0, 1] > 0.9
+
+
+def test_mesma_semente_mesmos_dados(tmp_path):
+    um = gerar_dados(str(tmp_path / 'um.csv'), 1_000, semente=3)
+    outro = gerar_dados(str(tmp_path / 'outro.csv'), 1_000, semente=3)
+    diferente = gerar_dados(str(tmp_path / 'diferente.csv'), 1_000, semente=4)
+    assert Path(um).read_bytes() == Path(outro).read_bytes() != Path(diferente).read_bytes()
+
+
+def test_medicao_de_cada_etapa(tmp_path):
+    caminho = gerar_dados(str(tmp_path / 'sintetico.csv'), 5_000)
+    medicoes = medir_etapas(caminho, 5_000)
+
+    assert [m['etapa'] for m in medicoes] == [
+        'carregar_dados', 'tratar_valores_ausentes', 'codificar_variaveis_categoricas',
+        'remover_colunas_nao_numericas', 'dividir_dados_treino_teste', 'treinar_modelo_regressao', 'avaliar_modelo']
+    for medicao in medicoes:
+        assert medicao['linhas'] == 5_000 and medicao['segundos'] >= 0
+        assert medicao['r2_modelo'] > 0.9
+
+
+def test_comparacao_aponta_etapas_mais_lentas(tmp_path, capsys):
+    def salvar(nome, segundos):
+        caminho = tmp_path / nome
+        resultados = [{'etapa': etapa, 'linhas': 1000, 'segundos': s, 'pico_rss_mb': 10.0}
+                      for etapa, s in segundos.items()]
+        caminho.write_text(json.dumps({'resultados': resultados}), encoding='utf-8')
+        return str(caminho)
+
+    antes = salvar('antes.json', {'carregar_dados': 1.0, 'avaliar_modelo': 0.01})
+    # A etapa rápida triplica, mas fica abaixo do tempo mínimo: é ruído
+    igual = salvar('igual.json', {'carregar_dados': 1.1, 'avaliar_modelo': 0.03})
+    pior = salvar('pior.json', {'carregar_dados': 1.5, 'avaliar_modelo': 0.01})
+
+    assert comparar(antes, igual, limite_regressao=1.2) == 0
+    assert comparar(antes, pior, limite_regressao=1.2) == 1
+    assert 'mais lento' in capsys.readouterr().out
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Os modos de leitura de `carregar_dados` devem devolver os mesmos dados que `pd.read_csv`."""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.carregamento import _hash_arquivo, carregar_dados, compactar_tipos, eh_fluxo
+from src.eda import perfilar_dados
+from src.preprocessamento import tratar_valores_ausentes
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def test_cache_igual_ao_csv_e_refeito_quando_o_arquivo_muda(tmp_path):
+    caminho_csv = tmp_path / 'dados.csv'
+    df = pd.read_csv(CAMINHO_DADOS)
+    df.to_csv(caminho_csv, index=False)
+    pasta_cache = tmp_path / 'cache'
+
+    convertido = carregar_dados(str(caminho_csv), usar_cache=True, pasta_cache=str(pasta_cache))
+    lido_do_cache = carregar_dados(str(caminho_csv), usar_cache=True, pasta_cache=str(pasta_cache))
+    pd.testing.assert_frame_equal(convertido, df)
+    pd.testing.assert_frame_equal(lido_do_cache, df)
+
+    # Outro conteúdo no mesmo caminho: o hash muda e o arquivo é convertido de novo
+    df.loc[0, 'target'] += 1
+    df.to_csv(caminho_csv, index=False)
+    pd.testing.assert_frame_equal(carregar_dados(str(caminho_csv), usar_cache=True, pasta_cache=str(pasta_cache)), df)
+
+
+def test_hash_de_varios_arquivos_ao_mesmo_tempo(tmp_path):
+    arquivos = []
+    for i in range(20):
+        arquivo = tmp_path / f'entrada_{i}.csv'
+        arquivo.write_text(f'a,b\n{i},{i * 2}\n', encoding='utf-8')
+        arquivos.append(str(arquivo))
+    pasta_cache = str(tmp_path / 'cache')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        hashes = list(executor.map(lambda arquivo: _hash_arquivo(arquivo, pasta_cache), arquivos))
+
+    # Cada entrada tem o seu registro: nenhum se perdeu na disputa, e nenhum temporário sobrou
+    registros = sorted((tmp_path / 'cache' / 'hashes').iterdir())
+    assert len(registros) == len(arquivos) and all(r.suffix == '.json' for r in registros)
+    assert sorted(json.loads(r.read_text(encoding='utf-8'))['hash'] for r in registros) == sorted(hashes)
+    assert len(set(hashes)) == len(arquivos)
+
+
+def test_registro_de_hash_ilegivel_e_recalculado(tmp_path):
+    arquivo = tmp_path / 'entrada.csv'
+    arquivo.write_text('a\n1\n', encoding='utf-8')
+    pasta_cache = str(tmp_path / 'cache')
+    esperado = _hash_arquivo(str(arquivo), pasta_cache)
+
+    (registro,) = (tmp_path / 'cache' / 'hashes').iterdir()
+    registro.write_text('{"caminho": ', encoding='utf-8')
+    assert _hash_arquivo(str(arquivo), pasta_cache) == esperado
+    assert json.loads(registro.read_text(encoding='utf-8'))['hash'] == esperado
+
+
+def _juntar(fluxo):
+    return pd.concat(list(fluxo))
+
+
+def test_leitura_em_blocos_igual_ao_csv(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    fluxo = carregar_dados(str(CAMINHO_DADOS), tamanho_chunk=64)
+
+    assert eh_fluxo(fluxo)
+    assert [len(bloco) for bloco in fluxo] == [64] * 7 + [52]
+    # Em blocos, colunas inteiras são lidas como float64 (um bloco seguinte pode ter ausentes)
+    pd.testing.assert_frame_equal(_juntar(fluxo), df, check_dtype=False)
+    # O fluxo pode ser percorrido de novo, e cada etapa trabalha um bloco por vez
+    tratado = tratar_valores_ausentes(fluxo, estrategia_num='mean', estrategia_cat='constant',
+                                      perfil=perfilar_dados(fluxo))
+    pd.testing.assert_frame_equal(_juntar(tratado),
+                                  tratar_valores_ausentes(df, estrategia_num='mean', estrategia_cat='constant'),
+                                  check_dtype=False)
+
+
+def test_particoes_em_blocos_numeradas_como_um_arquivo(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    for i, inicio in enumerate(range(0, len(df), 150)):
+        df.iloc[inicio:inicio + 150].to_csv(tmp_path / f'parte_{i}.csv', index=False)
+
+    pd.testing.assert_frame_equal(_juntar(carregar_dados(str(tmp_path), tamanho_chunk=64)), df, check_dtype=False)
+    pd.testing.assert_frame_equal(carregar_dados(str(tmp_path)), df)
+
+
+def test_compactar_guarda_os_mesmos_valores_em_menos_memoria():
+    df = pd.read_csv(CAMINHO_DADOS)
+    colunas = ['idade', 'sexo', 'categoria', 'valor_compra', 'target']
+
+    compacto = carregar_dados(str(CAMINHO_DADOS), colunas=colunas, compactar=True)
+
+    assert list(compacto.columns) == colunas
+    assert isinstance(compacto['sexo'].dtype, pd.CategoricalDtype)
+    assert compacto['idade'].dtype.itemsize < df['idade'].dtype.itemsize
+    assert compacto.memory_usage(deep=True).sum() < df[colunas].memory_usage(deep=True).sum()
+    # Os valores (e os ausentes) são exatamente os da leitura comum
+    pd.testing.assert_frame_equal(compacto.astype({'sexo': object, 'categoria': object}).astype(df[colunas].dtypes),
+                                  df[colunas])
+
+
+def test_compactar_tipos_so_reduz_o_que_cabe():
+    df = pd.DataFrame({'pequeno': [1, 2, 120], 'grande': [1, 2, 2 ** 40], 'dinheiro': [1.5, 2.25, None],
+                       'preciso': [0.1, 0.2, 0.3], 'texto': ['a', 'b', 'a']})
+
+    compacto = compactar_tipos(df.copy())
+
+    assert compacto.dtypes.astype(str).to_dict() == {'pequeno': 'int8', 'grande': 'int64', 'dinheiro': 'float32',
+                                                     'preciso': 'float64', 'texto': 'category'}
+    pd.testing.assert_frame_equal(compacto.astype(df.dtypes), df)
+
+
+@pytest.mark.parametrize('blocos_antecipados', [0, 2])
+def test_arquivo_compactado_com_leitura_antecipada_igual_ao_csv(tmp_path, blocos_antecipados):
+    df = pd.read_csv(CAMINHO_DADOS)
+    caminho_gz = tmp_path / 'dados.csv.gz'
+    df.to_csv(caminho_gz, index=False)
+
+    pd.testing.assert_frame_equal(carregar_dados(str(caminho_gz)), df)
+    fluxo = carregar_dados(str(caminho_gz), tamanho_chunk=64, blocos_antecipados=blocos_antecipados)
+    # Uma passada interrompida (só o primeiro bloco) não atrapalha as seguintes
+    assert len(fluxo.primeiro_bloco()) == 64
+    pd.testing.assert_frame_equal(_juntar(fluxo), _juntar(carregar_dados(str(CAMINHO_DADOS), tamanho_chunk=64)))
+    pd.testing.assert_frame_equal(_juntar(fluxo), _juntar(carregar_dados(str(CAMINHO_DADOS), tamanho_chunk=64)))
+
+    tempos = fluxo.tempos_leitura
+    assert tempos['passadas'] == 3 and tempos['blocos'] == 1 + 2 * 8
+    assert 0 <= tempos['espera'] <= tempos['total']
+    assert not any(thread.name == 'leitura-antecipada' for thread in threading.enumerate())
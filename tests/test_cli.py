@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Combinações de opções que a linha de comando precisa recusar antes de rodar o fluxo."""
+import pytest
+
+from src.cli import main
+
+
+@pytest.mark.parametrize('opcao', ['--salvar-modelo', '--salvar-preprocessador'])
+def test_hashing_nao_pode_ser_salvo(opcao, tmp_path):
+    destino = tmp_path / 'saida.json'
+    with pytest.raises(SystemExit) as saida:
+        main(['--sem-graficos', '--metodo-codificacao', 'hashing', opcao, str(destino)])
+    assert saida.value.code == 2
+    assert not destino.exists()
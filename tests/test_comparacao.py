@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""A comparação em paralelo deve dar os mesmos modelos e métricas do Scikit-learn na mesma divisão."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeRegressor
+
+import src.preprocessamento
+from src.comparacao import treinar_varios_modelos
+from src.preprocessamento import PreProcessador, dividir_dados_treino_teste, montar_matriz_modelo
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _dados_do_modelo():
+    df = pd.read_csv(CAMINHO_DADOS)
+    return PreProcessador(['sexo', 'categoria'], 'target').ajustar(df).transformar(df)
+
+
+def _modelos():
+    return {'linear': LinearRegression(), 'ridge': Ridge(alpha=1.0),
+            'arvore': DecisionTreeRegressor(max_depth=4, random_state=0)}
+
+
+# Com a mesma semente da matriz, treino e teste são fatias; com outra, índices sorteados
+@pytest.mark.parametrize('semente_da_matriz', [42, 7, None])
+def test_comparacao_igual_ao_sklearn(monkeypatch, semente_da_matriz):
+    monkeypatch.setattr(src.preprocessamento, 'LINHAS_POR_LOTE', 37)  # vários lotes por divisão
+    df = _dados_do_modelo()
+    matriz = montar_matriz_modelo(df.copy(), 'target', random_state=semente_da_matriz)
+
+    resultado = treinar_varios_modelos(matriz, 'target', modelos=_modelos(), random_state=42, n_processos=1)
+
+    if semente_da_matriz == 42:
+        # As linhas da matriz já estão na ordem da divisão: a mesma do DataFrame original
+        divisao = dividir_dados_treino_teste(df, 'target', random_state=42)
+    else:
+        divisao = train_test_split(matriz.X, matriz.y, test_size=0.3, random_state=42)
+    X_treino, X_teste, y_treino, y_teste = (np.asarray(parte, dtype='float64') for parte in divisao)
+    placar = resultado['placar'].set_index('modelo')
+    for nome, referencia in _modelos().items():
+        previstos = referencia.fit(X_treino, y_treino).predict(X_teste)
+        linha = placar.loc[nome]
+        assert (linha['n_treino'], linha['n_teste']) == (len(y_treino), len(y_teste))
+        np.testing.assert_allclose(linha['mae'], mean_absolute_error(y_teste, previstos), rtol=1e-10)
+        np.testing.assert_allclose(linha['r2'], r2_score(y_teste, previstos), rtol=1e-10)
+        modelo = resultado['modelos'][(nome, 'target')]
+        # Os modelos lineares montados pelas estatísticas guardam os nomes das colunas
+        entrada = pd.DataFrame(X_teste, columns=matriz.colunas) if hasattr(modelo, 'feature_names_in_') else X_teste
+        np.testing.assert_allclose(modelo.predict(entrada), previstos, rtol=1e-9, atol=1e-8)
+
+
+def test_varios_alvos_igual_a_um_de_cada_vez():
+    df = _dados_do_modelo()
+    df['target_dobro'] = 2 * df['target'] + df['idade']
+    modelos = {'linear': LinearRegression()}
+
+    juntos = treinar_varios_modelos(df, ['target', 'target_dobro'], modelos=modelos, n_processos=1)['placar']
+    for alvo in ('target', 'target_dobro'):
+        sozinho = treinar_varios_modelos(df.drop(columns=[a for a in ('target', 'target_dobro') if a != alvo]),
+                                         alvo, modelos=modelos, n_processos=1)['placar']
+        linha = juntos[juntos['alvo'] == alvo].iloc[0]
+        np.testing.assert_allclose([linha['mae'], linha['r2']], [sozinho.iloc[0]['mae'], sozinho.iloc[0]['r2']],
+                                   rtol=1e-10)
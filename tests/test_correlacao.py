@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""As correlações acumuladas em blocos devem ser as mesmas do `df.corr()` em qualquer formato dos dados."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlacao import AcumuladorCorrelacao, analisar_correlacoes
+from src.preprocessamento import codificar_variaveis_categoricas, montar_matriz_modelo, tratar_valores_ausentes
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _dados_tratados():
+    df = pd.read_csv(CAMINHO_DADOS).drop(columns=['id', 'observacao'], errors='ignore')
+    return tratar_valores_ausentes(df)
+
+
+@pytest.mark.parametrize('metodo', ['onehot', 'esparso', 'matriz'])
+def test_correlacoes_iguais_ao_df_corr(metodo):
+    referencia = codificar_variaveis_categoricas(_dados_tratados(), ['sexo', 'categoria'])
+    referencia = referencia.astype('float64')
+    if metodo == 'esparso':
+        dados = codificar_variaveis_categoricas(_dados_tratados(), ['sexo', 'categoria'], metodo='esparso')
+    elif metodo == 'matriz':
+        dados = montar_matriz_modelo(referencia.copy(), 'target')
+    else:
+        dados = referencia
+
+    resultado = analisar_correlacoes(dados, 'target', top_k=50, com_matriz=True, tamanho_bloco=3)
+
+    esperado = referencia.corr()
+    colunas = list(resultado['matriz'].columns)
+    np.testing.assert_allclose(resultado['matriz'].to_numpy(), esperado.loc[colunas, colunas].to_numpy(),
+                               rtol=0, atol=1e-10)
+    com_alvo = resultado['com_alvo']
+    np.testing.assert_allclose(com_alvo.to_numpy(), esperado.loc[com_alvo.index, 'target'].to_numpy(),
+                               rtol=0, atol=1e-10)
+
+
+def test_acumulador_em_lotes_igual_a_uma_passada():
+    gerador = np.random.default_rng(0)
+    X = gerador.normal(size=(1000, 7)) * [1, 10, 100, 1e3, 1e4, 1e5, 1e6] + 1e6
+    y = X @ gerador.normal(size=7) + gerador.normal(size=1000)
+
+    inteiro = AcumuladorCorrelacao(7).atualizar(X, y)
+    em_lotes = AcumuladorCorrelacao(7, tamanho_bloco=2)
+    for inicio in range(0, 1000, 137):
+        em_lotes.atualizar(X[inicio:inicio + 137], y[inicio:inicio + 137])
+
+    esperado = np.corrcoef(np.column_stack([X, y]), rowvar=False)
+    np.testing.assert_allclose(inteiro.matriz_correlacao(), esperado[:7, :7], rtol=0, atol=1e-10)
+    np.testing.assert_allclose(em_lotes.matriz_correlacao(), esperado[:7, :7], rtol=0, atol=1e-10)
+    np.testing.assert_allclose(em_lotes.correlacoes_com_alvo(), esperado[:7, 7], rtol=0, atol=1e-10)
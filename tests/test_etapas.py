@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""O grafo de etapas só refaz o que mudou, e o fluxo guardado em disco dá os mesmos resultados."""
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.carregamento import carregar_dados
+from src.cli import OpcoesFluxo, executar_fluxo
+from src.etapas import GrafoDeEtapas, Resultado
+from src.preprocessamento import dividir_dados_treino_teste, tratar_valores_ausentes
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _grafo(pasta, caminho_csv, tamanho_teste):
+    grafo = GrafoDeEtapas(str(pasta))
+    grafo.adicionar('carregar_dados', carregar_dados, arquivos=('caminho_arquivo',), caminho_arquivo=str(caminho_csv))
+    grafo.adicionar('tratar_valores_ausentes', tratar_valores_ausentes, Resultado('carregar_dados'))
+    grafo.adicionar('dividir_dados_treino_teste', dividir_dados_treino_teste, Resultado('tratar_valores_ausentes'),
+                    'target', test_size=tamanho_teste)
+    return grafo
+
+
+def test_grafo_so_refaz_as_etapas_afetadas(tmp_path):
+    caminho_csv = tmp_path / 'dados.csv'
+    shutil.copy(CAMINHO_DADOS, caminho_csv)
+    pasta = tmp_path / 'etapas'
+
+    primeiro = _grafo(pasta, caminho_csv, 0.3)
+    esperado = primeiro.resultado('dividir_dados_treino_teste')
+    assert primeiro.executadas == ['carregar_dados', 'tratar_valores_ausentes', 'dividir_dados_treino_teste']
+
+    # Nada mudou: a última etapa vem do disco, e as anteriores nem são lidas
+    repetido = _grafo(pasta, caminho_csv, 0.3)
+    obtido = repetido.resultado('dividir_dados_treino_teste')
+    assert repetido.executadas == [] and repetido.reaproveitadas == ['dividir_dados_treino_teste']
+    for parte_esperada, parte_obtida in zip(esperado, obtido):
+        pd.testing.assert_frame_equal(pd.DataFrame(parte_obtida), pd.DataFrame(parte_esperada))
+
+    # Só um parâmetro da divisão mudou: só ela é refeita
+    outra_divisao = _grafo(pasta, caminho_csv, 0.2)
+    assert len(outra_divisao.resultado('dividir_dados_treino_teste')[1]) == 100
+    assert outra_divisao.executadas == ['dividir_dados_treino_teste']
+    assert outra_divisao.reaproveitadas == ['tratar_valores_ausentes']
+
+    # O conteúdo do arquivo mudou: tudo é refeito
+    df = pd.read_csv(caminho_csv)
+    df.loc[0, 'target'] += 1
+    df.to_csv(caminho_csv, index=False)
+    arquivo_novo = _grafo(pasta, caminho_csv, 0.3)
+    arquivo_novo.resultado('dividir_dados_treino_teste')
+    assert arquivo_novo.executadas == ['carregar_dados', 'tratar_valores_ausentes', 'dividir_dados_treino_teste']
+
+
+def test_opcoes_iguais_aos_parametros_pelo_nome(tmp_path):
+    opcoes = OpcoesFluxo(mostrar_graficos=False, tamanho_teste=0.25, pasta_etapas=str(tmp_path))
+
+    pelo_objeto = executar_fluxo(str(CAMINHO_DADOS), opcoes)
+    pelo_nome = executar_fluxo(str(CAMINHO_DADOS), mostrar_graficos=False, tamanho_teste=0.25)
+    # Alterações pelo nome valem sobre o objeto, sem mudá-lo
+    alterado = executar_fluxo(str(CAMINHO_DADOS), opcoes, tamanho_teste=0.3)
+
+    assert opcoes.tamanho_teste == 0.25
+    assert len(pelo_objeto['y_teste']) == len(pelo_nome['y_teste']) == 125
+    assert len(alterado['y_teste']) == 150
+    np.testing.assert_allclose([pelo_objeto['mae'], pelo_objeto['r2']], [pelo_nome['mae'], pelo_nome['r2']],
+                               rtol=1e-12)
+    with pytest.raises(TypeError):
+        executar_fluxo(str(CAMINHO_DADOS), mostrar_grafico=False)
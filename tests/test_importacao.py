@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Importar o pacote não deve rodar a análise nem carregar as bibliotecas de gráficos e de Machine Learning."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ_PROJETO = Path(__file__).resolve().parent.parent
+BIBLIOTECAS_PESADAS = ('matplotlib', 'seaborn', 'sklearn', 'scipy')
+
+
+def _rodar(*argumentos):
+    return subprocess.run([sys.executable, *argumentos], cwd=RAIZ_PROJETO, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('modulo', ['src', 'src.analise_ml', 'src.cli'])
+def test_importacao_leve_e_sem_efeitos(modulo):
+    codigo = (f"import json, sys; import {modulo}; "
+              f"print(json.dumps([m for m in {BIBLIOTECAS_PESADAS!r} if m in sys.modules]))")
+    saida = _rodar('-c', codigo)
+
+    assert saida.returncode == 0, saida.stderr
+    # Nada além da lista é impresso: importar não executa nenhuma etapa
+    assert saida.stdout.strip().splitlines() == ['[]']
+
+
+def test_linha_de_comando():
+    ajuda = _rodar('-m', 'src', '--help')
+    assert ajuda.returncode == 0 and 'pontuar' in ajuda.stdout
+    # Como script solto, o módulo indica o jeito certo de rodar, sem começar a análise
+    script = _rodar(str(Path('src') / 'analise_ml.py'))
+    assert script.returncode != 0 and 'python -m src' in script.stderr
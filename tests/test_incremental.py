@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""A atualização incremental deve chegar ao mesmo modelo e perfil de uma leitura do arquivo inteiro."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from src.incremental import atualizar_incremental
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _acrescentar(caminho, texto):
+    with open(caminho, 'a', encoding='utf-8', newline='') as f:
+        f.write(texto)
+
+
+def test_linhas_acrescentadas_iguais_ao_arquivo_inteiro(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    caminho = tmp_path / 'clientes.csv'
+    df.iloc[:300].to_csv(caminho, index=False)
+    estado = str(tmp_path / 'estado.pkl')
+
+    primeira = atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=estado, n_processos=1,
+                                     tamanho_chunk=64)
+    assert primeira['refeito'] and primeira['linhas'] == 300
+
+    # Uma linha ainda sendo escrita (sem a quebra de linha) fica para a próxima execução
+    novas = df.iloc[300:].to_csv(index=False, header=False).splitlines(keepends=True)
+    _acrescentar(caminho, ''.join(novas[:-1]) + novas[-1].rstrip('\n'))
+    segunda = atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=estado, n_processos=1,
+                                    tamanho_chunk=64)
+    assert not segunda['refeito']
+    assert segunda['linhas_novas'] == len(df) - 301
+    _acrescentar(caminho, '\n')
+    terceira = atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=estado, n_processos=1,
+                                     tamanho_chunk=64)
+    assert terceira['linhas_novas'] == 1 and terceira['linhas'] == len(df)
+
+    # O pré-processamento é o da primeira leitura; os coeficientes, os de todas as linhas
+    preprocessador = terceira['preprocessador']
+    referencia = LinearRegression().fit(preprocessador.transformar_matriz(df), df['target'].to_numpy(dtype='float64'))
+    np.testing.assert_allclose(terceira['modelo'].coef_, referencia.coef_, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(terceira['modelo'].intercept_, referencia.intercept_, rtol=0, atol=1e-8)
+
+    inteiro = atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=str(tmp_path / 'outro.pkl'),
+                                    n_processos=1, tamanho_chunk=64)
+    assert inteiro['refeito']
+    perfil, perfil_inteiro = terceira['perfil'], inteiro['perfil']
+    assert perfil.linhas == perfil_inteiro.linhas == len(df)
+    pd.testing.assert_series_equal(perfil.valores_ausentes(), perfil_inteiro.valores_ausentes())
+    # O fim do perfil é numerado pela posição no arquivo inteiro
+    assert list(perfil.fim.index) == list(range(len(df) - len(perfil.fim), len(df)))
+    pd.testing.assert_frame_equal(perfil.fim, perfil_inteiro.fim)
+
+
+def test_arquivo_reescrito_e_lido_de_novo(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    caminho = tmp_path / 'clientes.csv'
+    df.iloc[:300].to_csv(caminho, index=False)
+    estado = str(tmp_path / 'estado.pkl')
+    atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=estado, n_processos=1)
+
+    df.iloc[100:].to_csv(caminho, index=False)
+    resultado = atualizar_incremental(str(caminho), ['sexo', 'categoria'], caminho_estado=estado, n_processos=1)
+
+    assert resultado['refeito']
+    assert resultado['linhas'] == len(df) - 100
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Cada etapa decorada com `@instrumentar` deve gerar um evento com nome, linhas, tempos e situação."""
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.eda import perfilar_dados
+from src.instrumentacao import ColetorEventos, SaidaJsonLinhas, instrumentar, registrando
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+@instrumentar(nome='filtrar', entrada='df')
+def _filtrar(limite, df):
+    return df[df['idade'] > limite]
+
+
+@instrumentar
+def _filtrar_e_contar(df):
+    return len(_filtrar(40, df)) or None
+
+
+@instrumentar
+def _falhar(df):
+    raise ValueError('dados inválidos')
+
+
+def test_eventos_das_etapas():
+    df = pd.read_csv(CAMINHO_DADOS)
+    coletor = ColetorEventos()
+    with registrando(coletor):
+        perfil = perfilar_dados(df)
+        filtrado = _filtrar(40, df)
+        _filtrar_e_contar(df.iloc[:0])
+
+    assert [e['etapa'] for e in coletor.eventos] == ['perfilar_dados', 'filtrar', 'filtrar', '_filtrar_e_contar']
+    evento = coletor.eventos[0]
+    assert evento['funcao'] == 'src.eda.perfilar_dados'
+    assert evento['linhas_entrada'] == len(df) and evento['linhas_saida'] is None
+    assert evento['bytes_entrada'] == df.memory_usage(index=True, deep=False).sum()
+    assert evento['sucesso'] and evento['erro'] is None and evento['nivel'] == 0
+    assert evento['segundos'] >= 0 and evento['cpu_segundos'] >= 0
+    assert perfil.linhas == len(df)
+
+    # `entrada` escolhe o parâmetro medido; etapas internas ficam um nível abaixo
+    assert coletor.eventos[1]['linhas_entrada'] == len(df)
+    assert coletor.eventos[1]['linhas_saida'] == len(filtrado)
+    interna, externa = coletor.eventos[2], coletor.eventos[3]
+    assert interna['nivel'] == 1 and externa['nivel'] == 0
+    assert externa['segundos'] >= interna['segundos']
+    # Devolver None conta como falha
+    assert not externa['sucesso']
+
+    tabela = coletor.tabela()
+    assert len(tabela) == 4 and {'etapa', 'segundos', 'pico_rss_mb', 'pid'} <= set(tabela.columns)
+
+
+def test_excecao_registrada_e_repassada(tmp_path):
+    caminho = tmp_path / 'logs' / 'etapas.jsonl'
+    coletor = ColetorEventos()
+    with registrando(coletor, SaidaJsonLinhas(str(caminho))):
+        with pytest.raises(ValueError):
+            _falhar(pd.DataFrame({'a': [1, 2]}))
+
+    evento, = coletor.eventos
+    assert not evento['sucesso'] and evento['erro'] == 'ValueError: dados inválidos'
+    gravado, = [json.loads(linha) for linha in caminho.read_text(encoding='utf-8').splitlines()]
+    assert gravado['etapa'] == '_falhar' and gravado['linhas_entrada'] == 2
+
+
+def test_sem_saidas_nenhum_evento():
+    coletor = ColetorEventos()
+    with registrando(coletor):
+        pass
+    assert _filtrar(40, pd.DataFrame({'idade': [30, 50]})).shape[0] == 1
+    assert coletor.eventos == []
+
+
+def test_saida_com_problema_nao_interrompe_a_etapa(capsys):
+    def saida_quebrada(evento):
+        raise RuntimeError('disco cheio')
+
+    with registrando(saida_quebrada):
+        resultado = _filtrar(40, pd.DataFrame({'idade': [30, 50]}))
+
+    assert len(resultado) == 1
+    assert "Não foi possível registrar a etapa 'filtrar'" in capsys.readouterr().out
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""O treino e a avaliação em blocos devem chegar aos mesmos resultados do Scikit-learn em memória."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from src.modelagem import AcumuladorMetricas, treinar_regressao_fora_da_memoria
+from src.preprocessamento import PreProcessador
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+@pytest.mark.parametrize('alfa, referencia', [(0.0, LinearRegression()), (1.0, Ridge(alpha=1.0))])
+def test_regressao_fora_da_memoria_igual_ao_sklearn(alfa, referencia):
+    df = pd.read_csv(CAMINHO_DADOS)
+    preprocessador = PreProcessador(['sexo', 'categoria'], 'target').ajustar(df)
+
+    # Blocos pequenos para que as estatísticas de vários blocos sejam combinadas
+    modelo = treinar_regressao_fora_da_memoria(str(CAMINHO_DADOS), preprocessador, alfa=alfa,
+                                               n_processos=1, tamanho_chunk=64)
+    referencia.fit(preprocessador.transformar_matriz(df), df['target'].to_numpy(dtype='float64'))
+
+    assert modelo is not None
+    np.testing.assert_allclose(modelo.coef_, referencia.coef_, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(modelo.intercept_, referencia.intercept_, rtol=0, atol=1e-8)
+
+
+def test_metricas_em_blocos_iguais_ao_sklearn():
+    gerador = np.random.default_rng(0)
+    # Alvo com média grande e pouca variação, onde Σy² - (Σy)²/n perderia a precisão
+    reais = 1e8 + gerador.normal(size=10_000)
+    previstos = reais + gerador.normal(scale=0.5, size=10_000)
+
+    metricas = AcumuladorMetricas()
+    for inicio in range(0, 10_000, 999):
+        metricas.atualizar(reais[inicio:inicio + 999], previstos[inicio:inicio + 999])
+    # Os blocos de outro processo entram por `combinar`
+    metade = AcumuladorMetricas().atualizar(reais[:5000], previstos[:5000])
+    combinadas = metade.combinar(AcumuladorMetricas().atualizar(reais[5000:], previstos[5000:]))
+
+    for acumulador in (metricas, combinadas):
+        assert acumulador.n == 10_000
+        np.testing.assert_allclose(acumulador.mae(), mean_absolute_error(reais, previstos), rtol=1e-12)
+        np.testing.assert_allclose(acumulador.r2(), r2_score(reais, previstos), rtol=1e-9)
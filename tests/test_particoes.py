@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Vários arquivos processados em faixas e em paralelo devem dar o mesmo que um único arquivo."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.particoes import perfilar_particoes, processar_particoes
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+# Faixas pequenas para cada arquivo ser dividido entre várias tarefas
+TAMANHO_FAIXA = 2048
+
+
+@pytest.fixture
+def pasta_particoes(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    for i, inicio in enumerate(range(0, len(df), 200)):
+        df.iloc[inicio:inicio + 200].to_csv(tmp_path / f'dia_{i}.csv', index=False)
+    return tmp_path
+
+
+def test_perfil_das_particoes_igual_ao_do_arquivo(pasta_particoes):
+    df = pd.read_csv(CAMINHO_DADOS)
+
+    perfil = perfilar_particoes(str(pasta_particoes), n_processos=1, tamanho_chunk=50, tamanho_faixa=TAMANHO_FAIXA)
+
+    assert perfil.linhas == len(df)
+    # Início e fim com a numeração das linhas nos dados inteiros, não na faixa em que foram lidas
+    pd.testing.assert_frame_equal(perfil.inicio, df.head(5), check_dtype=False)
+    pd.testing.assert_frame_equal(perfil.fim, df.tail(5), check_dtype=False)
+    numericas = df.select_dtypes(include=np.number)
+    estatisticas = perfil.estatisticas_descritivas()[numericas.columns]
+    np.testing.assert_array_equal(estatisticas.loc['count'], numericas.count())
+    np.testing.assert_allclose(estatisticas.loc['mean'], numericas.mean(), rtol=1e-12)
+    np.testing.assert_allclose(estatisticas.loc['std'], numericas.std(), rtol=1e-10)
+
+
+def test_modelo_das_particoes_igual_ao_sklearn(pasta_particoes):
+    df = pd.read_csv(CAMINHO_DADOS)
+
+    resultado = processar_particoes(str(pasta_particoes), ['sexo', 'categoria'], n_processos=2, tamanho_chunk=50,
+                                    tamanho_faixa=TAMANHO_FAIXA)
+
+    # Mesmo pré-processamento (ajustado pelos resumos das faixas) aplicado ao arquivo inteiro
+    X = resultado['preprocessador'].transformar_matriz(df)
+    referencia = LinearRegression().fit(X, df['target'].to_numpy(dtype='float64'))
+    assert resultado['linhas'] == len(df)
+    np.testing.assert_allclose(resultado['modelo'].coef_, referencia.coef_, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(resultado['modelo'].intercept_, referencia.intercept_, rtol=0, atol=1e-8)
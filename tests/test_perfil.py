@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""O perfil em uma passada (e combinado entre partes) deve concordar com o pandas."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eda import exibir_estatisticas_descritivas
+from src.perfil import PerfilDados
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _perfil_em_partes(df, tamanho):
+    perfil = None
+    for inicio in range(0, len(df), tamanho):
+        parte = PerfilDados().atualizar(df.iloc[inicio:inicio + tamanho])
+        perfil = parte if perfil is None else perfil.combinar(parte)
+    return perfil
+
+
+# Um bloco só, e vários blocos de tamanhos diferentes do total combinados
+@pytest.mark.parametrize('tamanho', [1000, 37])
+def test_perfil_combinado_igual_ao_describe(tamanho):
+    df = pd.read_csv(CAMINHO_DADOS)
+    perfil = _perfil_em_partes(df, tamanho)
+    esperado = df.select_dtypes(include=np.number).describe()
+    obtido = perfil.estatisticas_descritivas()[esperado.columns]
+
+    assert perfil.linhas == len(df)
+    exatas = ['count', 'mean', 'std', 'min', 'max']
+    np.testing.assert_allclose(obtido.loc[exatas].to_numpy(dtype='float64'),
+                               esperado.loc[exatas].to_numpy(), rtol=1e-12)
+    # Os quartis são aproximados: ficam perto dos exatos, em relação à amplitude de cada coluna
+    amplitude = (esperado.loc['max'] - esperado.loc['min']).to_numpy()
+    erro = np.abs(obtido.loc[['25%', '50%', '75%']].to_numpy(dtype='float64')
+                  - esperado.loc[['25%', '50%', '75%']].to_numpy())
+    assert (erro <= 0.01 * amplitude).all()
+    pd.testing.assert_series_equal(perfil.valores_ausentes(), df.isnull().sum(), check_names=False)
+
+
+def test_perfil_combinado_guarda_inicio_e_fim():
+    df = pd.read_csv(CAMINHO_DADOS)
+    perfil = _perfil_em_partes(df, 3)
+    pd.testing.assert_frame_equal(perfil.inicio, df.head(5))
+    pd.testing.assert_frame_equal(perfil.fim, df.tail(5))
+
+
+def test_frequentes_de_texto_iguais_ao_value_counts():
+    df = pd.read_csv(CAMINHO_DADOS)
+    perfil = _perfil_em_partes(df, 100)
+    # Poucas categorias cabem inteiras no resumo: as contagens saem exatas
+    esperado = df['categoria'].value_counts(dropna=False)
+    obtido = perfil.valores_mais_frequentes('categoria')
+    assert obtido.sort_index().tolist() == esperado.sort_index().tolist()
+
+
+def test_estatisticas_exibidas_sao_exatas_com_dados_em_memoria():
+    df = pd.read_csv(CAMINHO_DADOS)
+    perfil = PerfilDados().atualizar(df)
+    obtido = exibir_estatisticas_descritivas(df, perfil=perfil)
+    pd.testing.assert_frame_equal(obtido, df.select_dtypes(include=np.number).describe())
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""A pontuação em faixas, em um ou mais processos, deve dar as mesmas previsões do modelo salvo."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modelagem import carregar_modelo, salvar_modelo, treinar_modelo_regressao
+from src.pontuacao import pontuar_arquivo
+from src.preprocessamento import PreProcessador
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+@pytest.fixture(scope='module')
+def modelo_e_entrada(tmp_path_factory):
+    pasta = tmp_path_factory.mktemp('pontuacao')
+    df = pd.read_csv(CAMINHO_DADOS)
+    preprocessador = PreProcessador(['sexo', 'categoria'], 'target').ajustar(df)
+    X = pd.DataFrame(preprocessador.transformar_matriz(df), columns=preprocessador.colunas_saida)
+    modelo = treinar_modelo_regressao(X, df['target'])
+    caminho_modelo = salvar_modelo(modelo, preprocessador, str(pasta / 'modelo.json'))
+
+    # Cópias do exemplo até passar de algumas faixas mínimas (256 KB), com ids únicos
+    entrada = pd.concat([df] * 40, ignore_index=True)
+    entrada['id'] = np.arange(1, len(entrada) + 1)
+    caminho_entrada = pasta / 'entrada.csv'
+    entrada.drop(columns=['target']).to_csv(caminho_entrada, index=False)
+    return caminho_modelo, str(caminho_entrada), entrada
+
+
+def test_pontuacao_em_paralelo_igual_a_serial_e_ao_predict(modelo_e_entrada, tmp_path):
+    caminho_modelo, caminho_entrada, entrada = modelo_e_entrada
+
+    serial = pontuar_arquivo(caminho_entrada, caminho_modelo, str(tmp_path / 'serial.csv'), n_processos=1)
+    paralelo = pontuar_arquivo(caminho_entrada, caminho_modelo, str(tmp_path / 'paralelo.csv'), n_processos=2,
+                               tamanho_chunk=500, tamanho_faixa=1)
+
+    assert serial['linhas'] == paralelo['linhas'] == len(entrada)
+    saida_serial = pd.read_csv(serial['caminho_saida'])
+    saida_paralela = pd.read_csv(paralelo['caminho_saida'])
+    # A saída segue a ordem da entrada, qualquer que seja o processo que pontuou cada faixa
+    assert list(saida_paralela.columns) == ['id', 'previsao']
+    np.testing.assert_array_equal(saida_paralela['id'], entrada['id'])
+    pd.testing.assert_frame_equal(saida_paralela, saida_serial)
+
+    modelo, preprocessador = carregar_modelo(caminho_modelo)
+    esperado = modelo.predict(pd.DataFrame(preprocessador.transformar_matriz(entrada),
+                                           columns=preprocessador.colunas_saida))
+    np.testing.assert_allclose(saida_paralela['previsao'], esperado, rtol=1e-12, atol=1e-9)
+
+
+def test_pontuacao_sem_colunas_do_modelo(modelo_e_entrada, tmp_path):
+    caminho_modelo, _, entrada = modelo_e_entrada
+    caminho_entrada = tmp_path / 'incompleta.csv'
+    entrada[['id', 'idade']].to_csv(caminho_entrada, index=False)
+
+    assert pontuar_arquivo(str(caminho_entrada), caminho_modelo, str(tmp_path / 'saida.csv'), n_processos=1) is None
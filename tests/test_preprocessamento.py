@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""O PreProcessador deve produzir o mesmo que as funções de pré-processamento encadeadas."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessamento import (
+    PreProcessador,
+    codificar_variaveis_categoricas,
+    montar_matriz_modelo,
+    remover_colunas_nao_numericas_para_modelo,
+    tratar_valores_ausentes,
+)
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+ESTRATEGIAS_NUM = ['median', 'mean', 'most_frequent', 'constant']
+
+
+def _pelas_funcoes(df, colunas_categoricas, estrategia_num, metodo='onehot'):
+    tratado = tratar_valores_ausentes(df.drop(columns=['id'], errors='ignore'), estrategia_num=estrategia_num)
+    codificado = codificar_variaveis_categoricas(tratado, colunas_categoricas, metodo=metodo)
+    return remover_colunas_nao_numericas_para_modelo(codificado, 'target').drop(columns=['target'])
+
+
+def _pelo_preprocessador(df, colunas_categoricas, estrategia_num, metodo='onehot'):
+    preprocessador = PreProcessador(colunas_categoricas, 'target', estrategia_num=estrategia_num, metodo=metodo)
+    return preprocessador.ajustar(df).transformar(df)
+
+
+def _comparar(esperado, obtido):
+    obtido = obtido.drop(columns=['target'], errors='ignore')
+    assert sorted(obtido.columns) == sorted(esperado.columns)
+    np.testing.assert_allclose(obtido.to_numpy(dtype='float64'),
+                               esperado[list(obtido.columns)].to_numpy(dtype='float64'), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('metodo', ['onehot', 'label'])
+@pytest.mark.parametrize('estrategia_num', ESTRATEGIAS_NUM)
+def test_preprocessador_igual_as_funcoes(estrategia_num, metodo):
+    df = pd.read_csv(CAMINHO_DADOS)
+    colunas_categoricas = ['sexo', 'categoria']
+    _comparar(_pelas_funcoes(df, colunas_categoricas, estrategia_num, metodo),
+              _pelo_preprocessador(df, colunas_categoricas, estrategia_num, metodo))
+
+
+@pytest.mark.parametrize('estrategia_num, preenchido', [('median', 2.0), ('mean', 3.5),
+                                                          ('most_frequent', 2.0), ('constant', 0.0)])
+def test_preenchimento_numerico(estrategia_num, preenchido):
+    df = pd.DataFrame({'id': range(5), 'x': [1, 2, 2, np.nan, 9], 'cor': ['a', 'b', None, 'b', 'a'],
+                       'target': [1.0, 2.0, 3.0, 4.0, 5.0]})
+    esperado = _pelas_funcoes(df, ['cor'], estrategia_num)
+    assert esperado.loc[3, 'x'] == preenchido
+    _comparar(esperado, _pelo_preprocessador(df, ['cor'], estrategia_num))
+
+
+def test_codificacao_esparsa_igual_ao_onehot():
+    df = tratar_valores_ausentes(pd.read_csv(CAMINHO_DADOS).drop(columns=['id']))
+    denso = codificar_variaveis_categoricas(df, ['sexo', 'categoria'], metodo='onehot')
+    esparso = codificar_variaveis_categoricas(df, ['sexo', 'categoria'], metodo='esparso')
+
+    dummies = [c for c in denso.columns if c not in esparso.columns]
+    assert esparso.colunas_codificadas == dummies
+    np.testing.assert_array_equal(esparso.matriz.toarray(), denso[dummies].to_numpy(dtype='float64'))
+    pd.testing.assert_frame_equal(esparso.df, denso[list(esparso.columns)])
+
+
+def test_codificacao_hashing_tem_largura_fixa():
+    df = pd.DataFrame({'cor': ['a', 'b', None, 'c'] * 50, 'cidade': [f'c{i}' for i in range(200)]})
+    dados = codificar_variaveis_categoricas(df, ['cor', 'cidade'], metodo='hashing', n_colunas_hash=64)
+
+    assert dados.matriz.shape == (200, 64)
+    assert dados.colunas_codificadas == [f'hash_{i}' for i in range(64)]
+    # Cada valor presente soma +1 ou -1 em uma coluna (colisões na mesma linha podem se cancelar)
+    presentes = df.notnull().sum(axis=1).to_numpy()
+    assert (np.abs(dados.matriz).sum(axis=1).A1 <= presentes).all()
+    repetido = codificar_variaveis_categoricas(df, ['cor', 'cidade'], metodo='hashing', n_colunas_hash=64)
+    assert (dados.matriz != repetido.matriz).nnz == 0
+
+
+@pytest.mark.parametrize('estrategia_cat', ['most_frequent', 'constant'])
+@pytest.mark.parametrize('estrategia_num', ESTRATEGIAS_NUM)
+def test_preenchimento_sem_copia_igual_ao_com_copia(estrategia_num, estrategia_cat):
+    df = pd.read_csv(CAMINHO_DADOS)
+    df['categoria'] = df['categoria'].astype('category')  # como sai de `compactar_tipos`
+    esperado = tratar_valores_ausentes(df, estrategia_num=estrategia_num, estrategia_cat=estrategia_cat)
+    obtido = df.copy()
+    assert tratar_valores_ausentes(obtido, estrategia_num=estrategia_num, estrategia_cat=estrategia_cat,
+                                   inplace=True) is obtido
+    assert obtido.notna().all().all()
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, check_categorical=False)
+
+
+def test_matriz_liberando_colunas_igual_a_sem_liberar():
+    df = codificar_variaveis_categoricas(tratar_valores_ausentes(pd.read_csv(CAMINHO_DADOS)),
+                                         ['sexo', 'categoria'])
+    esperado = montar_matriz_modelo(df.copy(), 'target', random_state=42)
+    obtido = montar_matriz_modelo(df, 'target', random_state=42, liberar_colunas=True)
+
+    assert df.columns.empty
+    assert obtido.colunas == esperado.colunas
+    np.testing.assert_array_equal(obtido.X, esperado.X)
+    np.testing.assert_array_equal(obtido.y, esperado.y)
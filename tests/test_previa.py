@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Início, fim e resumo por amostragem devem concordar com o arquivo lido inteiro."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eda import exibir_previa_arquivo
+from src.previa import ler_fim, ler_inicio, resumir_por_amostragem
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _fim_esperado(df, n):
+    fim = df.tail(n)
+    fim.index = range(-len(fim), 0)
+    return fim
+
+
+@pytest.mark.parametrize('n', [1, 5, 600])
+def test_inicio_e_fim_iguais_ao_head_e_tail(n):
+    df = pd.read_csv(CAMINHO_DADOS)
+    # Com poucas linhas, os tipos são deduzidos só delas (ex.: uma coluna de texto vazia vira float)
+    pd.testing.assert_frame_equal(ler_inicio(CAMINHO_DADOS, n), df.head(n), check_dtype=False)
+    # Passos pequenos obrigam a voltar várias vezes a partir do fim
+    pd.testing.assert_frame_equal(ler_fim(CAMINHO_DADOS, n, tamanho_passo=100), _fim_esperado(df, n),
+                                  check_dtype=False)
+
+
+def test_fim_de_arquivo_compactado(tmp_path):
+    df = pd.read_csv(CAMINHO_DADOS)
+    caminho = tmp_path / 'dados.csv.gz'
+    df.to_csv(caminho, index=False)
+    pd.testing.assert_frame_equal(ler_fim(caminho, 5), _fim_esperado(df, 5), check_dtype=False)
+
+
+def test_arquivo_pequeno_e_lido_inteiro():
+    df = pd.read_csv(CAMINHO_DADOS)
+    resumo = resumir_por_amostragem(CAMINHO_DADOS)
+    assert resumo['metodo'] == 'completo'
+    assert resumo['linhas_estimadas'] == len(df)
+    medias = resumo['estatisticas'].loc['mean']
+    np.testing.assert_allclose(medias.to_numpy(dtype='float64'),
+                               df.select_dtypes(include=np.number).mean()[medias.index].to_numpy())
+
+
+@pytest.mark.parametrize('compactado', [False, True])
+def test_intervalo_da_amostra_contem_a_media(tmp_path, compactado):
+    gerador = np.random.default_rng(0)
+    n = 50_000
+    # Uma tendência ao longo do arquivo: blocos vizinhos são parecidos entre si
+    df = pd.DataFrame({'valor': np.linspace(0, 10, n) + gerador.normal(size=n), 'grupo': gerador.integers(0, 3, n)})
+    caminho = tmp_path / ('dados.csv.gz' if compactado else 'dados.csv')
+    df.to_csv(caminho, index=False)
+
+    resumo = resumir_por_amostragem(caminho, n_blocos=40, linhas_por_bloco=50)
+    assert resumo['metodo'] == ('reservatorio' if compactado else 'blocos')
+    assert resumo['linhas_amostradas'] == 2000
+    assert abs(resumo['linhas_estimadas'] - n) <= 0.02 * n
+    estatisticas = resumo['estatisticas']
+    assert estatisticas.at['ic_inferior', 'valor'] <= df['valor'].mean() <= estatisticas.at['ic_superior', 'valor']
+
+
+def test_previa_de_arquivo_inexistente(tmp_path):
+    assert exibir_previa_arquivo(str(tmp_path / 'nao_existe.csv')) is None
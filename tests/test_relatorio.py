@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""O relatório deve ser gerado sem tela e só redesenhar os gráficos cujos dados mudaram."""
+import os
+from pathlib import Path
+
+import matplotlib
+import pytest
+
+from src.cli import executar_fluxo
+from src.relatorio import gerar_relatorio
+
+matplotlib.use('Agg')
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+@pytest.fixture(scope='module')
+def resultados():
+    return executar_fluxo(str(CAMINHO_DADOS), mostrar_graficos=False)
+
+
+def test_relatorio_em_markdown_com_figuras(resultados, tmp_path):
+    relatorio = gerar_relatorio(resultados, str(tmp_path), caminho_csv=str(CAMINHO_DADOS), n_processos=1,
+                                gerar_pdf=False)
+
+    assert relatorio is not None and relatorio['pdf'] is None
+    assert relatorio['desenhadas'] == 4 and relatorio['reaproveitadas'] == 0
+    texto = Path(relatorio['markdown']).read_text(encoding='utf-8')
+    assert texto.startswith('# Relatório da Análise de Dados')
+    assert f"*   Registros: {resultados['perfil'].linhas}" in texto
+    assert f"(R²): {resultados['r2'] * 100:.2f}%" in texto
+    for titulo, caminho in relatorio['figuras'].items():
+        assert os.path.getsize(caminho) > 0
+        # Caminhos relativos à pasta do relatório, para o Markdown poder ser movido junto com ela
+        assert f"![{titulo}]({os.path.relpath(caminho, tmp_path)})" in texto
+
+
+def test_figuras_reaproveitadas_e_redesenhadas(resultados, tmp_path):
+    primeira = gerar_relatorio(resultados, str(tmp_path), n_processos=1, gerar_pdf=False)
+    segunda = gerar_relatorio(resultados, str(tmp_path), n_processos=1, gerar_pdf=False)
+    assert segunda['desenhadas'] == 0 and segunda['reaproveitadas'] == 4
+    assert segunda['figuras'] == primeira['figuras']
+
+    # Só o histograma usa 'idade': os outros gráficos continuam no cache
+    alterados = dict(resultados, df=resultados['df'].assign(idade=resultados['df']['idade'] + 1))
+    terceira = gerar_relatorio(alterados, str(tmp_path), n_processos=1, gerar_pdf=False)
+    assert terceira['desenhadas'] == 1 and terceira['reaproveitadas'] == 3
+    antigo, novo = primeira['figuras']['Distribuição de idade'], terceira['figuras']['Distribuição de idade']
+    assert antigo != novo and os.path.exists(novo) and not os.path.exists(antigo)
+    assert len(os.listdir(tmp_path / 'figuras')) == 4
+
+
+def test_relatorio_em_pdf(resultados, tmp_path):
+    relatorio = gerar_relatorio(resultados, str(tmp_path), n_processos=1)
+    assert Path(relatorio['pdf']).read_bytes().startswith(b'%PDF')
+
+
+def test_relatorio_sem_dados(tmp_path):
+    assert gerar_relatorio({'df': None}, str(tmp_path)) is None
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""A validação cruzada em paralelo deve dar as mesmas métricas do Scikit-learn divisão a divisão."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import KFold, RepeatedKFold, ShuffleSplit
+
+import src.preprocessamento
+from src.preprocessamento import PreProcessador, montar_matriz_modelo
+from src.validacao import validar_modelo
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+def _matriz():
+    df = pd.read_csv(CAMINHO_DADOS)
+    return montar_matriz_modelo(PreProcessador(['sexo', 'categoria'], 'target').ajustar(df).transformar(df), 'target')
+
+
+@pytest.mark.parametrize('estrategia, repeticoes, divisor', [
+    ('kfold', 1, KFold(n_splits=4, shuffle=True, random_state=42)),
+    ('kfold', 2, RepeatedKFold(n_splits=4, n_repeats=2, random_state=42)),
+    ('divisoes', 1, ShuffleSplit(n_splits=4, test_size=0.3, random_state=42)),
+])
+@pytest.mark.parametrize('alfa', [0.0, 1.0])
+def test_validacao_igual_ao_sklearn(monkeypatch, estrategia, repeticoes, divisor, alfa):
+    monkeypatch.setattr(src.preprocessamento, 'LINHAS_POR_LOTE', 37)  # vários lotes por divisão
+    matriz = _matriz()
+
+    resultado = validar_modelo(matriz, n_folds=4, repeticoes=repeticoes, estrategia=estrategia, alfa=alfa,
+                               n_processos=1)
+
+    divisoes = resultado['divisoes']
+    assert len(divisoes) == 4 * repeticoes
+    for (treino, teste), (_, linha) in zip(divisor.split(matriz.X), divisoes.iterrows()):
+        referencia = Ridge(alpha=alfa) if alfa else LinearRegression()
+        previstos = referencia.fit(matriz.X[treino], matriz.y[treino]).predict(matriz.X[teste])
+        assert (linha['n_treino'], linha['n_teste']) == (len(treino), len(teste))
+        np.testing.assert_allclose(linha['mae'], mean_absolute_error(matriz.y[teste], previstos), rtol=1e-10)
+        np.testing.assert_allclose(linha['r2'], r2_score(matriz.y[teste], previstos), rtol=1e-10)
+
+
+def test_validacao_em_paralelo_igual_a_serial():
+    matriz = _matriz()
+    serial = validar_modelo(matriz, n_folds=3, n_processos=1)['divisoes']
+    paralelo = validar_modelo(matriz, n_folds=3, n_processos=2)['divisoes']
+    pd.testing.assert_frame_equal(paralelo.drop(columns='segundos'), serial.drop(columns='segundos'))
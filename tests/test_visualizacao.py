@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Os gráficos agregados devem mostrar as mesmas contagens das linhas, em memória ou em blocos."""
+from pathlib import Path
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.carregamento import carregar_dados
+from src.eda import perfilar_dados
+from src.visualizacao import plotar_grafico_barras, plotar_grafico_dispersao, plotar_histograma
+
+matplotlib.use('Agg')
+
+CAMINHO_DADOS = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'dados_exemplo_2.csv'
+
+
+@pytest.fixture
+def figura_aberta(monkeypatch):
+    """Deixa a figura aberta (em vez de mostrá-la) para conferir o que foi desenhado."""
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    yield
+    plt.close('all')
+
+
+def _dados(em_blocos):
+    return carregar_dados(str(CAMINHO_DADOS), tamanho_chunk=64) if em_blocos else pd.read_csv(CAMINHO_DADOS)
+
+
+@pytest.mark.parametrize('em_blocos', [False, True])
+def test_histograma_agregado_conta_todas_as_linhas(figura_aberta, em_blocos):
+    idade = pd.read_csv(CAMINHO_DADOS)['idade'].dropna()
+    plotar_histograma(_dados(em_blocos), 'idade', bins=7, agregado=True)
+
+    barras = plt.gca().patches
+    esperado, bordas = np.histogram(idade, bins=7, range=(idade.min(), idade.max()))
+    np.testing.assert_array_equal([barra.get_height() for barra in barras], esperado)
+    np.testing.assert_allclose([barra.get_x() for barra in barras], bordas[:-1])
+
+
+@pytest.mark.parametrize('em_blocos', [False, True])
+def test_dispersao_agregada_conta_todas_as_linhas(figura_aberta, em_blocos):
+    df = pd.read_csv(CAMINHO_DADOS)
+    dados = _dados(em_blocos)
+    # Com o perfil, os limites vêm dele, sem mais uma passada pelos dados
+    perfil = perfilar_dados(_dados(em_blocos)) if em_blocos else None
+    plotar_grafico_dispersao(dados, 'valor_compra', 'target', agregado=True, perfil=perfil, bins=20)
+
+    validos = df[['valor_compra', 'target']].dropna()
+    esperado = np.histogram2d(validos['valor_compra'], validos['target'], bins=20,
+                              range=[(validos['valor_compra'].min(), validos['valor_compra'].max()),
+                                     (validos['target'].min(), validos['target'].max())])[0]
+    malha, = plt.gca().collections
+    contagens = np.ma.filled(malha.get_array(), 0).reshape(20, 20)
+    np.testing.assert_array_equal(contagens, esperado.T)
+
+
+def test_barras_com_ausentes_em_blocos(figura_aberta):
+    plotar_grafico_barras(_dados(True), 'categoria')
+
+    contagens = pd.read_csv(CAMINHO_DADOS)['categoria'].fillna('Não Informado').value_counts()
+    rotulos = [rotulo.get_text() for rotulo in plt.gca().get_xticklabels()]
+    alturas = [barra.get_height() for barra in plt.gca().patches]
+    assert dict(zip(rotulos, alturas)) == contagens.to_dict()
+    assert alturas == sorted(alturas, reverse=True)
+
+
+@pytest.mark.parametrize('plotar, argumentos', [
+    (plotar_histograma, ('idade',)),
+    (plotar_grafico_dispersao, ('valor_compra', 'target')),
+    (plotar_grafico_barras, ('categoria',)),
+])
+def test_grafico_salvo_em_arquivo(plotar, argumentos, tmp_path):
+    caminho = tmp_path / 'grafico.png'
+    plotar(_dados(True), *argumentos, caminho_saida=str(caminho))
+
+    assert caminho.read_bytes().startswith(b'\x89PNG')
+    # A figura é fechada depois de salva
+    assert plt.get_fignums() == []